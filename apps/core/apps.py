@@ -0,0 +1,43 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+
+    def ready(self):
+        from django.db.models.signals import post_save, post_delete
+        from apps.core.authentication import invalidar_cache_token
+        from apps.core.versoes import invalidar_versao
+        from apps.core.medicao import instalar_medicao_serializacao
+
+        post_save.connect(
+            invalidar_versao,
+            dispatch_uid='core_invalidar_versao_save'
+        )
+        post_delete.connect(
+            invalidar_versao,
+            dispatch_uid='core_invalidar_versao_delete'
+        )
+        post_save.connect(
+            invalidar_cache_token,
+            dispatch_uid='core_invalidar_cache_token_save'
+        )
+        post_delete.connect(
+            invalidar_cache_token,
+            dispatch_uid='core_invalidar_cache_token_delete'
+        )
+
+        instalar_medicao_serializacao()
+
+        from celery.signals import task_prerun, task_postrun
+        from apps.core.metricas import tarefa_iniciada, tarefa_finalizada
+
+        task_prerun.connect(
+            tarefa_iniciada,
+            dispatch_uid='core_metricas_tarefa_iniciada'
+        )
+        task_postrun.connect(
+            tarefa_finalizada,
+            dispatch_uid='core_metricas_tarefa_finalizada'
+        )
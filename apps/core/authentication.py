@@ -0,0 +1,104 @@
+from hashlib import sha256
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from apps.core.metricas import leitura_cache
+
+
+def chave_cache_token(key):
+    return f'autenticacao:token:{sha256(key.encode()).hexdigest()}'
+
+
+def invalidar_cache_token(sender, instance, **kwargs):
+    """
+        Receiver de post_save/post_delete: remove do cache o token
+        excluído ou os tokens do usuário alterado (troca de senha,
+        desativação, mudança de perfil).
+    """
+    if isinstance(instance, Token):
+        cache.delete(chave_cache_token(instance.key))
+    elif isinstance(instance, get_user_model()):
+        tokens = Token.objects.filter(
+            user_id=instance.id
+        ).values_list('key', flat=True)
+
+        cache.delete_many(
+            [chave_cache_token(key) for key in tokens]
+        )
+
+
+def resolver_papel(request, usuario):
+    """
+        Anexa request.aluno ou request.professor de acordo com o
+        perfil do usuário autenticado.
+        - O atributo só existe quando o usuário tem o perfil, pois as
+        views usam hasattr(request, 'aluno') para escolher o queryset.
+        - request.papel_resolvido indica às permissões que a ausência
+        do atributo já é a resposta, sem consultar o banco novamente.
+    """
+    for papel in ['aluno', 'professor']:
+        perfil = getattr(usuario, papel, None)
+
+        if perfil is not None:
+            setattr(request, papel, perfil)
+
+    request.papel_resolvido = True
+
+
+class PapelTokenAuthentication(TokenAuthentication):
+
+    """
+        TokenAuthentication que carrega o token, o usuário e o seu
+        perfil (tb_aluno/tb_professor) em uma única consulta.
+    """
+
+    def authenticate(self, request):
+        autenticacao = super().authenticate(request)
+
+        if autenticacao is not None:
+            resolver_papel(request, autenticacao[0])
+
+        return autenticacao
+
+    def authenticate_credentials(self, key):
+        model = self.get_model()
+        try:
+            token = model.objects.select_related(
+                'user', 'user__aluno', 'user__professor'
+            ).get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.')
+            )
+
+        return (token.user, token)
+
+
+class CacheTokenAuthentication(PapelTokenAuthentication):
+
+    """
+        PapelTokenAuthentication com o token, o usuário e o perfil
+        guardados no cache (Redis) por `cache_timeout` segundos.
+        - Em caso de ausência no cache, consulta o banco.
+        - Ver invalidar_cache_token para as invalidações.
+    """
+
+    cache_timeout = 300
+
+    def authenticate_credentials(self, key):
+        chave = chave_cache_token(key)
+        autenticacao = leitura_cache('token', cache.get(chave))
+
+        if autenticacao is None:
+            autenticacao = super().authenticate_credentials(key)
+            cache.set(chave, autenticacao, self.cache_timeout)
+
+        return autenticacao
@@ -0,0 +1,62 @@
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connections
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Greatest
+
+"""
+    Busca textual ordenada por relevância, usada pelo parâmetro
+    `?busca=` dos filtros.
+    - O filtro é um icontains em cada campo, que no PostgreSQL usa os
+    índices GIN (gin_trgm_ops) sobre UPPER(campo) criados nas migrations.
+    - PostgreSQL: a relevância é a maior similaridade por trigramas
+    (pg_trgm) entre o termo e os campos.
+    - Outros bancos (SQLite nos testes): a relevância é 1 quando o
+    primeiro campo começa com o termo, 0.5 quando algum campo o contém.
+"""
+
+
+def relevancia_trigramas(campos, termo):
+    similaridades = [TrigramSimilarity(campo, termo) for campo in campos]
+
+    if len(similaridades) == 1:
+        return similaridades[0]
+
+    return Greatest(*similaridades)
+
+
+def relevancia_simples(campos, termo):
+    return Case(
+        When(
+            **{f'{campos[0]}__istartswith': termo},
+            then=Value(1.0)
+        ),
+        default=Value(0.5),
+        output_field=FloatField()
+    )
+
+
+def buscar(queryset, campos, termo):
+    """
+        Filtra o queryset pelos registros que contêm o termo em algum
+        dos campos, do mais para o menos relevante.
+
+        Returns:
+            [QuerySet]: [Registros anotados com `relevancia`]
+    """
+    termo = termo.strip()
+
+    if not termo:
+        return queryset
+
+    filtro = Q()
+    for campo in campos:
+        filtro |= Q(**{f'{campo}__icontains': termo})
+
+    if connections[queryset.db].vendor == 'postgresql':
+        relevancia = relevancia_trigramas(campos, termo)
+    else:
+        relevancia = relevancia_simples(campos, termo)
+
+    return queryset.filter(filtro).annotate(
+        relevancia=relevancia
+    ).order_by('-relevancia', 'pk')
@@ -0,0 +1,80 @@
+import json
+from functools import wraps
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.core.metricas import leitura_cache, registro
+from apps.core.versoes import versoes_models
+
+"""
+    Cache das respostas de leitura dos viewsets (ver cache_resposta).
+    - A chave inclui a rota, o papel e o usuário, os parâmetros da
+    query string (filtros e página) e as versões dos models listados em
+    `dependencias_cache` no viewset.
+    - Uma escrita em qualquer um desses models troca a versão dele (ver
+    apps.core.versoes) e as respostas guardadas deixam de ser usadas;
+    o timeout CACHE_RESPOSTAS_TIMEOUT apenas limita a memória ocupada.
+    - Acertos e falhas são contados na métrica cache_respostas_total.
+"""
+
+
+def chave_resposta(view, request):
+    papel = 'aluno' if hasattr(request, 'aluno') else 'professor'
+    resumo = md5(
+        json.dumps(
+            [
+                sorted(request.query_params.lists()),
+                view.kwargs,
+                getattr(view, 'versoes', None)
+                or versoes_models(view.dependencias_cache)
+            ],
+            sort_keys=True,
+            default=str
+        ).encode('utf-8')
+    ).hexdigest()
+
+    return 'resposta:{}:{}:{}:{}:{}'.format(
+        view.__class__.__name__,
+        view.action,
+        papel,
+        request.user.pk,
+        resumo
+    )
+
+
+def cache_resposta(metodo):
+    """
+        Decorator das actions de leitura de um viewset com
+        `dependencias_cache`. Apenas respostas 200 são guardadas.
+    """
+    @wraps(metodo)
+    def action(self, request, *args, **kwargs):
+        if not settings.CACHE_RESPOSTAS_TIMEOUT:
+            return metodo(self, request, *args, **kwargs)
+
+        chave = chave_resposta(self, request)
+        dados = leitura_cache('respostas', cache.get(chave))
+        rotulos = {'rota': request.resolver_match.view_name}
+
+        if dados is not None:
+            registro.incrementar(
+                'cache_respostas_total', {**rotulos, 'resultado': 'acerto'}
+            )
+            return Response(dados)
+
+        registro.incrementar(
+            'cache_respostas_total', {**rotulos, 'resultado': 'falha'}
+        )
+
+        response = metodo(self, request, *args, **kwargs)
+
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(chave, response.data, settings.CACHE_RESPOSTAS_TIMEOUT)
+
+        return response
+
+    return action
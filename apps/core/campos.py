@@ -0,0 +1,158 @@
+"""
+    Campos parciais (`?campos=codigo,nome,disciplina.nome`).
+    - O parâmetro vira uma árvore ({'codigo': {}, 'nome': {},
+    'disciplina': {'nome': {}}}); um nó vazio inclui o campo inteiro.
+    - CamposSerializerMixin: o to_representation só calcula os campos
+    pedidos (self.representar), sem ler colunas adiadas pelo only().
+    - CamposViewSetMixin: em requisições de leitura, o queryset só faz
+    os select_related/prefetch_related dos blocos pedidos e carrega
+    apenas as colunas usadas por eles (only).
+"""
+
+from rest_framework.permissions import SAFE_METHODS
+
+PARAMETRO_CAMPOS = 'campos'
+
+
+def arvore_campos(valor):
+    if not valor:
+        return None
+
+    arvore = {}
+    for caminho in valor.split(','):
+        partes = [parte.strip() for parte in caminho.split('.')]
+
+        if not all(partes):
+            continue
+
+        no = arvore
+        for parte in partes:
+            if parte in no and not no[parte]:
+                # O campo inteiro já foi pedido.
+                break
+            no = no.setdefault(parte, {})
+        else:
+            no.clear()
+
+    return arvore or None
+
+
+def campos_requisicao(request):
+    """
+        Returns:
+            [dict]: [Árvore dos campos pedidos, ou None para todos]
+    """
+    if request is None:
+        return None
+
+    if not hasattr(request, '_arvore_campos'):
+        parametros = getattr(request, 'query_params', request.GET)
+        request._arvore_campos = arvore_campos(
+            parametros.get(PARAMETRO_CAMPOS)
+        )
+
+    return request._arvore_campos
+
+
+def incluir(arvore, caminho):
+    if arvore is None:
+        return True
+
+    no = arvore
+    for parte in caminho.split('.'):
+        if parte not in no:
+            return False
+
+        no = no[parte]
+        if not no:
+            return True
+
+    return True
+
+
+def podar(dados, arvore):
+    if not arvore:
+        return dados
+
+    if isinstance(dados, list):
+        return [podar(item, arvore) for item in dados]
+
+    if not isinstance(dados, dict):
+        return dados
+
+    return {
+        chave: podar(valor, arvore[chave])
+        for chave, valor in dados.items()
+        if chave in arvore
+    }
+
+
+class CamposSerializerMixin:
+
+    def incluir(self, caminho):
+        return incluir(
+            campos_requisicao(self.context.get('request')), caminho
+        )
+
+    def representar(self, campos):
+        """
+            Args:
+                campos ([dict]): [Função que calcula cada campo]
+
+            Returns:
+                [dict]: [Apenas os campos pedidos, podados pela árvore]
+        """
+        return podar(
+            {
+                campo: valor()
+                for campo, valor in campos.items()
+                if self.incluir(campo)
+            },
+            campos_requisicao(self.context.get('request'))
+        )
+
+
+class CamposViewSetMixin:
+
+    """
+        `relacoes_campos`: para cada campo (ou caminho) da resposta, os
+        select_related, prefetch_related e only de que ele depende.
+        `campos_fixos`: colunas sempre carregadas quando há `?campos=`
+        (chave primária, ordenação do cursor).
+    """
+
+    relacoes_campos = {}
+    campos_fixos = []
+
+    def campos_solicitados(self):
+        return campos_requisicao(self.request)
+
+    def otimizar_queryset(self, queryset, excluir=()):
+        arvore = self.campos_solicitados()
+        leitura = self.request.method in SAFE_METHODS
+
+        relacionados = []
+        prefetch = []
+        colunas = list(self.campos_fixos)
+
+        for campo, relacao in self.relacoes_campos.items():
+            if campo in excluir or not (
+                incluir(arvore, campo) if leitura else True
+            ):
+                continue
+
+            relacionados += relacao.get('select_related', [])
+            prefetch += relacao.get('prefetch_related', [])
+            colunas += relacao.get('only', [])
+
+        if relacionados:
+            queryset = queryset.select_related(*relacionados)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+
+        # Escritas carregam o objeto inteiro: o save() de um objeto com
+        # colunas adiadas atualiza só as colunas carregadas.
+        if arvore is not None and leitura:
+            queryset = queryset.only(*colunas)
+
+        return queryset
@@ -0,0 +1,245 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from random import Random
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+"""
+    Teste de carga HTTP contra um servidor em execução (runserver,
+    gunicorn), usado pelo comando testar_carga.
+    - Autentica os usuários gerados pelo comando gerar_dados e repete
+    uma mistura ponderada das rotas, com várias threads.
+    - O resumo traz a vazão e os percentis de latência por rota.
+"""
+
+# (papel, método, rota, peso). As rotas de login usam o papel apenas
+# para escolher as credenciais.
+ROTAS_PADRAO = [
+    ('aluno', 'GET', '/projetos/', 25),
+    ('aluno', 'GET', '/turmas/', 10),
+    ('aluno', 'GET', '/grupos/', 10),
+    ('aluno', 'GET', '/alunos/', 5),
+    ('professor', 'GET', '/projetos/', 10),
+    ('professor', 'GET', '/tarefas/', 20),
+    ('professor', 'GET', '/turmas/', 5),
+    ('professor', 'GET', '/disciplinas/', 5),
+    ('aluno', 'POST', '/login/', 5),
+    ('professor', 'POST', '/login/', 5),
+]
+
+PERCENTIS = [50, 95, 99]
+
+
+def percentil(ordenados, p):
+    """
+        Percentil pelo método do posto mais próximo.
+
+        Args:
+            ordenados ([float]): [Valores em ordem crescente]
+            p ([int]): [Percentil, de 0 a 100]
+    """
+    if not ordenados:
+        return None
+
+    posto = max(1, -(-p * len(ordenados) // 100))
+
+    return ordenados[posto - 1]
+
+
+class Carga:
+
+    def __init__(
+        self, url, credenciais, rotas=ROTAS_PADRAO, concorrencia=10,
+        duracao=30, semente=42, tempo_limite=30
+    ):
+        """
+            Args:
+                url ([str]): [Endereço base do servidor]
+                credenciais ([dict]): [Lista de (email, senha) por papel]
+        """
+        self.url = url.rstrip('/')
+        self.credenciais = credenciais
+        self.rotas = [
+            rota for rota in rotas if credenciais.get(rota[0])
+        ]
+        self.concorrencia = concorrencia
+        self.duracao = duracao
+        self.semente = semente
+        self.tempo_limite = tempo_limite
+        self.tokens = {}
+
+    def requisitar(self, metodo, rota, token=None, dados=None):
+        """
+            Returns:
+                [tuple]: [Status HTTP (0 em falha de conexão) e corpo]
+        """
+        cabecalhos = {'Accept': 'application/json'}
+        corpo = None
+
+        if token:
+            cabecalhos['Authorization'] = f'Token {token}'
+        if dados is not None:
+            corpo = urlencode(dados).encode('utf-8')
+            cabecalhos['Content-Type'] = 'application/x-www-form-urlencoded'
+
+        requisicao = Request(
+            self.url + rota, data=corpo, headers=cabecalhos, method=metodo
+        )
+
+        try:
+            with urlopen(requisicao, timeout=self.tempo_limite) as resposta:
+                return resposta.status, resposta.read()
+        except HTTPError as erro:
+            return erro.code, erro.read()
+        except (URLError, OSError):
+            return 0, b''
+
+    def login(self, email, senha):
+        return self.requisitar(
+            'POST', '/login/', dados={'username': email, 'password': senha}
+        )
+
+    def autenticar(self):
+        """
+            Obtém o token de cada usuário antes da medição.
+        """
+        for papel, usuarios in self.credenciais.items():
+            self.tokens[papel] = []
+
+            for email, senha in usuarios:
+                status, corpo = self.login(email, senha)
+
+                if status == 200:
+                    self.tokens[papel].append(json.loads(corpo)['token'])
+
+        self.rotas = [
+            rota for rota in self.rotas if self.tokens.get(rota[0])
+        ]
+
+        if not self.rotas:
+            raise RuntimeError(
+                f'Nenhum usuário conseguiu se autenticar em {self.url}.'
+            )
+
+    def trabalhador(self, numero, fim):
+        aleatorio = Random(self.semente + numero)
+        pesos = [rota[3] for rota in self.rotas]
+        resultados = []
+
+        while time.monotonic() < fim:
+            papel, metodo, rota, _ = aleatorio.choices(
+                self.rotas, weights=pesos
+            )[0]
+
+            inicio = time.perf_counter()
+            if rota == '/login/':
+                status, _ = self.login(
+                    *aleatorio.choice(self.credenciais[papel])
+                )
+            else:
+                status, _ = self.requisitar(
+                    metodo, rota, token=aleatorio.choice(self.tokens[papel])
+                )
+            latencia = (time.perf_counter() - inicio) * 1000
+
+            resultados.append(
+                (f'{metodo} {rota} ({papel})', status, latencia)
+            )
+
+        return resultados
+
+    def executar(self):
+        """
+            Returns:
+                [list]: [(rota, status, latência em ms) por requisição]
+        """
+        if not self.tokens:
+            self.autenticar()
+
+        fim = time.monotonic() + self.duracao
+
+        with ThreadPoolExecutor(max_workers=self.concorrencia) as executor:
+            trabalhos = [
+                executor.submit(self.trabalhador, numero, fim)
+                for numero in range(self.concorrencia)
+            ]
+
+        return [
+            resultado
+            for trabalho in trabalhos
+            for resultado in trabalho.result()
+        ]
+
+
+def resumir(resultados, duracao):
+    """
+        Agrupa os resultados por rota.
+
+        Returns:
+            [dict]: [Requisições, erros, vazão (req/s) e latências em ms]
+    """
+    por_rota = {}
+    for rota, status, latencia in resultados:
+        por_rota.setdefault(rota, []).append((status, latencia))
+
+    rotas = {}
+    for rota, medicoes in sorted(por_rota.items()):
+        latencias = sorted(latencia for _, latencia in medicoes)
+
+        rotas[rota] = {
+            'requisicoes': len(medicoes),
+            'erros': sum(
+                1 for status, _ in medicoes if not 200 <= status < 400
+            ),
+            'vazao': round(len(medicoes) / duracao, 2),
+            'media': round(sum(latencias) / len(latencias), 2),
+            'maximo': round(latencias[-1], 2),
+            **{
+                f'p{p}': round(percentil(latencias, p), 2)
+                for p in PERCENTIS
+            }
+        }
+
+    latencias = sorted(latencia for _, _, latencia in resultados)
+
+    return {
+        'duracao': duracao,
+        'requisicoes': len(resultados),
+        'vazao': round(len(resultados) / duracao, 2),
+        **{
+            f'p{p}': round(percentil(latencias, p), 2) if latencias
+            else None
+            for p in PERCENTIS
+        },
+        'rotas': rotas
+    }
+
+
+def relatorio_markdown(resumo):
+    colunas = ['requisicoes', 'erros', 'vazao', 'media'] + [
+        f'p{p}' for p in PERCENTIS
+    ] + ['maximo']
+
+    linhas = [
+        '# Teste de carga',
+        '',
+        f'- Duração: {resumo["duracao"]} s',
+        f'- Requisições: {resumo["requisicoes"]}',
+        f'- Vazão: {resumo["vazao"]} req/s',
+        '',
+        '| Rota | Requisições | Erros | req/s | Média (ms) | '
+        + ' | '.join(f'p{p} (ms)' for p in PERCENTIS)
+        + ' | Máximo (ms) |',
+        '|' + ' --- |' * (len(colunas) + 1),
+    ]
+
+    for rota, dados in resumo['rotas'].items():
+        linhas.append(
+            f'| {rota} | '
+            + ' | '.join(str(dados[coluna]) for coluna in colunas)
+            + ' |'
+        )
+
+    return '\n'.join(linhas) + '\n'
@@ -0,0 +1,167 @@
+import json
+import logging
+import threading
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+
+"""
+    Log de consultas lentas (ver ConsultasLentasMiddleware).
+    - Consultas acima de CONSULTAS_LENTAS_LIMITE_MS são registradas no
+    logger apps.core.consultas_lentas com o SQL parametrizado, a view e
+    o plano de execução.
+    - Os valores dos parâmetros não são registrados (tokens, hashes de
+    senha e e-mails passam pelas consultas de autenticação e cadastro),
+    e são ocultados do texto do plano.
+    - O plano vem de EXPLAIN (ANALYZE, BUFFERS) no PostgreSQL e de
+    EXPLAIN QUERY PLAN no SQLite, apenas para SELECT: o ANALYZE executa
+    a consulta de novo, o que não pode acontecer com escritas. O EXPLAIN
+    roda em um savepoint, para que um erro não aborte a transação da
+    requisição.
+    - No máximo CONSULTAS_LENTAS_POR_MINUTO consultas são registradas
+    por processo; as demais são apenas contadas, para que o log não
+    aumente a carga do banco justamente quando ele está lento.
+"""
+
+logger = logging.getLogger('apps.core.consultas_lentas')
+
+EXPLAIN = {
+    'postgresql': 'EXPLAIN (ANALYZE, BUFFERS) ',
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+}
+
+
+class LimiteTaxa:
+
+    """
+        Balde de fichas: até `por_minuto` liberações por minuto.
+    """
+
+    def __init__(self):
+        self.trava = threading.Lock()
+        self.fichas = None
+        self.atualizado = time.monotonic()
+        self.descartadas = 0
+
+    def liberar(self, por_minuto):
+        """
+            Returns:
+                [int]: [Consultas descartadas desde a última liberação,
+                ou None se a consulta atual também deve ser descartada]
+        """
+        with self.trava:
+            agora = time.monotonic()
+
+            if self.fichas is None:
+                self.fichas = por_minuto
+
+            self.fichas = min(
+                por_minuto,
+                self.fichas + (agora - self.atualizado) * por_minuto / 60
+            )
+            self.atualizado = agora
+
+            if self.fichas < 1:
+                self.descartadas += 1
+                return None
+
+            self.fichas -= 1
+            descartadas, self.descartadas = self.descartadas, 0
+
+            return descartadas
+
+
+limite = LimiteTaxa()
+
+
+def plano_execucao(conexao, sql, params):
+    prefixo = EXPLAIN.get(conexao.vendor)
+
+    if prefixo is None or not sql.lstrip().upper().startswith('SELECT'):
+        return None
+
+    try:
+        with transaction.atomic(using=conexao.alias, savepoint=True):
+            with conexao.cursor() as cursor:
+                cursor.execute(prefixo + sql, params)
+                # O texto do plano é a última coluna (detail no SQLite).
+                plano = '\n'.join(
+                    str(linha[-1]) for linha in cursor.fetchall()
+                )
+    except Exception:
+        return 'Não foi possível obter o plano.'
+
+    return ocultar_parametros(plano, params)
+
+
+def ocultar_parametros(texto, params):
+    """
+        Substitui por ? os valores textuais dos parâmetros que o
+        PostgreSQL inclui no plano (Filter, Index Cond). Números não são
+        ocultados, pois se confundiriam com os custos e as linhas.
+    """
+    valores = sorted(
+        {
+            str(parametro) for parametro in params or []
+            if parametro is not None
+            and not isinstance(parametro, (bool, int, float, Decimal))
+            and str(parametro)
+        },
+        key=len,
+        reverse=True
+    )
+
+    for valor in valores:
+        texto = texto.replace(valor, '?')
+
+    return texto
+
+
+class ConsultasLentas:
+
+    """
+        execute_wrapper de uma conexão durante uma requisição.
+    """
+
+    def __init__(self, conexao, request):
+        self.conexao = conexao
+        self.request = request
+        self.explicando = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.explicando:
+            return execute(sql, params, many, context)
+
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracao = (time.perf_counter() - inicio) * 1000
+
+            if duracao >= settings.CONSULTAS_LENTAS_LIMITE_MS:
+                self.registrar(sql, params, many, duracao)
+
+    def registrar(self, sql, params, many, duracao):
+        descartadas = limite.liberar(settings.CONSULTAS_LENTAS_POR_MINUTO)
+
+        if descartadas is None:
+            return
+
+        self.explicando = True
+        try:
+            plano = None if many else plano_execucao(
+                self.conexao, sql, params
+            )
+        finally:
+            self.explicando = False
+
+        logger.warning(json.dumps({
+            'view': getattr(self.request, 'nome_view', None),
+            'rota': self.request.path,
+            'duracao_ms': round(duracao, 2),
+            'sql': sql,
+            'plano': plano,
+            'descartadas': descartadas,
+        }, ensure_ascii=False))
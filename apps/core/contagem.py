@@ -0,0 +1,101 @@
+import json
+from hashlib import md5
+
+from django.core.cache import cache
+from django.db import connections
+
+from apps.core.metricas import leitura_cache
+from apps.core.versoes import versoes_models
+
+"""
+    Estratégias de contagem usadas pela CustomPagination para o campo
+    `quantidade`. Cada viewset escolhe a sua pelo atributo
+    `estrategia_contagem` ('exata', 'cache' ou 'estimada').
+"""
+
+
+class ContagemExata:
+
+    def contar(self, queryset, request, view):
+        return queryset.count()
+
+
+class ContagemCache(ContagemExata):
+
+    """
+        Contagem exata guardada no cache por viewset, filtros e usuário.
+        - É invalidada pelas versões dos models de `dependencias_cache`
+        no viewset, ou do model do queryset quando o viewset não as
+        define (ver apps.core.versoes).
+    """
+
+    timeout = 60
+    parametros_ignorados = ['pagina', 'cursor']
+
+    def chave(self, queryset, request, view):
+        filtros = sorted(
+            (chave, valores)
+            for chave, valores in request.query_params.lists()
+            if chave not in self.parametros_ignorados
+        )
+        versoes = getattr(view, 'versoes', None) or versoes_models(
+            getattr(view, 'dependencias_cache', None) or [queryset.model]
+        )
+        resumo = md5(
+            json.dumps(
+                [filtros, view.kwargs, versoes], sort_keys=True, default=str
+            ).encode('utf-8')
+        ).hexdigest()
+
+        return 'contagem:{}:{}:{}'.format(
+            view.__class__.__name__,
+            request.user.pk,
+            resumo
+        )
+
+    def contar(self, queryset, request, view):
+        chave = self.chave(queryset, request, view)
+        quantidade = leitura_cache('contagem', cache.get(chave))
+
+        if quantidade is None:
+            quantidade = super().contar(queryset, request, view)
+            cache.set(chave, quantidade, self.timeout)
+
+        return quantidade
+
+
+class ContagemEstimada(ContagemExata):
+
+    """
+        Usa a estimativa do planejador do PostgreSQL (pg_class.reltuples)
+        para querysets sem filtro.
+        - Querysets filtrados, outros bancos ou tabelas pequenas, onde a
+        estimativa é imprecisa, usam a contagem exata.
+    """
+
+    minimo_estimativa = 1000
+
+    def contar(self, queryset, request, view):
+        conexao = connections[queryset.db]
+
+        if conexao.vendor != 'postgresql' or queryset.query.where:
+            return super().contar(queryset, request, view)
+
+        with conexao.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s',
+                [queryset.model._meta.db_table]
+            )
+            linha = cursor.fetchone()
+
+        if not linha or linha[0] < self.minimo_estimativa:
+            return super().contar(queryset, request, view)
+
+        return int(linha[0])
+
+
+ESTRATEGIAS_CONTAGEM = {
+    'exata': ContagemExata,
+    'cache': ContagemCache,
+    'estimada': ContagemEstimada,
+}
@@ -0,0 +1,101 @@
+import json
+from hashlib import md5
+
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.core.versoes import versoes_models
+
+"""
+    ETag e GET condicional (If-None-Match) para os viewsets.
+    - O ETag não vem do corpo da resposta: é calculado a partir das
+    versões dos models de `dependencias_cache` (ver apps.core.versoes),
+    da action, dos parâmetros, do usuário e do formato da resposta.
+    - Com o token em cache, responder 304 custa uma leitura do cache e
+    nenhuma consulta SQL: a view não é executada.
+"""
+
+
+class NaoModificado(Exception):
+    pass
+
+
+def etag_corresponde(etag, if_none_match):
+    """
+        Comparação fraca (RFC 7232): o prefixo W/ é ignorado.
+    """
+    if not if_none_match:
+        return False
+
+    etags = parse_etags(if_none_match)
+
+    return '*' in etags or etag.removeprefix('W/') in [
+        valor.removeprefix('W/') for valor in etags
+    ]
+
+
+class ETagMixin:
+
+    """
+        Mixin dos viewsets com `dependencias_cache`.
+        - O ETag é calculado depois da autenticação e das permissões, e
+        a versão dos models fica em self.versoes para o cache_resposta.
+        - A versão é por model, e não por registro: qualquer escrita em
+        qualquer linha de um model de `dependencias_cache` invalida o
+        ETag de todos os clientes das rotas que dependem dele.
+    """
+
+    metodos_etag = ['GET', 'HEAD']
+
+    def calcular_etag(self, request):
+        self.versoes = versoes_models(self.dependencias_cache)
+        resumo = md5(
+            json.dumps(
+                [
+                    self.__class__.__name__,
+                    self.action,
+                    'aluno' if hasattr(request, 'aluno') else 'professor',
+                    request.user.pk,
+                    request.accepted_media_type,
+                    sorted(request.query_params.lists()),
+                    self.kwargs,
+                    self.versoes
+                ],
+                sort_keys=True,
+                default=str
+            ).encode('utf-8')
+        ).hexdigest()
+
+        return f'W/"{resumo}"'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        self.etag = None
+
+        if request.method in self.metodos_etag:
+            self.etag = self.calcular_etag(request)
+
+            if etag_corresponde(
+                self.etag, request.META.get('HTTP_IF_NONE_MATCH')
+            ):
+                raise NaoModificado()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NaoModificado):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+
+        if getattr(self, 'etag', None) and response.status_code in [
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+        ]:
+            response['ETag'] = self.etag
+
+        return response
@@ -0,0 +1,173 @@
+import io
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import transaction
+from django.urls import Resolver404, resolve
+from rest_framework import serializers, status
+from rest_framework.views import APIView
+
+from apps.core.metricas import registro
+from apps.core.renderers import JSONRapidoRenderer
+from apps.core.versoes import atomic_versionado
+
+"""
+    Execução de várias requisições da API em uma única ida e volta
+    (POST /lote/).
+    - O token é validado e o papel (aluno/professor) é resolvido uma
+    única vez, na requisição do lote; as sub-requisições recebem o
+    usuário, o token e o papel já resolvidos.
+    - Cada sub-requisição é resolvida pelas urls do projeto e chamada
+    diretamente na view, sem passar pelos middlewares. Por isso apenas
+    rotas da API (views do DRF) são aceitas.
+    - Com `atomico`, o lote roda em uma única transação, interrompida e
+    revertida na primeira resposta com status >= 400. A transação é um
+    atomic_versionado: as leituras feitas no lote depois de uma escrita
+    não ficam válidas no cache após o rollback.
+"""
+
+METODOS = ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']
+
+# Cabeçalhos da requisição do lote que não valem para as sub-requisições.
+CABECALHOS_LOTE = [
+    'CONTENT_TYPE',
+    'CONTENT_LENGTH',
+    'HTTP_IF_NONE_MATCH',
+    'QUERY_STRING',
+]
+
+
+class SubRequisicaoSerializer(serializers.Serializer):
+    metodo = serializers.ChoiceField(choices=METODOS)
+    rota = serializers.CharField()
+    corpo = serializers.JSONField(required=False, default=None)
+
+    def validate_rota(self, value):
+        if not value.startswith('/'):
+            raise serializers.ValidationError(
+                'A rota deve começar com /.'
+            )
+
+        try:
+            match = resolve(value.partition('?')[0])
+        except Resolver404:
+            return value
+
+        view = getattr(match.func, 'cls', None)
+
+        if not (isinstance(view, type) and issubclass(view, APIView)):
+            raise serializers.ValidationError(
+                'Apenas rotas da API podem ser executadas em lote.'
+            )
+
+        return value
+
+
+class LoteSerializer(serializers.Serializer):
+    requisicoes = SubRequisicaoSerializer(many=True, allow_empty=False)
+    atomico = serializers.BooleanField(default=False)
+
+    def validate_requisicoes(self, value):
+        if len(value) > settings.LOTE_MAXIMO:
+            raise serializers.ValidationError(
+                'O lote aceita no máximo {} requisições.'.format(
+                    settings.LOTE_MAXIMO
+                )
+            )
+
+        return value
+
+
+def criar_subrequisicao(request, metodo, rota, corpo):
+    """
+        Monta a sub-requisição a partir do environ da requisição do
+        lote, com o mesmo usuário, token e papel.
+    """
+    caminho, _, query = rota.partition('?')
+    conteudo = b'' if corpo is None else JSONRapidoRenderer().render(corpo)
+
+    environ = {
+        chave: valor for chave, valor in request.META.items()
+        if chave not in CABECALHOS_LOTE
+    }
+    environ.update({
+        'REQUEST_METHOD': metodo,
+        'PATH_INFO': caminho,
+        'QUERY_STRING': query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(conteudo)),
+        'wsgi.input': io.BytesIO(conteudo),
+    })
+
+    subrequisicao = WSGIRequest(environ)
+    subrequisicao._force_auth_user = request.user
+    subrequisicao._force_auth_token = request.auth
+
+    for papel in ['aluno', 'professor']:
+        if hasattr(request, papel):
+            setattr(subrequisicao, papel, getattr(request, papel))
+
+    subrequisicao.papel_resolvido = True
+
+    return subrequisicao
+
+
+def executar_subrequisicao(request, metodo, rota, corpo):
+    try:
+        match = resolve(rota.partition('?')[0])
+    except Resolver404:
+        return {'status': status.HTTP_404_NOT_FOUND, 'corpo': None}
+
+    if match.url_name == 'lote':
+        return {
+            'status': status.HTTP_400_BAD_REQUEST,
+            'corpo': {'detail': 'Um lote não pode conter outro lote.'}
+        }
+
+    subrequisicao = criar_subrequisicao(request, metodo, rota, corpo)
+    subrequisicao.resolver_match = match
+
+    response = match.func(subrequisicao, *match.args, **match.kwargs)
+
+    registro.incrementar(
+        'lote_subrequisicoes_total',
+        {'rota': match.view_name, 'status': str(response.status_code)}
+    )
+
+    if hasattr(response, 'data'):
+        corpo = response.data
+    else:
+        corpo = response.content.decode(response.charset or 'utf-8')
+
+    return {'status': response.status_code, 'corpo': corpo}
+
+
+def executar_lote(request, requisicoes, atomico=False):
+    """
+        Executa as sub-requisições em ordem.
+
+        Returns:
+            [dict]: [Resultado (status e corpo) de cada sub-requisição
+            executada e se a transação foi revertida]
+    """
+    if not atomico:
+        return {
+            'revertido': False,
+            'resultados': [
+                executar_subrequisicao(request, **requisicao)
+                for requisicao in requisicoes
+            ]
+        }
+
+    resultados = []
+
+    with atomic_versionado():
+        for requisicao in requisicoes:
+            resultado = executar_subrequisicao(request, **requisicao)
+            resultados.append(resultado)
+
+            if resultado['status'] >= status.HTTP_400_BAD_REQUEST:
+                transaction.set_rollback(True)
+                return {'revertido': True, 'resultados': resultados}
+
+    return {'revertido': False, 'resultados': resultados}
@@ -2,14 +2,23 @@ from sistema_gestao_projetos.settings import (
     EMAIL_HOST_USER
 )
 
-from django.core.mail import send_mail
+from django.core.mail import get_connection, EmailMessage
 
 
-def enviar_email_cadastro(assunto, mensagem, email, anexos=[]):
+def enviar_emails_em_lote(emails):
+    """
+        Envia uma lista de (assunto, mensagem, email) usando uma única
+        conexão com o servidor de e-mail.
+        - Retorna a quantidade de mensagens enviadas.
+    """
+    mensagens = [
+        EmailMessage(
+            assunto,
+            mensagem,
+            EMAIL_HOST_USER,
+            [email]
+        ) for assunto, mensagem, email in emails
+    ]
 
-    send_mail(
-        assunto,
-        mensagem,
-        EMAIL_HOST_USER,
-        [email]
-    )
+    with get_connection() as conexao:
+        return conexao.send_messages(mensagens)
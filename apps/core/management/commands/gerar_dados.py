@@ -0,0 +1,335 @@
+from datetime import date, datetime, time, timedelta
+from random import Random
+from uuid import UUID
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.versoes import invalidar_versao
+from apps.projetos.models import (
+    Grupo, GrupoTarefa, Projeto, ProjetoGrupo, Tarefa
+)
+from apps.turmas.models import Disciplina, Turma, TurmaAluno
+from apps.usuarios.importacao import inserir_tabela_filha
+from apps.usuarios.models import Aluno, Professor, User
+
+SITUACOES = ['pendente'] * 6 + ['concluida'] * 3 + ['atrasada']
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Gera uma massa de dados sintética (professores, disciplinas, '
+        'turmas, alunos, grupos, projetos e tarefas) para benchmarks. '
+        'A mesma semente gera os mesmos dados.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--professores', type=int, default=20)
+        parser.add_argument(
+            '--disciplinas', type=int, default=3,
+            help='Disciplinas por professor.'
+        )
+        parser.add_argument(
+            '--turmas', type=int, default=2,
+            help='Turmas por disciplina.'
+        )
+        parser.add_argument('--alunos', type=int, default=5000)
+        parser.add_argument('--grupos', type=int, default=2000)
+        parser.add_argument('--projetos', type=int, default=1000)
+        parser.add_argument('--tarefas', type=int, default=1000000)
+        parser.add_argument(
+            '--lote', type=int, default=5000,
+            help='Registros por bulk_create.'
+        )
+        parser.add_argument('--semente', type=int, default=42)
+        parser.add_argument(
+            '--data-base', type=date.fromisoformat, default=None,
+            help='Data de referência dos prazos (AAAA-MM-DD). '
+            'Padrão: hoje.'
+        )
+
+    def handle(self, *args, **options):
+        if options['grupos'] > options['alunos']:
+            raise CommandError(
+                'Cada grupo tem um líder diferente: informe pelo menos '
+                'tantos alunos quanto grupos.'
+            )
+
+        self.aleatorio = Random(options['semente'])
+        self.lote = options['lote']
+        self.prefixo = f's{options["semente"]}'
+        self.data_base = options['data_base'] or date.today()
+
+        if User.objects.filter(
+            email__endswith=f'.{self.prefixo}@dados.local'
+        ).exists():
+            raise CommandError(
+                f'Os dados da semente {options["semente"]} já foram '
+                'gerados neste banco.'
+            )
+
+        self.senha = make_password('123')
+
+        with transaction.atomic():
+            professores = self.gerar_professores(options['professores'])
+            disciplinas = self.gerar_disciplinas(
+                professores, options['disciplinas']
+            )
+            turmas = self.gerar_turmas(disciplinas, options['turmas'])
+            alunos = self.gerar_alunos(options['alunos'], turmas)
+            grupos = self.gerar_grupos(
+                options['grupos'], alunos, disciplinas
+            )
+            projetos = self.gerar_projetos(
+                options['projetos'], disciplinas
+            )
+            grupos_por_projeto = self.gerar_projetos_grupos(
+                grupos, projetos
+            )
+            self.gerar_tarefas(
+                options['tarefas'], projetos, grupos_por_projeto
+            )
+
+        # Os bulk_create não disparam post_save: as contagens e
+        # respostas em cache são invalidadas aqui.
+        for model in [
+            User, Professor, Aluno, Disciplina, Turma, TurmaAluno,
+            Grupo, Projeto, ProjetoGrupo, Tarefa, GrupoTarefa
+        ]:
+            invalidar_versao(model)
+
+    def codigo(self):
+        return UUID(int=self.aleatorio.getrandbits(128), version=4)
+
+    def informar(self, modelo, quantidade):
+        self.stdout.write(f'{modelo}: {quantidade}')
+
+    def inserir(self, model, objetos):
+        for inicio in range(0, len(objetos), self.lote):
+            model.objects.bulk_create(objetos[inicio:inicio + self.lote])
+
+    def gerar_usuarios(self, papel, quantidade):
+        """
+            Returns:
+                [list]: [Ids dos usuários criados, na ordem dos e-mails]
+        """
+        emails = [
+            f'{papel}{indice}.{self.prefixo}@dados.local'
+            for indice in range(quantidade)
+        ]
+
+        self.inserir(User, [
+            User(email=email, password=self.senha) for email in emails
+        ])
+
+        ids = {}
+        for inicio in range(0, quantidade, self.lote):
+            ids.update(
+                User.objects.filter(
+                    email__in=emails[inicio:inicio + self.lote]
+                ).values_list('email', 'id')
+            )
+
+        return [ids[email] for email in emails]
+
+    def gerar_professores(self, quantidade):
+        professores = [
+            Professor(
+                djangocustomuser_ptr_id=usuario,
+                codigo=self.codigo(),
+                nome=f'Professor {indice}'
+            ) for indice, usuario in enumerate(
+                self.gerar_usuarios('professor', quantidade)
+            )
+        ]
+        inserir_tabela_filha(Professor, professores)
+        self.informar('Professores', len(professores))
+
+        return [professor.codigo for professor in professores]
+
+    def gerar_disciplinas(self, professores, por_professor):
+        disciplinas = [
+            Disciplina(
+                codigo=self.codigo(),
+                nome=f'Disciplina {indice + 1} do professor {numero}',
+                professor_id=professor,
+                quantidade_grupos=self.aleatorio.randint(2, 6)
+            )
+            for numero, professor in enumerate(professores)
+            for indice in range(por_professor)
+        ]
+        self.inserir(Disciplina, disciplinas)
+        self.informar('Disciplinas', len(disciplinas))
+
+        return [
+            (disciplina.codigo, disciplina.professor_id)
+            for disciplina in disciplinas
+        ]
+
+    def gerar_turmas(self, disciplinas, por_disciplina):
+        turmas = [
+            Turma(
+                codigo=self.codigo(),
+                nome=f'Turma {numero}.{indice + 1}',
+                periodo=f'{self.data_base.year}.{indice % 2 + 1}',
+                professor_id=professor,
+                disciplina_id=disciplina
+            )
+            for numero, (disciplina, professor) in enumerate(disciplinas)
+            for indice in range(por_disciplina)
+        ]
+        self.inserir(Turma, turmas)
+        self.informar('Turmas', len(turmas))
+
+        return [turma.codigo for turma in turmas]
+
+    def gerar_alunos(self, quantidade, turmas):
+        alunos = [
+            Aluno(
+                djangocustomuser_ptr_id=usuario,
+                codigo=self.codigo(),
+                nome=f'Aluno {indice}',
+                matricula=f'{self.data_base.year}{indice:08d}'
+            ) for indice, usuario in enumerate(
+                self.gerar_usuarios('aluno', quantidade)
+            )
+        ]
+        inserir_tabela_filha(Aluno, alunos)
+        self.informar('Alunos', len(alunos))
+
+        if turmas:
+            self.inserir(TurmaAluno, [
+                TurmaAluno(
+                    codigo=self.codigo(),
+                    turma_id=self.aleatorio.choice(turmas),
+                    aluno_id=aluno.codigo
+                ) for aluno in alunos
+            ])
+
+        return [aluno.codigo for aluno in alunos]
+
+    def gerar_grupos(self, quantidade, alunos, disciplinas):
+        grupos = [
+            Grupo(
+                codigo=self.codigo(),
+                lider_id=lider,
+                aluno_id=self.aleatorio.choice(alunos),
+                disciplina_id=self.aleatorio.choice(disciplinas)[0],
+                ativo=True
+            ) for lider in alunos[:quantidade]
+        ]
+        self.inserir(Grupo, grupos)
+        self.informar('Grupos', len(grupos))
+
+        return [grupo.codigo for grupo in grupos]
+
+    def gerar_projetos(self, quantidade, disciplinas):
+        projetos = []
+        for indice in range(quantidade):
+            disciplina, professor = self.aleatorio.choice(disciplinas)
+            projetos.append(
+                Projeto(
+                    codigo=self.codigo(),
+                    nome=f'Projeto {indice}',
+                    descricao=f'Descrição do projeto {indice}.',
+                    tipo=self.aleatorio.choice(['Pesquisa', 'Extensão']),
+                    area=self.aleatorio.choice(
+                        ['Computação', 'Educação', 'Saúde', 'Engenharia']
+                    ),
+                    professor_id=professor,
+                    disciplina_id=disciplina
+                )
+            )
+        self.inserir(Projeto, projetos)
+        self.informar('Projetos', len(projetos))
+
+        return [projeto.codigo for projeto in projetos]
+
+    def gerar_projetos_grupos(self, grupos, projetos):
+        """
+            Cada grupo seleciona um projeto.
+
+            Returns:
+                [dict]: [Grupos de cada projeto]
+        """
+        grupos_por_projeto = {}
+        projetos_grupos = []
+
+        if projetos:
+            for grupo in grupos:
+                projeto = self.aleatorio.choice(projetos)
+                grupos_por_projeto.setdefault(projeto, []).append(grupo)
+                projetos_grupos.append(
+                    ProjetoGrupo(
+                        codigo=self.codigo(),
+                        projeto_id=projeto,
+                        grupo_id=grupo
+                    )
+                )
+
+        self.inserir(ProjetoGrupo, projetos_grupos)
+        self.informar('Projetos grupos', len(projetos_grupos))
+
+        return grupos_por_projeto
+
+    def gerar_tarefas(self, quantidade, projetos, grupos_por_projeto):
+        """
+            Gera as tarefas em lotes, sem manter todas em memória.
+            - Tarefas de projetos com grupos recebem um GrupoTarefa.
+        """
+        if not projetos:
+            quantidade = 0
+
+        criadas = 0
+        vinculadas = 0
+
+        while criadas < quantidade:
+            tarefas = []
+            grupos_tarefas = []
+
+            for indice in range(
+                criadas, min(criadas + self.lote, quantidade)
+            ):
+                projeto = self.aleatorio.choice(projetos)
+                prazo = datetime.combine(
+                    date(1900, 1, 1),
+                    time(
+                        self.aleatorio.randrange(24),
+                        self.aleatorio.randrange(60)
+                    )
+                )
+                tarefa = Tarefa(
+                    codigo=self.codigo(),
+                    nome=f'Tarefa {indice}',
+                    descricao=f'Descrição da tarefa {indice}.',
+                    data=self.data_base + timedelta(
+                        days=self.aleatorio.randint(-60, 60)
+                    ),
+                    hora=timezone.make_aware(prazo),
+                    situacao=self.aleatorio.choice(SITUACOES),
+                    projeto_id=projeto
+                )
+                tarefas.append(tarefa)
+
+                if projeto in grupos_por_projeto:
+                    grupos_tarefas.append(
+                        GrupoTarefa(
+                            codigo=self.codigo(),
+                            tarefa_id=tarefa.codigo,
+                            grupo_id=self.aleatorio.choice(
+                                grupos_por_projeto[projeto]
+                            )
+                        )
+                    )
+
+            Tarefa.objects.bulk_create(tarefas)
+            GrupoTarefa.objects.bulk_create(grupos_tarefas)
+
+            criadas += len(tarefas)
+            vinculadas += len(grupos_tarefas)
+
+        self.informar('Tarefas', criadas)
+        self.informar('Grupos tarefas', vinculadas)
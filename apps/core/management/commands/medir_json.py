@@ -0,0 +1,132 @@
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from io import BytesIO
+from uuid import UUID
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.renderers import JSONRapidoParser, JSONRapidoRenderer, orjson
+from apps.projetos.models import Projeto, Tarefa
+from apps.projetos.serializers import TarefaSerializer
+from apps.turmas.models import Disciplina
+from apps.usuarios.models import Professor
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Compara o tempo de renderização e de leitura do JSON de uma '
+        'página de /tarefas/ entre o JSONRenderer/JSONParser do DRF e '
+        'o JSONRapidoRenderer/JSONRapidoParser. As tarefas são montadas '
+        'em memória, sem acessar o banco.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--itens', type=int, default=1000,
+            help='Tarefas na página.'
+        )
+        parser.add_argument(
+            '--repeticoes', type=int, default=50,
+            help='Medições de cada implementação.'
+        )
+
+    def pagina(self, itens):
+        """
+            Mesma estrutura da resposta paginada de /tarefas/.
+        """
+        professor = Professor(
+            codigo=UUID(int=1, version=4), nome='Professor Medição'
+        )
+        disciplina = Disciplina(
+            codigo=UUID(int=2, version=4), nome='Engenharia de Software',
+            professor=professor
+        )
+        projeto = Projeto(
+            codigo=UUID(int=3, version=4), nome='Projeto Medição',
+            professor=professor, disciplina=disciplina
+        )
+        inicio = timezone.make_aware(datetime(2022, 1, 1, 8))
+
+        tarefas = [
+            Tarefa(
+                codigo=UUID(int=indice + 4, version=4),
+                nome=f'Tarefa {indice}',
+                descricao='Descrição da tarefa número {}, com acentuação.'
+                .format(indice),
+                situacao='pendente',
+                data=date(2022, 1, 1) + timedelta(days=indice % 365),
+                hora=inicio + timedelta(minutes=indice),
+                ativo=True,
+                projeto=projeto
+            ) for indice in range(itens)
+        ]
+
+        return {
+            'pagina_atual': 1,
+            'links': {'proximo': None, 'anterior': None},
+            'quantidade': itens,
+            'resultados': TarefaSerializer(tarefas, many=True).data
+        }
+
+    def medir(self, funcao, repeticoes):
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append((time.perf_counter() - inicio) * 1000)
+
+        return statistics.median(tempos), min(tempos)
+
+    def handle(self, *args, **options):
+        dados = self.pagina(options['itens'])
+        repeticoes = options['repeticoes']
+
+        linhas = []
+        conteudos = {}
+        for nome, renderer, parser in [
+            ('DRF (json)', JSONRenderer(), JSONParser()),
+            ('Rápido (orjson)', JSONRapidoRenderer(), JSONRapidoParser()),
+        ]:
+            conteudo = renderer.render(dados, 'application/json')
+            conteudos[nome] = conteudo
+
+            renderizacao = self.medir(
+                lambda: renderer.render(dados, 'application/json'),
+                repeticoes
+            )
+            leitura = self.medir(
+                lambda: parser.parse(BytesIO(conteudo), 'application/json'),
+                repeticoes
+            )
+            linhas.append((nome, renderizacao, leitura, len(conteudo)))
+
+        if orjson is None:
+            self.stderr.write(
+                'O orjson não está instalado: o JSONRapidoRenderer usa a '
+                'implementação do DRF.'
+            )
+
+        self.stdout.write(
+            f'Página de {options["itens"]} tarefas, '
+            f'{repeticoes} repetições (mediana / mínimo, em ms)\n'
+        )
+        self.stdout.write(
+            '| Implementação | Renderização | Leitura | Bytes |'
+        )
+        self.stdout.write('|---|---|---|---|')
+        for nome, renderizacao, leitura, tamanho in linhas:
+            self.stdout.write(
+                '| {} | {:.2f} / {:.2f} | {:.2f} / {:.2f} | {} |'.format(
+                    nome, *renderizacao, *leitura, tamanho
+                )
+            )
+
+        iguais = len(set(conteudos.values())) == 1
+        self.stdout.write(
+            '\nJSON idêntico: {}'.format('sim' if iguais else 'não')
+        )
@@ -0,0 +1,69 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.carga import Carga, relatorio_markdown, resumir
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Executa um teste de carga contra um servidor em execução, com '
+        'os usuários criados pelo comando gerar_dados, e grava o '
+        'relatório de vazão e latência por rota em JSON e Markdown.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://localhost:8000')
+        parser.add_argument(
+            '--duracao', type=float, default=30,
+            help='Duração da medição, em segundos.'
+        )
+        parser.add_argument('--concorrencia', type=int, default=10)
+        parser.add_argument(
+            '--usuarios', type=int, default=10,
+            help='Alunos e professores autenticados de cada papel.'
+        )
+        parser.add_argument(
+            '--semente', type=int, default=42,
+            help='Semente usada no gerar_dados.'
+        )
+        parser.add_argument('--senha', default='123')
+        parser.add_argument(
+            '--saida', default='relatorio_carga',
+            help='Prefixo dos arquivos .json e .md do relatório.'
+        )
+
+    def handle(self, *args, **options):
+        credenciais = {
+            papel: [
+                (
+                    f'{papel}{indice}.s{options["semente"]}@dados.local',
+                    options['senha']
+                ) for indice in range(options['usuarios'])
+            ] for papel in ['aluno', 'professor']
+        }
+
+        carga = Carga(
+            options['url'],
+            credenciais,
+            concorrencia=options['concorrencia'],
+            duracao=options['duracao'],
+            semente=options['semente']
+        )
+
+        try:
+            carga.autenticar()
+        except RuntimeError as erro:
+            raise CommandError(str(erro))
+
+        resumo = resumir(carga.executar(), options['duracao'])
+        markdown = relatorio_markdown(resumo)
+
+        with open(f'{options["saida"]}.json', 'w') as arquivo:
+            json.dump(resumo, arquivo, indent=2, ensure_ascii=False)
+
+        with open(f'{options["saida"]}.md', 'w') as arquivo:
+            arquivo.write(markdown)
+
+        self.stdout.write(markdown)
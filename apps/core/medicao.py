@@ -0,0 +1,61 @@
+import time
+from contextvars import ContextVar
+
+from rest_framework.serializers import BaseSerializer
+
+"""
+    Medição por requisição (ver apps.core.middleware.MedicaoMiddleware).
+    - A medição ativa fica em uma ContextVar, então o custo fora das
+    requisições amostradas é apenas a leitura dela.
+"""
+
+medicao_atual = ContextVar('medicao_atual', default=None)
+
+
+class Medicao:
+
+    def __init__(self):
+        self.consultas = 0
+        self.tempo_banco = 0.0
+        self.tempo_serializacao = 0.0
+        self.view = None
+
+    def registrar_consulta(self, execute, sql, params, many, context):
+        """
+            execute_wrapper das conexões: conta as consultas e soma o
+            tempo gasto no banco.
+        """
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.tempo_banco += time.perf_counter() - inicio
+            self.consultas += 1
+
+
+def medir_serializacao(data):
+    """
+        Envolve BaseSerializer.data, somando o tempo de serialização na
+        medição ativa. Serializers aninhados usam to_representation e
+        não passam por aqui, então o tempo não é contado em dobro.
+    """
+    def data_medido(serializer):
+        medicao = medicao_atual.get()
+
+        if medicao is None:
+            return data.fget(serializer)
+
+        inicio = time.perf_counter()
+        try:
+            return data.fget(serializer)
+        finally:
+            medicao.tempo_serializacao += time.perf_counter() - inicio
+
+    data_medido.medido = True
+
+    return property(data_medido)
+
+
+def instalar_medicao_serializacao():
+    if not getattr(BaseSerializer.data.fget, 'medido', False):
+        BaseSerializer.data = medir_serializacao(BaseSerializer.data)
@@ -0,0 +1,357 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+"""
+    Métricas no formato de texto do Prometheus (rota /metricas/).
+    - Cada processo (worker do gunicorn, worker do celery) acumula as
+    métricas em memória, sem I/O por requisição.
+    - A cada METRICAS_INTERVALO segundos o processo grava o seu total
+    acumulado no cache (Redis) em um slot próprio. Como cada processo só
+    escreve no seu slot, não há disputa entre processos.
+    - Slots de processos encerrados expiram após METRICAS_RETENCAO
+    segundos e são reaproveitados pelos processos novos, então a
+    quantidade de slots acompanha os processos simultâneos, e não as
+    reinicializações.
+    - O registro é iniciado no primeiro uso em cada processo (pid): um
+    worker criado por fork não herda o dono, o slot nem as métricas do
+    processo pai.
+    - A rota /metricas/ soma os slots de todos os processos.
+    - Acertos e falhas dos caches da aplicação (token, contagem,
+    respostas) são contados pela própria aplicação (ver
+    leitura_cache), pois o Redis é compartilhado com o broker do celery.
+"""
+
+PREFIXO = 'sgp'
+CHAVE_PROCESSOS = 'metricas:processos'
+
+# Limites (em segundos) dos buckets dos histogramas de latência.
+BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+DESCRICOES = {
+    'requisicoes_total': ('counter', 'Requisições HTTP por rota e status.'),
+    'requisicao_segundos': (
+        'histogram', 'Latência das requisições HTTP por rota.'
+    ),
+    'consultas_sql_total': (
+        'counter', 'Consultas SQL executadas pelas requisições, por rota.'
+    ),
+    'tarefas_celery_total': (
+        'counter', 'Tarefas do celery executadas, por nome e estado.'
+    ),
+    'tarefa_celery_segundos': (
+        'histogram', 'Duração das tarefas do celery, por nome.'
+    ),
+    'cache_acertos_total': (
+        'counter', 'Leituras dos caches da aplicação que encontraram a chave.'
+    ),
+    'cache_falhas_total': (
+        'counter',
+        'Leituras dos caches da aplicação que não encontraram a chave.'
+    ),
+    'cache_respostas_total': (
+        'counter', 'Leituras do cache de respostas, por rota e resultado.'
+    ),
+    'lote_subrequisicoes_total': (
+        'counter', 'Sub-requisições executadas pelo /lote/, por rota e status.'
+    ),
+    'cache_taxa_acerto': (
+        'gauge', 'Acertos / (acertos + falhas) por cache da aplicação.'
+    ),
+}
+
+
+def chave_serie(nome, rotulos):
+    return json.dumps([nome, sorted(rotulos.items())])
+
+
+def chave_processo(processo):
+    return f'metricas:processo:{processo}'
+
+
+class Registro:
+
+    def __init__(self):
+        self.pid = None
+
+    def verificar_processo(self):
+        """
+            Reinicia o registro na primeira chamada de cada processo.
+        """
+        pid = os.getpid()
+
+        if self.pid == pid:
+            return
+
+        self.pid = pid
+        self.trava = threading.Lock()
+        self.contadores = {}
+        self.histogramas = {}
+        self.processo = None
+        self.dono = uuid4().hex
+        self.ultimo_envio = 0.0
+
+    def incrementar(self, nome, rotulos, valor=1):
+        self.verificar_processo()
+        chave = chave_serie(nome, rotulos)
+
+        with self.trava:
+            self.contadores[chave] = self.contadores.get(chave, 0) + valor
+
+        self.enviar()
+
+    def observar(self, nome, rotulos, valor):
+        """
+            Registra um valor no histograma: [contagem por bucket...,
+            contagem do +Inf, soma].
+        """
+        self.verificar_processo()
+        chave = chave_serie(nome, rotulos)
+
+        with self.trava:
+            histograma = self.histogramas.setdefault(
+                chave, [0] * (len(BUCKETS) + 1) + [0.0]
+            )
+            histograma[bisect_left(BUCKETS, valor)] += 1
+            histograma[-1] += valor
+
+        self.enviar()
+
+    def dados(self):
+        self.verificar_processo()
+
+        with self.trava:
+            return {
+                'contadores': dict(self.contadores),
+                'histogramas': {
+                    chave: list(valores)
+                    for chave, valores in self.histogramas.items()
+                }
+            }
+
+    def enviar(self, forcar=False):
+        """
+            Grava o total acumulado do processo no cache, no máximo uma
+            vez a cada METRICAS_INTERVALO segundos.
+        """
+        self.verificar_processo()
+        agora = time.monotonic()
+
+        if not forcar and (
+            agora - self.ultimo_envio < settings.METRICAS_INTERVALO
+        ):
+            return
+
+        self.ultimo_envio = agora
+
+        try:
+            dados = {**self.dados(), 'dono': self.dono}
+
+            if not self.ocupar_slot(dados):
+                cache.set(
+                    chave_processo(self.processo),
+                    dados,
+                    settings.METRICAS_RETENCAO
+                )
+        except Exception:
+            # Métricas não podem derrubar a requisição.
+            pass
+
+    def ocupar_slot(self, dados):
+        """
+            Mantém o slot do processo ou ocupa um novo: o primeiro slot
+            expirado ou, se não houver, um slot novo (incr atômico).
+            - O slot é perdido quando expira e é ocupado por outro
+            processo, ou quando o Redis é limpo.
+
+            Returns:
+                [bool]: [Se os dados já foram gravados no slot novo]
+        """
+        if self.processo is not None:
+            atual = cache.get(chave_processo(self.processo))
+
+            if atual is not None and atual.get('dono') == self.dono:
+                return False
+
+        quantidade = cache.get(CHAVE_PROCESSOS, 0)
+
+        for processo in range(1, quantidade + 1):
+            if cache.add(
+                chave_processo(processo), dados, settings.METRICAS_RETENCAO
+            ):
+                self.processo = processo
+                return True
+
+        cache.add(CHAVE_PROCESSOS, 0, None)
+        self.processo = cache.incr(CHAVE_PROCESSOS)
+
+        return False
+
+
+registro = Registro()
+
+
+def somar(total, dados):
+    for chave, valor in dados['contadores'].items():
+        total['contadores'][chave] = (
+            total['contadores'].get(chave, 0) + valor
+        )
+
+    for chave, valores in dados['histogramas'].items():
+        atual = total['histogramas'].setdefault(chave, [0] * len(valores))
+        for indice, valor in enumerate(valores):
+            atual[indice] += valor
+
+
+def coletar():
+    """
+        Soma as métricas do processo atual com as dos demais processos.
+    """
+    total = {'contadores': {}, 'histogramas': {}}
+    somar(total, registro.dados())
+
+    try:
+        quantidade = cache.get(CHAVE_PROCESSOS, 0)
+        outros = cache.get_many([
+            chave_processo(processo)
+            for processo in range(1, quantidade + 1)
+            if processo != registro.processo
+        ])
+    except Exception:
+        outros = {}
+
+    for dados in outros.values():
+        somar(total, dados)
+
+    return total
+
+
+def leitura_cache(nome, valor):
+    """
+        Conta a leitura de um cache da aplicação como acerto (valor
+        encontrado) ou falha (None) e devolve o valor.
+    """
+    registro.incrementar(
+        'cache_falhas_total' if valor is None else 'cache_acertos_total',
+        {'cache': nome}
+    )
+
+    return valor
+
+
+def formatar_rotulos(rotulos):
+    if not rotulos:
+        return ''
+
+    return '{' + ','.join(
+        '{}="{}"'.format(
+            nome,
+            str(valor).replace('\\', '\\\\').replace('"', '\\"')
+        ) for nome, valor in rotulos
+    ) + '}'
+
+
+def formatar_numero(valor):
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+def exportar():
+    """
+        Returns:
+            [str]: [Métricas no formato de texto do Prometheus]
+    """
+    dados = coletar()
+    series = {}
+
+    for chave, valor in dados['contadores'].items():
+        nome, rotulos = json.loads(chave)
+        series.setdefault(nome, []).append((rotulos, valor))
+
+    for chave, valores in dados['histogramas'].items():
+        nome, rotulos = json.loads(chave)
+        series.setdefault(nome, []).append((rotulos, valores))
+
+    leituras = {}
+    for indice, nome in enumerate(
+        ['cache_acertos_total', 'cache_falhas_total']
+    ):
+        for rotulos, valor in series.get(nome, []):
+            leituras.setdefault(json.dumps(rotulos), [0, 0])[indice] = valor
+
+    if leituras:
+        series['cache_taxa_acerto'] = [
+            (json.loads(rotulos), acertos / (acertos + falhas))
+            for rotulos, (acertos, falhas) in leituras.items()
+        ]
+
+    linhas = []
+    for nome in sorted(series):
+        tipo, descricao = DESCRICOES[nome]
+        metrica = f'{PREFIXO}_{nome}'
+
+        linhas.append(f'# HELP {metrica} {descricao}')
+        linhas.append(f'# TYPE {metrica} {tipo}')
+
+        for rotulos, valor in sorted(series[nome]):
+            if tipo != 'histogram':
+                linhas.append(
+                    metrica + formatar_rotulos(rotulos)
+                    + ' ' + formatar_numero(valor)
+                )
+                continue
+
+            acumulado = 0
+            for limite, quantidade in zip(
+                [*map(str, BUCKETS), '+Inf'], valor[:-1]
+            ):
+                acumulado += quantidade
+                linhas.append(
+                    f'{metrica}_bucket'
+                    + formatar_rotulos(rotulos + [['le', limite]])
+                    + f' {acumulado}'
+                )
+            linhas.append(
+                f'{metrica}_sum' + formatar_rotulos(rotulos)
+                + ' ' + formatar_numero(valor[-1])
+            )
+            linhas.append(
+                f'{metrica}_count' + formatar_rotulos(rotulos)
+                + f' {acumulado}'
+            )
+
+    return '\n'.join(linhas) + '\n'
+
+
+inicios_tarefas = {}
+
+
+def tarefa_iniciada(task_id=None, **kwargs):
+    inicios_tarefas[task_id] = time.perf_counter()
+
+
+def tarefa_finalizada(task_id=None, task=None, state=None, **kwargs):
+    """
+        Receiver de task_postrun do celery.
+    """
+    inicio = inicios_tarefas.pop(task_id, None)
+    nome = getattr(task, 'name', 'desconhecida')
+
+    registro.incrementar(
+        'tarefas_celery_total', {'tarefa': nome, 'estado': state or ''}
+    )
+    if inicio is not None:
+        registro.observar(
+            'tarefa_celery_segundos',
+            {'tarefa': nome},
+            time.perf_counter() - inicio
+        )
+
+    registro.enviar(forcar=True)
@@ -0,0 +1,182 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from apps.core.consultas_lentas import ConsultasLentas
+from apps.core.medicao import Medicao, medicao_atual
+from apps.core.metricas import registro
+
+logger = logging.getLogger('apps.core.medicao')
+
+
+def nome_view(view_func, metodo):
+    """
+        Returns:
+            [str]: [ViewSet e action, ex.: TarefaViewSet.list]
+    """
+    classe = getattr(view_func, 'cls', None)
+
+    if classe is None:
+        return f'{view_func.__module__}.{view_func.__name__}'
+
+    acoes = getattr(view_func, 'actions', None) or {}
+    acao = acoes.get(metodo.lower())
+
+    return f'{classe.__name__}.{acao}' if acao else classe.__name__
+
+
+class MedicaoMiddleware:
+
+    """
+        Mede, por requisição, a quantidade de consultas SQL, o tempo no
+        banco, o tempo de serialização (BaseSerializer.data) e o tempo
+        total da view.
+        - Os valores vão no cabeçalho Server-Timing da resposta e em uma
+        linha de log JSON no logger apps.core.medicao.
+        - Apenas uma fração MEDICAO_AMOSTRAGEM (0 a 1) das requisições
+        é medida; as demais seguem sem nenhum custo adicional.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.MEDICAO_AMOSTRAGEM:
+            return self.get_response(request)
+
+        medicao = Medicao()
+        token = medicao_atual.set(medicao)
+
+        inicio = time.perf_counter()
+        try:
+            with ExitStack() as pilha:
+                for conexao in connections.all():
+                    pilha.enter_context(
+                        conexao.execute_wrapper(medicao.registrar_consulta)
+                    )
+
+                response = self.get_response(request)
+        finally:
+            medicao_atual.reset(token)
+
+        tempo_view = time.perf_counter() - inicio
+
+        response['Server-Timing'] = ', '.join([
+            'db;dur={:.2f};desc="{} consultas"'.format(
+                medicao.tempo_banco * 1000, medicao.consultas
+            ),
+            'serializer;dur={:.2f}'.format(
+                medicao.tempo_serializacao * 1000
+            ),
+            'view;dur={:.2f}'.format(tempo_view * 1000),
+        ])
+
+        logger.info(json.dumps({
+            'view': medicao.view,
+            'metodo': request.method,
+            'rota': request.path,
+            'status': response.status_code,
+            'consultas': medicao.consultas,
+            'banco_ms': round(medicao.tempo_banco * 1000, 2),
+            'serializacao_ms': round(medicao.tempo_serializacao * 1000, 2),
+            'view_ms': round(tempo_view * 1000, 2),
+        }))
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        medicao = medicao_atual.get()
+
+        if medicao is not None:
+            medicao.view = nome_view(view_func, request.method)
+
+
+class MetricasMiddleware:
+
+    """
+        Registra, para cada requisição, a contagem por rota/método/status,
+        a latência e a quantidade de consultas SQL (ver apps.core.metricas).
+        - A rota é o nome da URL (ex.: tarefas-visualizar), para manter a
+        quantidade de séries pequena.
+    """
+
+    ignoradas = ['metricas']
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        consultas = []
+
+        def contar_consulta(execute, sql, params, many, context):
+            consultas.append(None)
+            return execute(sql, params, many, context)
+
+        inicio = time.perf_counter()
+
+        with ExitStack() as pilha:
+            for conexao in connections.all():
+                pilha.enter_context(
+                    conexao.execute_wrapper(contar_consulta)
+                )
+
+            response = self.get_response(request)
+
+        duracao = time.perf_counter() - inicio
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        rota = getattr(resolver_match, 'view_name', None) or 'desconhecida'
+
+        if rota not in self.ignoradas:
+            registro.incrementar(
+                'requisicoes_total',
+                {
+                    'rota': rota,
+                    'metodo': request.method,
+                    'status': response.status_code
+                }
+            )
+            registro.observar(
+                'requisicao_segundos', {'rota': rota}, duracao
+            )
+            if consultas:
+                registro.incrementar(
+                    'consultas_sql_total', {'rota': rota}, len(consultas)
+                )
+
+        return response
+
+
+class ConsultasLentasMiddleware:
+
+    """
+        Registra as consultas que passam de CONSULTAS_LENTAS_LIMITE_MS
+        durante a requisição, com a view de origem e o plano de execução
+        (ver apps.core.consultas_lentas).
+        - Desligado quando CONSULTAS_LENTAS_LIMITE_MS é 0.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.CONSULTAS_LENTAS_LIMITE_MS:
+            return self.get_response(request)
+
+        with ExitStack() as pilha:
+            for conexao in connections.all():
+                pilha.enter_context(
+                    conexao.execute_wrapper(
+                        ConsultasLentas(conexao, request)
+                    )
+                )
+
+            return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.nome_view = nome_view(view_func, request.method)
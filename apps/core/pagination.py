@@ -1,13 +1,215 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import partial
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from apps.core.contagem import ESTRATEGIAS_CONTAGEM
+
+
+class ContagemPaginator(Paginator):
+
+    def __init__(self, *args, contagem=None, **kwargs):
+        self.contagem = contagem
+        super().__init__(*args, **kwargs)
+
+    @cached_property
+    def count(self):
+        if self.contagem is None:
+            return super().count
+
+        return self.contagem(self.object_list)
 
 
 class CustomPagination(PageNumberPagination):
 
+    """
+        Paginação por número de página.
+        - O campo `quantidade` é calculado pela estrategia_contagem
+        do viewset (exata por padrão, ver apps.core.contagem).
+        - Viewsets que definem `cursor_ordering` também aceitam
+        o parâmetro `?cursor=`, que pagina por chave (keyset) a partir
+        do último registro exibido, sem OFFSET e sem COUNT(*).
+    """
+
     invalid_page_message = ('Página inválida')
+    invalid_cursor_message = ('Cursor inválido')
     page_query_param = 'pagina'
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_ordering = getattr(view, 'cursor_ordering', None)
+        self.usa_cursor = bool(
+            self.cursor_ordering
+            and self.cursor_query_param in request.query_params
+        )
+
+        if not self.usa_cursor:
+            estrategia = ESTRATEGIAS_CONTAGEM[
+                getattr(view, 'estrategia_contagem', 'exata')
+            ]()
+            self.django_paginator_class = partial(
+                ContagemPaginator,
+                contagem=partial(
+                    estrategia.contar, request=request, view=view
+                )
+            )
+
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        posicao, reverso = self.decode_cursor(request, queryset.model)
+
+        ordering = [
+            f'-{campo}' if reverso else campo
+            for campo in self.cursor_ordering
+        ]
+        queryset = queryset.order_by(*ordering)
+
+        if posicao is not None:
+            queryset = queryset.filter(
+                self.filtro_posicao(posicao, reverso)
+            )
+
+        resultados = list(queryset[:page_size + 1])
+        tem_mais = len(resultados) > page_size
+        resultados = resultados[:page_size]
+
+        if reverso:
+            resultados.reverse()
+            self.tem_proximo = posicao is not None
+            self.tem_anterior = tem_mais
+        else:
+            self.tem_proximo = tem_mais
+            self.tem_anterior = posicao is not None
+
+        self.resultados = resultados
+
+        return resultados
+
+    def decode_cursor(self, request, model):
+        """
+            Decodifica o cursor e converte cada valor da posição com o
+            to_python do campo correspondente da ordenação.
+            - Um cursor adulterado (valores fora do tipo do campo, listas
+            ou objetos aninhados) resulta em 404, como um cursor inválido.
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+
+        if not cursor:
+            return None, False
+
+        try:
+            dados = json.loads(
+                urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+            )
+            posicao = dados['p']
+            reverso = bool(dados.get('r', False))
+        except (ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(posicao, list) or len(posicao) != len(
+            self.cursor_ordering
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+        try:
+            posicao = [
+                self.converter_valor(model, campo, valor)
+                for campo, valor in zip(self.cursor_ordering, posicao)
+            ]
+        except (ValidationError, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return posicao, reverso
+
+    def converter_valor(self, model, campo, valor):
+        if not isinstance(valor, str):
+            raise TypeError(valor)
+
+        *relacoes, nome = campo.split('__')
+        for relacao in relacoes:
+            model = model._meta.get_field(relacao).related_model
+
+        return model._meta.get_field(nome).to_python(valor)
+
+    def encode_cursor(self, instance, reverso=False):
+        posicao = []
+        for campo in self.cursor_ordering:
+            valor = instance
+            for atributo in campo.split('__'):
+                valor = getattr(valor, atributo)
+
+            posicao.append(
+                valor.isoformat() if hasattr(valor, 'isoformat')
+                else str(valor)
+            )
+
+        dados = json.dumps({'p': posicao, 'r': reverso})
+
+        cursor = urlsafe_b64encode(dados.encode('utf-8')).decode('ascii')
+
+        url = remove_query_param(
+            self.request.build_absolute_uri(),
+            self.page_query_param
+        )
+
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def filtro_posicao(self, posicao, reverso):
+        """
+            Monta a comparação lexicográfica entre as colunas da
+            ordenação e a posição do cursor:
+            (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+        """
+        lookup = 'lt' if reverso else 'gt'
+        filtro = Q()
+        iguais = {}
+
+        for campo, valor in zip(self.cursor_ordering, posicao):
+            filtro |= Q(**iguais, **{f'{campo}__{lookup}': valor})
+            iguais[campo] = valor
+
+        return filtro
+
+    def get_next_link(self):
+        if not getattr(self, 'usa_cursor', False):
+            return super().get_next_link()
+
+        if not (self.tem_proximo and self.resultados):
+            return None
+
+        return self.encode_cursor(self.resultados[-1])
+
+    def get_previous_link(self):
+        if not getattr(self, 'usa_cursor', False):
+            return super().get_previous_link()
+
+        if not (self.tem_anterior and self.resultados):
+            return None
+
+        return self.encode_cursor(self.resultados[0], reverso=True)
 
     def get_paginated_response(self, data):
+        if self.usa_cursor:
+            return Response({
+                'pagina_atual': None,
+                'links': {
+                    'proximo': self.get_next_link(),
+                    'anterior': self.get_previous_link()
+                },
+                'quantidade': None,
+                'resultados': data
+            })
+
         return Response({
             'pagina_atual': self.get_page_number(
                 self.request,
@@ -14,6 +14,9 @@ class BaseUsuarioPermission(BasePermission):
 class AlunoPermission(BaseUsuarioPermission):
 
     def has_permission(self, request, view):
+        if getattr(request, 'papel_resolvido', False):
+            return hasattr(request, 'aluno')
+
         try:
             aluno = request.user.aluno
             request.aluno = aluno
@@ -27,6 +30,9 @@ class AlunoPermission(BaseUsuarioPermission):
 
 class ProfessorPermission(BaseUsuarioPermission):
     def has_permission(self, request, view):
+        if getattr(request, 'papel_resolvido', False):
+            return hasattr(request, 'professor')
+
         try:
             professor = request.user.professor
             request.professor = professor
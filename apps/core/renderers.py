@@ -0,0 +1,71 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+"""
+    Renderer e parser JSON com o orjson.
+    - O orjson serializa UUID, dict, list, str e números em C. Os demais
+    tipos (Decimal, datetime, date, time, strings lazy) passam pelo
+    mesmo JSONEncoder do DRF, para que o JSON seja idêntico ao do
+    JSONRenderer padrão.
+    - Sem o orjson instalado, ou quando o cliente pede indentação
+    (Accept: application/json; indent=4), o renderer e o parser usam a
+    implementação padrão do DRF.
+"""
+
+OPCOES_ORJSON = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    if orjson else 0
+)
+
+
+class JSONRapidoRenderer(JSONRenderer):
+
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        if orjson is None or self.get_indent(
+            accepted_media_type or '', renderer_context or {}
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+
+        conteudo = orjson.dumps(
+            data, default=self.encoder.default, option=OPCOES_ORJSON
+        )
+
+        # Mesmo escape do JSONRenderer: U+2028 e U+2029 são quebras de
+        # linha em JavaScript.
+        return conteudo.replace(
+            b'\xe2\x80\xa8', b'\\u2028'
+        ).replace(
+            b'\xe2\x80\xa9', b'\\u2029'
+        )
+
+
+class JSONRapidoParser(JSONParser):
+
+    renderer_class = JSONRapidoRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,132 @@
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from apps.core.metricas import chave_serie, registro
+from apps.core.versoes import atomic_versionado
+from apps.projetos.tests.factory.projetos import ProjetoFactory
+from apps.turmas.models import Turma
+from apps.turmas.tests.factory.turmas import DisciplinaFactory
+from apps.usuarios.tests.test_login import TestCore
+
+
+class TestCacheRespostas(TestCore):
+
+    """
+        Cache das respostas de /projetos/, /turmas/ e
+        /tarefas/{pk}/visualizar/, invalidado pelas escritas.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        cls.cliente_professor = cls.cliente_autenticado(cls.professor)
+
+        cls.disciplina = DisciplinaFactory(professor=cls.professor)
+        cls.turmas = [
+            Turma.objects.create(
+                nome=f'Turma {indice}',
+                periodo='2022.1',
+                professor=cls.professor,
+                disciplina=cls.disciplina
+            ) for indice in range(2)
+        ]
+
+    def contador(self, resultado):
+        return registro.dados()['contadores'].get(
+            chave_serie(
+                'cache_respostas_total',
+                {'rota': 'projetos-list', 'resultado': resultado}
+            ),
+            0
+        )
+
+    def test_cache_resposta_acerto(self):
+        ProjetoFactory(professor=self.professor, disciplina=self.disciplina)
+        acertos, falhas = self.contador('acerto'), self.contador('falha')
+
+        primeira = self.client.get('/projetos/')
+
+        with CaptureQueriesContext(connection) as consultas:
+            segunda = self.client.get('/projetos/')
+
+        self.assertEqual(
+            segunda.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertEqual(segunda.data, primeira.data)
+        self.assertEqual(len(consultas), 0)
+        self.assertEqual(self.contador('acerto'), acertos + 1)
+        self.assertEqual(self.contador('falha'), falhas + 1)
+
+    def test_cache_resposta_invalidada_por_sinal(self):
+        self.client.get('/projetos/')
+
+        projeto = ProjetoFactory(
+            professor=self.professor, disciplina=self.disciplina
+        )
+        response = self.client.get('/projetos/')
+
+        self.assertEqual(
+            [resultado['codigo'] for resultado in response.data['resultados']],
+            [projeto.codigo]
+        )
+
+    def test_cache_resposta_invalidada_por_bulk_create(self):
+        """
+            A sincronização insere os alunos com bulk_create, que não
+            dispara post_save.
+        """
+        self.assertEqual(
+            self.client.get('/turmas/').data['quantidade'],
+            2
+        )
+
+        response = self.cliente_professor.put(
+            f'/turmas/{self.turmas[0].codigo}/sincronizar-alunos/',
+            data={'alunos': [str(self.aluno.codigo)]},
+            format='json'
+        )
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+
+        self.assertEqual(
+            self.client.get('/turmas/').data['quantidade'],
+            1
+        )
+
+    def test_cache_resposta_transacao_revertida(self):
+        """
+            Uma leitura feita dentro da transação, depois de uma escrita,
+            não fica válida no cache quando a transação é revertida.
+        """
+        self.client.get('/projetos/')
+
+        with atomic_versionado():
+            ProjetoFactory(
+                professor=self.professor, disciplina=self.disciplina
+            )
+
+            self.assertEqual(
+                self.client.get('/projetos/').data['quantidade'],
+                1
+            )
+
+            transaction.set_rollback(True)
+
+        self.assertEqual(
+            self.client.get('/projetos/').data['quantidade'],
+            0
+        )
+
+    def test_cache_resposta_por_usuario(self):
+        ProjetoFactory(professor=self.professor, disciplina=self.disciplina)
+
+        aluno = self.client.get('/projetos/')
+        professor = self.cliente_professor.get('/projetos/')
+
+        self.assertIsNone(aluno.data['resultados'][0]['grupos'])
+        self.assertEqual(professor.data['resultados'][0]['grupos'], [])
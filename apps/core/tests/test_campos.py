@@ -0,0 +1,143 @@
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from apps.core.campos import arvore_campos, incluir, podar
+from apps.projetos.tests.factory.projetos import (
+    GrupoFactory, ProjetoFactory, ProjetoGrupoFactory, TarefaFactory
+)
+from apps.turmas.tests.factory.turmas import DisciplinaFactory, TurmaFactory
+from apps.usuarios.tests.test_login import TestCore
+
+
+class TestArvoreCampos(SimpleTestCase):
+
+    def test_arvore_campos(self):
+        self.assertIsNone(arvore_campos(''))
+        self.assertEqual(
+            arvore_campos('codigo, nome,disciplina.nome,,disciplina.codigo'),
+            {
+                'codigo': {},
+                'nome': {},
+                'disciplina': {'nome': {}, 'codigo': {}}
+            }
+        )
+        self.assertEqual(
+            arvore_campos('projeto.nome,projeto'),
+            {'projeto': {}}
+        )
+
+    def test_incluir_podar(self):
+        arvore = arvore_campos('codigo,projeto.nome')
+
+        self.assertTrue(incluir(arvore, 'projeto'))
+        self.assertFalse(incluir(arvore, 'projeto.professor'))
+        self.assertFalse(incluir(arvore, 'nome'))
+        self.assertTrue(incluir(None, 'nome'))
+        self.assertEqual(
+            podar(
+                [{'codigo': 1, 'nome': 'a', 'projeto': {'nome': 'b', 'x': 2}}],
+                arvore
+            ),
+            [{'codigo': 1, 'projeto': {'nome': 'b'}}]
+        )
+
+
+@override_settings(CACHE_RESPOSTAS_TIMEOUT=0)
+class TestCampos(TestCore):
+
+    """
+        `?campos=` poda a resposta e as consultas das listagens.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        cls.cliente_professor = cls.cliente_autenticado(cls.professor)
+
+        cls.disciplina = DisciplinaFactory(professor=cls.professor)
+        cls.projeto = ProjetoFactory(
+            professor=cls.professor, disciplina=cls.disciplina
+        )
+        ProjetoGrupoFactory(
+            projeto=cls.projeto,
+            grupo=GrupoFactory(lider=cls.aluno, disciplina=cls.disciplina)
+        )
+        TarefaFactory(projeto=cls.projeto)
+        cls.turma = TurmaFactory(
+            professor=cls.professor, disciplina=cls.disciplina
+        )
+
+    def listar(self, url):
+        self.cliente_professor.get(url)
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.cliente_professor.get(url)
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+
+        return response.data['resultados'][0], ' '.join(
+            consulta['sql'] for consulta in consultas
+        )
+
+    def test_campos_projetos(self):
+        completo, sql_completo = self.listar('/projetos/')
+        projeto, sql = self.listar(
+            '/projetos/?campos=codigo,nome,disciplina.nome'
+        )
+
+        self.assertEqual(
+            projeto,
+            {
+                'codigo': self.projeto.codigo,
+                'nome': self.projeto.nome,
+                'disciplina': {'nome': self.disciplina.nome}
+            }
+        )
+        self.assertIn('tb_grupo', sql_completo)
+        self.assertNotIn('tb_grupo', sql)
+        self.assertNotIn('"tb_projeto"."area"', sql)
+        self.assertNotIn('"tb_professor"."nome"', sql)
+
+    def test_campos_tarefas(self):
+        tarefa, sql = self.listar('/tarefas/?campos=codigo,projeto.nome')
+
+        self.assertEqual(
+            tarefa,
+            {
+                'codigo': self.projeto.tarefa_set.get().codigo,
+                'projeto': {'nome': self.projeto.nome}
+            }
+        )
+        self.assertNotIn('tb_disciplina', sql)
+        self.assertNotIn('"tb_tarefa"."descricao"', sql)
+
+    def test_campos_turmas(self):
+        turma, sql = self.listar('/turmas/?campos=codigo,periodo')
+
+        self.assertEqual(
+            turma,
+            {'codigo': self.turma.codigo, 'periodo': self.turma.periodo}
+        )
+        self.assertNotIn('tb_disciplina', sql)
+        self.assertNotIn('tb_professor', sql)
+        self.assertNotIn('tb_turmaaluno', sql)
+
+    def test_campos_escrita(self):
+        response = self.client.patch(
+            f'/turmas/{self.turma.codigo}/participar/?campos=codigo,alunos'
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertEqual(
+            response.data['alunos'][0]['codigo'], self.aluno.codigo
+        )
+        self.assertEqual(set(response.data), {'codigo', 'alunos'})
@@ -0,0 +1,84 @@
+from django.contrib.auth.hashers import make_password
+from django.test import LiveServerTestCase, SimpleTestCase, override_settings
+
+from apps.core.carga import Carga, percentil, relatorio_markdown, resumir
+from apps.usuarios.models import Aluno, Professor
+
+
+class TestResumoCarga(SimpleTestCase):
+
+    def test_percentil(self):
+        valores = list(range(1, 101))
+
+        self.assertEqual(percentil(valores, 50), 50)
+        self.assertEqual(percentil(valores, 95), 95)
+        self.assertEqual(percentil(valores, 99), 99)
+        self.assertEqual(percentil([7], 99), 7)
+        self.assertIsNone(percentil([], 50))
+
+    def test_resumir(self):
+        resultados = [
+            ('GET /projetos/ (aluno)', 200, float(latencia))
+            for latencia in range(1, 101)
+        ] + [
+            ('GET /tarefas/ (professor)', 500, 10.0),
+            ('GET /tarefas/ (professor)', 200, 30.0),
+        ]
+
+        resumo = resumir(resultados, duracao=2)
+
+        self.assertEqual(resumo['requisicoes'], 102)
+        self.assertEqual(resumo['vazao'], 51)
+        self.assertEqual(resumo['rotas']['GET /projetos/ (aluno)']['p95'], 95)
+        self.assertEqual(
+            resumo['rotas']['GET /tarefas/ (professor)']['erros'], 1
+        )
+        self.assertIn(
+            '| GET /tarefas/ (professor) | 2 | 1 |',
+            relatorio_markdown(resumo)
+        )
+
+
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+        }
+    },
+    MEDICAO_AMOSTRAGEM=0
+)
+class TestCarga(LiveServerTestCase):
+
+    """
+        Executa a carga por um segundo contra o servidor de testes.
+    """
+
+    def setUp(self) -> None:
+        Professor.objects.create(
+            nome='Professor Carga',
+            email='professor0@carga.com',
+            password=make_password('123')
+        )
+        Aluno.objects.create(
+            nome='Aluno Carga',
+            email='aluno0@carga.com',
+            password=make_password('123'),
+            matricula='20220000000'
+        )
+
+    def test_carga(self):
+        carga = Carga(
+            self.live_server_url,
+            {
+                'aluno': [('aluno0@carga.com', '123')],
+                'professor': [('professor0@carga.com', '123')],
+            },
+            concorrencia=2,
+            duracao=1
+        )
+
+        resumo = resumir(carga.executar(), carga.duracao)
+
+        self.assertGreater(resumo['requisicoes'], 0)
+        for rota, dados in resumo['rotas'].items():
+            self.assertEqual(dados['erros'], 0, rota)
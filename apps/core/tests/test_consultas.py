@@ -0,0 +1,296 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from apps.core.pagination import CustomPagination
+from apps.projetos.tests.factory.projetos import (
+    GrupoFactory, GrupoTarefaFactory, ProjetoFactory, ProjetoGrupoFactory,
+    TarefaFactory
+)
+from apps.turmas.tests.factory.turmas import DisciplinaFactory, TurmaFactory
+from apps.usuarios.tests.factory.usuarios import AlunoFactory, ProfessorFactory
+from apps.usuarios.tests.test_login import TestCore
+
+
+TAMANHOS_PAGINA = [1, 10, 100]
+
+
+class DisciplinaConsultasFactory(DisciplinaFactory):
+
+    """
+        Várias disciplinas do mesmo professor (a DisciplinaFactory
+        reaproveita a disciplina existente do professor).
+    """
+
+    class Meta:
+        django_get_or_create = ()
+
+
+class ProjetoConsultasFactory(ProjetoFactory):
+
+    """
+        Vários projetos do mesmo professor (a ProjetoFactory reaproveita
+        o projeto existente do professor).
+    """
+
+    class Meta:
+        django_get_or_create = ()
+
+
+@override_settings(CACHE_RESPOSTAS_TIMEOUT=0)
+class TestConsultasEndpoints(TestCore):
+
+    """
+        Regressão de N+1: cada rota de listagem é chamada com páginas
+        de 1, 10 e 100 registros e a quantidade de consultas SQL deve
+        ser a mesma nos três tamanhos.
+        - Os dados são criados com mais de 100 registros por rota,
+        para que todas as páginas fiquem cheias.
+        - Antes de cada medição é feita uma requisição para aquecer os
+        caches (token e contagem), que guardam consultas só na primeira.
+        - O cache de respostas fica desligado: as consultas medidas são
+        as de uma falha no cache.
+        - As rotas de detalhe e de escrita têm a quantidade de consultas
+        fixada; a sincronização de alunos faz as mesmas consultas para 2
+        ou 99 alunos novos.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        maximo = max(TAMANHOS_PAGINA)
+
+        cls.token_professor = cls.token_usuario(cls.professor)
+
+        # E-mails fixos: o Faker pode repetir e-mails em lotes grandes.
+        for indice in range(maximo):
+            ProfessorFactory(email=f'professor{indice}@consultas.com')
+
+        alunos = [
+            AlunoFactory(email=f'aluno{indice}@consultas.com')
+            for indice in range(maximo + 1)
+        ]
+
+        disciplinas = DisciplinaConsultasFactory.create_batch(
+            maximo,
+            professor=cls.professor,
+            quantidade_grupos=3
+        )
+        cls.disciplina = disciplinas[0]
+
+        cls.grupo = GrupoFactory(
+            lider=cls.aluno,
+            aluno=alunos[0],
+            disciplina=cls.disciplina
+        )
+        grupos = [cls.grupo] + [
+            GrupoFactory(
+                lider=lider,
+                aluno=aluno,
+                disciplina=cls.disciplina
+            ) for lider, aluno in zip(alunos[1:maximo], alunos[2:])
+        ]
+        cls.grupo_sem_projeto = GrupoFactory(
+            lider=alunos[-1],
+            aluno=alunos[-1],
+            disciplina=cls.disciplina
+        )
+
+        projetos = ProjetoConsultasFactory.create_batch(
+            maximo,
+            professor=cls.professor,
+            disciplina=cls.disciplina
+        )
+        cls.projeto = projetos[0]
+
+        for projeto, grupo in zip(projetos, grupos):
+            ProjetoGrupoFactory(projeto=projeto, grupo=grupo)
+
+        tarefas = [
+            TarefaFactory(projeto=projeto, responsavel=None)
+            for projeto in projetos
+        ]
+        for tarefa in tarefas:
+            GrupoTarefaFactory(grupo=cls.grupo, tarefa=tarefa)
+        cls.tarefa = tarefas[0]
+
+        turmas = [
+            TurmaFactory(professor=cls.professor, disciplina=disciplina)
+            for disciplina in disciplinas
+        ]
+        for turma in turmas:
+            turma.aluno.add(cls.aluno, *alunos[:2])
+        cls.turmas = turmas[:3]
+
+        cls.codigos_alunos = [str(aluno.codigo) for aluno in alunos]
+
+    def usar_professor(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.token_professor
+        )
+
+    def consultas_requisicao(self, metodo, url, data=None):
+        with CaptureQueriesContext(connection) as consultas:
+            response = getattr(self.client, metodo)(
+                url, data=data, format='json'
+            )
+
+        return response, len(consultas)
+
+    def contar_consultas(self, url, tamanho):
+        with mock.patch.object(CustomPagination, 'page_size', tamanho):
+            self.client.get(url)
+
+            with CaptureQueriesContext(connection) as consultas:
+                response = self.client.get(url)
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            url
+        )
+        self.assertEqual(
+            len(response.data['resultados']),
+            tamanho,
+            url
+        )
+
+        return len(consultas)
+
+    def assertConsultasConstantes(self, *urls):
+        for url in urls:
+            with self.subTest(url=url):
+                quantidades = {
+                    tamanho: self.contar_consultas(url, tamanho)
+                    for tamanho in TAMANHOS_PAGINA
+                }
+
+                self.assertEqual(
+                    len(set(quantidades.values())),
+                    1,
+                    f'Consultas por tamanho de página em {url}: '
+                    f'{quantidades}'
+                )
+
+    def test_consultas_endpoints_aluno(self):
+        self.assertConsultasConstantes(
+            '/projetos/',
+            '/turmas/',
+            f'/tarefas/{self.tarefa.codigo}/visualizar/',
+            '/alunos/',
+            '/professores/',
+        )
+
+    def test_consultas_endpoints_professor(self):
+        self.usar_professor()
+
+        self.assertConsultasConstantes(
+            '/projetos/',
+            '/grupos/',
+            '/tarefas/',
+            '/turmas/',
+            '/disciplinas/',
+            '/alunos/',
+        )
+
+    def test_consultas_detalhe(self):
+        self.usar_professor()
+        self.client.get('/projetos/')
+
+        esperadas = {
+            f'/projetos/{self.projeto.codigo}/': 2,
+            f'/turmas/{self.turmas[0].codigo}/': 2,
+            f'/tarefas/{self.tarefa.codigo}/': 1,
+            f'/disciplinas/{self.disciplina.codigo}/': 1,
+            f'/grupos/{self.grupo.codigo}/': 1,
+        }
+
+        for url, quantidade in esperadas.items():
+            with self.subTest(url=url):
+                response, consultas = self.consultas_requisicao('get', url)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(consultas, quantidade)
+
+    def test_consultas_escrita(self):
+        self.usar_professor()
+        self.client.get('/projetos/')
+
+        projeto = f'/projetos/{self.projeto.codigo}/'
+        acoes = [
+            (
+                'post',
+                '/projetos/',
+                {
+                    'nome': 'Projeto novo',
+                    'tipo': 'Teste',
+                    'area': 'Testes',
+                    'descricao': 'Um projeto voltado para testes.',
+                    'disciplina': str(self.disciplina.codigo)
+                },
+                status.HTTP_201_CREATED,
+                4
+            ),
+            (
+                'patch',
+                projeto,
+                {'nome': 'Projeto renomeado'},
+                status.HTTP_200_OK,
+                3
+            ),
+            (
+                'patch',
+                f'{projeto}gerenciar-grupos/',
+                {'grupo': str(self.grupo_sem_projeto.codigo)},
+                status.HTTP_200_OK,
+                9
+            ),
+            (
+                'delete',
+                projeto,
+                None,
+                status.HTTP_204_NO_CONTENT,
+                6
+            ),
+            (
+                'put',
+                f'/turmas/{self.turmas[1].codigo}/sincronizar-alunos/',
+                {'alunos': self.codigos_alunos[2:4]},
+                status.HTTP_200_OK,
+                11
+            ),
+        ]
+
+        for metodo, url, data, esperado, quantidade in acoes:
+            with self.subTest(metodo=metodo, url=url):
+                response, consultas = self.consultas_requisicao(
+                    metodo, url, data
+                )
+
+                self.assertEqual(response.status_code, esperado)
+                self.assertEqual(consultas, quantidade)
+
+    def test_consultas_sincronizar_alunos_constantes(self):
+        self.usar_professor()
+        self.client.get('/turmas/')
+
+        quantidades = []
+        for turma, alunos in [
+            (self.turmas[1], self.codigos_alunos[2:4]),
+            (self.turmas[2], self.codigos_alunos[2:]),
+        ]:
+            response, consultas = self.consultas_requisicao(
+                'put',
+                f'/turmas/{turma.codigo}/sincronizar-alunos/',
+                {'alunos': alunos}
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['alunos']), len(alunos))
+            quantidades.append(consultas)
+
+        self.assertEqual(quantidades[0], quantidades[1], quantidades)
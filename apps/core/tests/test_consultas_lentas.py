@@ -0,0 +1,92 @@
+import json
+
+from django.db import connection, transaction
+from django.test import override_settings
+
+from apps.core.consultas_lentas import limite, plano_execucao
+from apps.usuarios.models import Aluno
+from apps.usuarios.tests.test_login import TestCore
+
+
+class TestConsultasLentas(TestCore):
+
+    """
+        ConsultasLentasMiddleware: log das consultas acima do limite com
+        a view de origem e o plano de execução.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.token = cls.token_usuario(cls.professor)
+
+    def setUp(self):
+        super().setUp()
+        limite.fichas = None
+        limite.descartadas = 0
+
+    @override_settings(
+        CONSULTAS_LENTAS_LIMITE_MS=0.0001, CONSULTAS_LENTAS_POR_MINUTO=1000
+    )
+    def test_consulta_lenta(self):
+        with self.assertLogs('apps.core.consultas_lentas') as logs:
+            self.client.get(
+                '/tarefas/', {'nome': 'Teste', 'projeto': 'Projeto'}
+            )
+
+        consultas = [
+            json.loads(registro.getMessage()) for registro in logs.records
+        ]
+        consulta = next(
+            consulta for consulta in consultas
+            if 'tb_tarefa' in consulta['sql']
+        )
+
+        self.assertEqual(consulta['view'], 'TarefaViewSet.list')
+        self.assertEqual(consulta['rota'], '/tarefas/')
+        self.assertNotIn('parametros', consulta)
+        self.assertIn('tb_tarefa', consulta['plano'])
+        self.assertNotIn(
+            '%Teste%', json.dumps(consultas, ensure_ascii=False)
+        )
+        self.assertNotIn(
+            self.token.split()[1],
+            json.dumps(consultas, ensure_ascii=False)
+        )
+
+    @override_settings(
+        CONSULTAS_LENTAS_LIMITE_MS=0.0001, CONSULTAS_LENTAS_POR_MINUTO=1
+    )
+    def test_consultas_lentas_limite_taxa(self):
+        with self.assertLogs('apps.core.consultas_lentas') as logs:
+            self.client.get('/tarefas/')
+            self.client.get('/tarefas/')
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertGreater(limite.descartadas, 0)
+
+    def test_consultas_lentas_desligado(self):
+        with self.assertNoLogs('apps.core.consultas_lentas'):
+            self.client.get('/tarefas/')
+
+    def test_plano_em_transacao_com_erro(self):
+        """
+            Um EXPLAIN com erro não aborta a transação de quem executou
+            a consulta.
+        """
+        with transaction.atomic():
+            plano = plano_execucao(
+                connection, 'SELECT * FROM tabela_inexistente', []
+            )
+
+            self.assertEqual(plano, 'Não foi possível obter o plano.')
+            self.assertTrue(Aluno.objects.exists())
+
+    def test_plano_apenas_select(self):
+        self.assertIsNone(
+            plano_execucao(
+                connection,
+                'UPDATE tb_tarefa SET nome = %s',
+                ['Teste']
+            )
+        )
@@ -0,0 +1,112 @@
+from datetime import datetime
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+
+from apps.core.versoes import chave_versao
+from apps.projetos.distribuicao import distribuir_tarefas
+from apps.projetos.views import GrupoViewSet
+from apps.projetos.tests.factory.projetos import ProjetoFactory
+from apps.turmas.tests.factory.turmas import DisciplinaFactory
+from apps.usuarios.tests.test_login import TestCore
+
+
+class TestETag(TestCore):
+
+    """
+        ETag e If-None-Match calculados pelas versões dos models.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        cls.cliente_professor = cls.cliente_autenticado(cls.professor)
+
+        cls.projeto = ProjetoFactory(
+            professor=cls.professor,
+            disciplina=DisciplinaFactory(professor=cls.professor)
+        )
+
+    def test_etag_nao_modificado(self):
+        etag = self.cliente_professor.get('/grupos/')['ETag']
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.cliente_professor.get(
+                '/grupos/', HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_304_NOT_MODIFIED
+        )
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(len(consultas), 0)
+
+    def test_etag_alterado_por_escrita(self):
+        etag = self.cliente_professor.get('/tarefas/')['ETag']
+
+        distribuir_tarefas([self.projeto], [{
+            'nome': 'Tarefa',
+            'descricao': 'Uma tarefa',
+            'data': datetime.now().date(),
+            'hora': timezone.now()
+        }])
+
+        response = self.cliente_professor.get(
+            '/tarefas/', HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['quantidade'], 1)
+
+    def test_etag_versao_perdida(self):
+        """
+            Uma versão removida do cache é recriada com um valor novo:
+            o ETag anterior não volta a valer.
+        """
+        etag = self.cliente_professor.get('/grupos/')['ETag']
+
+        cache.delete_many([
+            chave_versao(model) for model in GrupoViewSet.dependencias_cache
+        ])
+
+        response = self.cliente_professor.get(
+            '/grupos/', HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_por_usuario_e_parametros(self):
+        etag = self.client.get('/projetos/')['ETag']
+
+        self.assertEqual(
+            self.cliente_professor.get(
+                '/projetos/', HTTP_IF_NONE_MATCH=etag
+            ).status_code,
+            status.HTTP_200_OK
+        )
+        self.assertEqual(
+            self.client.get(
+                '/projetos/?pagina=1', HTTP_IF_NONE_MATCH=etag
+            ).status_code,
+            status.HTTP_200_OK
+        )
+        self.assertEqual(
+            self.client.get(
+                '/projetos/', HTTP_IF_NONE_MATCH=f'"outro", {etag}'
+            ).status_code,
+            status.HTTP_304_NOT_MODIFIED
+        )
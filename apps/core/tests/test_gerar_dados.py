@@ -0,0 +1,96 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.db.models import F
+from django.test import TestCase, override_settings
+
+from apps.projetos.models import GrupoTarefa, ProjetoGrupo, Tarefa
+from apps.usuarios.models import Aluno, Professor
+
+
+class Desfazer(Exception):
+    pass
+
+
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+        }
+    }
+)
+class TestGerarDados(TestCase):
+
+    """
+        Comando gerar_dados: massa de dados sintética para benchmarks.
+    """
+
+    opcoes = {
+        'professores': 2,
+        'disciplinas': 2,
+        'turmas': 2,
+        'alunos': 30,
+        'grupos': 10,
+        'projetos': 5,
+        'tarefas': 120,
+        'lote': 50,
+        'data_base': date(2022, 6, 1),
+    }
+
+    def gerar(self, **opcoes):
+        call_command(
+            'gerar_dados', stdout=StringIO(), **{**self.opcoes, **opcoes}
+        )
+
+    def codigos_gerados(self, semente):
+        """
+            Gera os dados dentro de uma transação desfeita ao final,
+            retornando os códigos das tarefas.
+        """
+        try:
+            with transaction.atomic():
+                self.gerar(semente=semente)
+                codigos = list(
+                    Tarefa.objects.order_by('nome').values_list(
+                        'codigo', flat=True
+                    )
+                )
+                raise Desfazer
+        except Desfazer:
+            return codigos
+
+    def test_gerar_dados(self):
+        self.gerar()
+
+        self.assertEqual(Professor.objects.count(), 2)
+        self.assertEqual(Aluno.objects.count(), 30)
+        self.assertEqual(Tarefa.objects.count(), 120)
+        self.assertEqual(ProjetoGrupo.objects.count(), 10)
+
+        # Cada GrupoTarefa liga a tarefa a um grupo do próprio projeto.
+        self.assertTrue(GrupoTarefa.objects.exists())
+        self.assertFalse(
+            GrupoTarefa.objects.exclude(
+                grupo__projetogrupo__projeto=F('tarefa__projeto')
+            ).exists()
+        )
+
+    def test_gerar_dados_deterministico(self):
+        primeira = self.codigos_gerados(semente=7)
+
+        self.assertEqual(len(primeira), 120)
+        self.assertEqual(primeira, self.codigos_gerados(semente=7))
+        self.assertNotEqual(primeira, self.codigos_gerados(semente=8))
+
+    def test_gerar_dados_semente_repetida(self):
+        self.gerar()
+
+        with self.assertRaises(CommandError):
+            self.gerar()
+
+    def test_gerar_dados_grupos_sem_lider(self):
+        with self.assertRaises(CommandError):
+            self.gerar(alunos=5, grupos=10)
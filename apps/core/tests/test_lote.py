@@ -0,0 +1,275 @@
+from unittest.mock import patch
+
+from django.test import override_settings
+from rest_framework import status
+
+from apps.core.authentication import CacheTokenAuthentication
+from apps.turmas.models import Disciplina
+from apps.turmas.tests.factory.turmas import DisciplinaFactory
+from apps.usuarios.tests.test_login import TestCore
+
+
+class TestLote(TestCore):
+
+    """
+        POST /lote/: várias requisições em uma única ida e volta.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        cls.cliente_professor = cls.cliente_autenticado(cls.professor)
+
+        cls.disciplina_professor = DisciplinaFactory(
+            professor=cls.professor
+        )
+
+    def disciplina(self, nome, nota_corte=7):
+        return {
+            'metodo': 'POST',
+            'rota': '/disciplinas/',
+            'corpo': {
+                'nome': nome,
+                'nota_corte': nota_corte,
+                'quantidade_grupos': 2
+            }
+        }
+
+    def test_lote_leitura(self):
+        rotas = ['/disciplinas/', '/turmas/', '/projetos/', '/tarefas/']
+
+        with patch.object(
+            CacheTokenAuthentication,
+            'authenticate_credentials',
+            autospec=True,
+            side_effect=CacheTokenAuthentication.authenticate_credentials
+        ) as autenticar:
+            response = self.cliente_professor.post(
+                '/lote/',
+                data={
+                    'requisicoes': [
+                        {'metodo': 'GET', 'rota': rota} for rota in rotas
+                    ]
+                },
+                format='json'
+            )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertEqual(autenticar.call_count, 1)
+        self.assertFalse(response.data['revertido'])
+
+        for resultado in response.data['resultados']:
+            self.assertEqual(resultado['status'], status.HTTP_200_OK)
+            self.assertEqual(
+                list(resultado['corpo'].keys()),
+                self.pagination_keys
+            )
+
+        self.assertEqual(
+            response.data['resultados'][0]['corpo']['quantidade'], 1
+        )
+
+    def test_lote_query_string(self):
+        response = self.cliente_professor.post(
+            '/lote/',
+            data={
+                'requisicoes': [
+                    {'metodo': 'GET', 'rota': '/disciplinas/?pagina=2'}
+                ]
+            },
+            format='json'
+        )
+
+        self.assertEqual(
+            response.data['resultados'][0]['status'],
+            status.HTTP_404_NOT_FOUND
+        )
+
+    def test_lote_papel_aluno(self):
+        response = self.client.post(
+            '/lote/',
+            data={
+                'requisicoes': [
+                    {'metodo': 'GET', 'rota': '/projetos/'},
+                    self.disciplina('Programação')
+                ]
+            },
+            format='json'
+        )
+
+        self.assertEqual(
+            [
+                resultado['status']
+                for resultado in response.data['resultados']
+            ],
+            [status.HTTP_200_OK, status.HTTP_403_FORBIDDEN]
+        )
+        self.assertFalse(
+            Disciplina.objects.filter(nome='Programação').exists()
+        )
+
+    def test_lote_nao_atomico(self):
+        response = self.cliente_professor.post(
+            '/lote/',
+            data={
+                'requisicoes': [
+                    self.disciplina('Programação'),
+                    self.disciplina('Inválida', nota_corte=0),
+                    {'metodo': 'GET', 'rota': '/inexistente/'},
+                    {'metodo': 'POST', 'rota': '/lote/'},
+                    {'metodo': 'GET', 'rota': '/disciplinas/'}
+                ]
+            },
+            format='json'
+        )
+
+        resultados = response.data['resultados']
+
+        self.assertEqual(
+            [resultado['status'] for resultado in resultados],
+            [
+                status.HTTP_201_CREATED,
+                status.HTTP_400_BAD_REQUEST,
+                status.HTTP_404_NOT_FOUND,
+                status.HTTP_400_BAD_REQUEST,
+                status.HTTP_200_OK
+            ]
+        )
+        self.assertIn('nota_corte', resultados[1]['corpo'])
+        self.assertEqual(resultados[4]['corpo']['quantidade'], 2)
+
+    def test_lote_atomico(self):
+        response = self.cliente_professor.post(
+            '/lote/',
+            data={
+                'atomico': True,
+                'requisicoes': [
+                    self.disciplina('Programação'),
+                    self.disciplina('Inválida', nota_corte=0),
+                    self.disciplina('Banco de Dados')
+                ]
+            },
+            format='json'
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertTrue(response.data['revertido'])
+        self.assertEqual(len(response.data['resultados']), 2)
+        self.assertEqual(
+            Disciplina.objects.filter(professor=self.professor).count(),
+            1
+        )
+
+    def test_lote_atomico_confirmado(self):
+        response = self.cliente_professor.post(
+            '/lote/',
+            data={
+                'atomico': True,
+                'requisicoes': [
+                    self.disciplina('Programação'),
+                    self.disciplina('Banco de Dados')
+                ]
+            },
+            format='json'
+        )
+
+        self.assertFalse(response.data['revertido'])
+        self.assertEqual(
+            Disciplina.objects.filter(professor=self.professor).count(),
+            3
+        )
+
+    def test_lote_atomico_leitura_revertida(self):
+        """
+            Uma listagem feita no lote depois de uma escrita revertida não
+            fica guardada no cache de respostas.
+        """
+        response = self.cliente_professor.post(
+            '/lote/',
+            data={
+                'atomico': True,
+                'requisicoes': [
+                    {
+                        'metodo': 'POST',
+                        'rota': '/projetos/',
+                        'corpo': {
+                            'nome': 'Fantasma',
+                            'tipo': 'Testes',
+                            'area': 'Testes',
+                            'descricao': 'Projeto revertido',
+                            'disciplina': str(self.disciplina_professor.codigo)
+                        }
+                    },
+                    {'metodo': 'GET', 'rota': '/projetos/'},
+                    self.disciplina('Inválida', nota_corte=0)
+                ]
+            },
+            format='json'
+        )
+
+        self.assertTrue(response.data['revertido'])
+        self.assertEqual(
+            [
+                resultado['status']
+                for resultado in response.data['resultados']
+            ],
+            [
+                status.HTTP_201_CREATED,
+                status.HTTP_200_OK,
+                status.HTTP_400_BAD_REQUEST
+            ]
+        )
+        self.assertEqual(
+            response.data['resultados'][1]['corpo']['quantidade'], 1
+        )
+
+        response = self.cliente_professor.get('/projetos/')
+
+        self.assertEqual(response.data['quantidade'], 0)
+
+    def test_lote_rota_fora_da_api(self):
+        response = self.cliente_professor.post(
+            '/lote/',
+            data={
+                'requisicoes': [
+                    {'metodo': 'GET', 'rota': '/admin/'},
+                    {'metodo': 'GET', 'rota': '/metricas/'}
+                ]
+            },
+            format='json'
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            [list(erro) for erro in response.data['requisicoes']],
+            [['rota'], ['rota']]
+        )
+
+    @override_settings(LOTE_MAXIMO=1)
+    def test_lote_maximo(self):
+        response = self.cliente_professor.post(
+            '/lote/',
+            data={
+                'requisicoes': [
+                    {'metodo': 'GET', 'rota': '/disciplinas/'},
+                    {'metodo': 'GET', 'rota': '/turmas/'}
+                ]
+            },
+            format='json'
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+        self.assertIn('requisicoes', response.data)
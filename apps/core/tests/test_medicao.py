@@ -0,0 +1,77 @@
+import json
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from apps.core.medicao import Medicao, medicao_atual
+from apps.turmas.serializers import DisciplinaSerializer
+from apps.turmas.tests.factory.turmas import DisciplinaFactory
+from apps.usuarios.tests.test_login import TestCore
+
+
+class TestMedicao(TestCore):
+
+    """
+        MedicaoMiddleware: cabeçalho Server-Timing e log por requisição.
+    """
+
+    @override_settings(MEDICAO_AMOSTRAGEM=1)
+    def test_medicao_requisicao(self):
+        url = '/projetos/'
+        self.client.get(url)
+
+        with self.assertLogs('apps.core.medicao', 'INFO') as logs:
+            with CaptureQueriesContext(connection) as consultas:
+                response = self.client.get(url)
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+
+        medicao = json.loads(logs.records[0].getMessage())
+
+        self.assertEqual(medicao['view'], 'ProjetoViewSet.list')
+        self.assertEqual(medicao['status'], 200)
+        self.assertEqual(medicao['consultas'], len(consultas))
+        self.assertGreaterEqual(medicao['serializacao_ms'], 0)
+        self.assertGreaterEqual(medicao['view_ms'], medicao['banco_ms'])
+
+        self.assertIn(
+            f'desc="{len(consultas)} consultas"',
+            response['Server-Timing']
+        )
+        for metrica in ['db;dur=', 'serializer;dur=', 'view;dur=']:
+            self.assertIn(metrica, response['Server-Timing'])
+
+    @override_settings(MEDICAO_AMOSTRAGEM=1)
+    def test_medicao_action(self):
+        with self.assertLogs('apps.core.medicao', 'INFO') as logs:
+            self.client.post(
+                '/alunos/importar/', data={}, format='multipart'
+            )
+
+        self.assertEqual(
+            json.loads(logs.records[0].getMessage())['view'],
+            'AlunoViewSet.importar'
+        )
+
+    def test_medicao_fora_da_amostra(self):
+        response = self.client.get('/projetos/')
+
+        self.assertNotIn('Server-Timing', response)
+
+    def test_medicao_serializacao(self):
+        medicao = Medicao()
+        token = medicao_atual.set(medicao)
+
+        try:
+            DisciplinaSerializer(
+                DisciplinaFactory.create_batch(size=3), many=True
+            ).data
+        finally:
+            medicao_atual.reset(token)
+
+        self.assertGreater(medicao.tempo_serializacao, 0)
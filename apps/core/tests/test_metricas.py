@@ -0,0 +1,221 @@
+import os
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.metricas import (
+    CHAVE_PROCESSOS, Registro, chave_processo, chave_serie
+)
+from apps.usuarios.tasks import celery_enviar_emails_cadastro
+from apps.usuarios.tests.test_login import TestCore
+
+
+@override_settings(METRICAS_INTERVALO=0, METRICAS_TOKEN='segredo')
+class TestMetricas(TestCore):
+
+    """
+        Rota /metricas/ no formato de texto do Prometheus.
+        - As métricas são acumuladas desde o início do processo, então
+        os testes usam séries próprias ou comparam valores relativos.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.cliente_metricas = APIClient()
+        self.cliente_metricas.credentials(
+            HTTP_AUTHORIZATION='Bearer segredo'
+        )
+
+    def metricas(self):
+        response = self.cliente_metricas.get('/metricas/')
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+
+        return response.content.decode('utf-8')
+
+    def valor(self, texto, serie):
+        for linha in texto.splitlines():
+            if linha.startswith(serie + ' '):
+                return float(linha.rsplit(' ', 1)[1])
+
+        return 0
+
+    def test_metricas_requisicoes(self):
+        serie = (
+            'sgp_requisicoes_total'
+            '{metodo="GET",rota="projetos-list",status="200"}'
+        )
+        antes = self.valor(self.metricas(), serie)
+
+        self.client.get('/projetos/')
+        self.client.get('/projetos/')
+
+        texto = self.metricas()
+
+        self.assertEqual(self.valor(texto, serie), antes + 2)
+        self.assertIn('# TYPE sgp_requisicao_segundos histogram', texto)
+        self.assertIn(
+            'sgp_requisicao_segundos_bucket{rota="projetos-list",le="+Inf"}',
+            texto
+        )
+        self.assertGreater(
+            self.valor(
+                texto, 'sgp_consultas_sql_total{rota="projetos-list"}'
+            ),
+            0
+        )
+
+    def test_metricas_outros_processos(self):
+        """
+            As métricas gravadas no cache por outro processo (outro
+            worker do gunicorn) entram na soma.
+        """
+        self.client.get('/projetos/')
+
+        cache.add(CHAVE_PROCESSOS, 0, None)
+        outro = cache.incr(CHAVE_PROCESSOS)
+        cache.set(
+            f'metricas:processo:{outro}',
+            {
+                'contadores': {
+                    chave_serie(
+                        'requisicoes_total',
+                        {'rota': 'outro-processo', 'metodo': 'GET',
+                         'status': 200}
+                    ): 5
+                },
+                'histogramas': {}
+            }
+        )
+
+        self.assertEqual(
+            self.valor(
+                self.metricas(),
+                'sgp_requisicoes_total'
+                '{metodo="GET",rota="outro-processo",status="200"}'
+            ),
+            5
+        )
+
+    def test_metricas_tarefas_celery(self):
+        serie = (
+            'sgp_tarefas_celery_total'
+            '{estado="SUCCESS",tarefa="enviar_lote_emails_cadastro"}'
+        )
+        antes = self.valor(self.metricas(), serie)
+
+        celery_enviar_emails_cadastro.apply()
+
+        texto = self.metricas()
+
+        self.assertEqual(self.valor(texto, serie), antes + 1)
+        self.assertIn(
+            'sgp_tarefa_celery_segundos_count'
+            '{tarefa="enviar_lote_emails_cadastro"}',
+            texto
+        )
+
+    def test_metricas_token(self):
+        self.client.credentials()
+
+        response = self.client.get('/metricas/')
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_403_FORBIDDEN
+        )
+
+        self.metricas()
+
+    @override_settings(METRICAS_TOKEN='')
+    def test_metricas_sem_token(self):
+        response = self.client.get('/metricas/')
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_404_NOT_FOUND
+        )
+
+    def test_metricas_slots_reaproveitados(self):
+        """
+            O slot de um processo encerrado (chave expirada) é ocupado
+            pelo próximo processo, sem aumentar a faixa de slots.
+        """
+        primeiro = Registro()
+        primeiro.enviar(forcar=True)
+        segundo = Registro()
+        segundo.enviar(forcar=True)
+
+        self.assertEqual(cache.get(CHAVE_PROCESSOS), 2)
+
+        cache.delete(chave_processo(primeiro.processo))
+
+        terceiro = Registro()
+        terceiro.enviar(forcar=True)
+
+        self.assertEqual(terceiro.processo, primeiro.processo)
+        self.assertEqual(cache.get(CHAVE_PROCESSOS), 2)
+
+        # O processo que perdeu o slot ocupa outro.
+        primeiro.enviar(forcar=True)
+
+        self.assertEqual(primeiro.processo, 3)
+        self.assertEqual(
+            cache.get(chave_processo(terceiro.processo))['dono'],
+            terceiro.dono
+        )
+
+    def test_metricas_processo_filho(self):
+        """
+            Um processo criado por fork (outro pid) não herda o dono, o
+            slot nem as métricas do processo pai.
+        """
+        rotulos = {'rota': 'processo-pai', 'metodo': 'GET', 'status': '200'}
+
+        pai = Registro()
+        pai.incrementar('requisicoes_total', rotulos)
+        dono_pai, processo_pai = pai.dono, pai.processo
+
+        with mock.patch(
+            'apps.core.metricas.os.getpid', return_value=os.getpid() + 1
+        ):
+            self.assertEqual(pai.dados()['contadores'], {})
+
+            pai.enviar(forcar=True)
+
+        self.assertNotEqual(pai.dono, dono_pai)
+        self.assertNotEqual(pai.processo, processo_pai)
+        self.assertEqual(
+            cache.get(chave_processo(processo_pai))['dono'], dono_pai
+        )
+
+    def test_metricas_cache_aplicacao(self):
+        """
+            A primeira requisição com o token é uma falha do cache de
+            autenticação; a segunda, um acerto.
+        """
+        series = [
+            'sgp_cache_falhas_total{cache="token"}',
+            'sgp_cache_acertos_total{cache="token"}'
+        ]
+        texto = self.metricas()
+        antes = [self.valor(texto, serie) for serie in series]
+
+        self.client.get('/projetos/')
+        self.client.get('/projetos/')
+
+        texto = self.metricas()
+
+        self.assertEqual(
+            [self.valor(texto, serie) for serie in series],
+            [antes[0] + 1, antes[1] + 1]
+        )
+        self.assertIn('sgp_cache_taxa_acerto{cache="token"}', texto)
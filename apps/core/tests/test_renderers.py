@@ -0,0 +1,102 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+from io import BytesIO, StringIO
+from uuid import uuid4
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.renderers import JSONRapidoParser, JSONRapidoRenderer
+from apps.usuarios.tests.test_login import TestCore
+
+
+class TestJSONRapido(SimpleTestCase):
+
+    dados = {
+        'codigo': uuid4(),
+        'nota_corte': Decimal('7.50'),
+        'hora': timezone.make_aware(datetime(2022, 5, 1, 10, 30, 1, 123456)),
+        'data': date(2022, 5, 1),
+        'horario': time(10, 30),
+        'mensagem': gettext_lazy('Invalid token.'),
+        'texto': 'Ação ',
+        'lista': [1, 2.5, None, True],
+    }
+
+    def test_renderer_igual_ao_drf(self):
+        self.assertEqual(
+            JSONRapidoRenderer().render(self.dados, 'application/json'),
+            JSONRenderer().render(self.dados, 'application/json')
+        )
+
+    def test_renderer_indentacao(self):
+        self.assertEqual(
+            JSONRapidoRenderer().render(
+                self.dados, 'application/json; indent=4'
+            ),
+            JSONRenderer().render(self.dados, 'application/json; indent=4')
+        )
+
+    def test_parser(self):
+        self.assertEqual(
+            JSONRapidoParser().parse(BytesIO('{"nome": "Ação"}'.encode())),
+            {'nome': 'Ação'}
+        )
+
+        with self.assertRaises(ParseError):
+            JSONRapidoParser().parse(BytesIO(b'{"nome": '))
+
+    def test_medir_json(self):
+        saida = StringIO()
+
+        call_command('medir_json', itens=10, repeticoes=1, stdout=saida)
+
+        self.assertIn('| Rápido (orjson) |', saida.getvalue())
+        self.assertIn('JSON idêntico: sim', saida.getvalue())
+
+
+class TestJSONRapidoRotas(TestCore):
+
+    def test_accept(self):
+        response = self.client.get(
+            '/projetos/', HTTP_ACCEPT='application/json'
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertIsInstance(
+            response.accepted_renderer, JSONRapidoRenderer
+        )
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+        response = self.client.get('/projetos/', HTTP_ACCEPT='text/html')
+
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
+
+    def test_corpo_json(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.token_usuario(self.professor)
+        )
+
+        response = self.client.post(
+            '/disciplinas/',
+            data=(
+                '{"nome": "Programação", "nota_corte": 7.5, '
+                '"quantidade_grupos": 3}'
+            ).encode('utf-8'),
+            content_type='application/json'
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_201_CREATED
+        )
+        self.assertEqual(response.data['nome'], 'Programação')
+        self.assertEqual(response.data['nota_corte'], 7.5)
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .views import LoteView, metricas
+
+
+urlpatterns = [
+    path('metricas/', metricas, name='metricas'),
+    path('lote/', LoteView.as_view(), name='lote'),
+]
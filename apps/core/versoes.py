@@ -0,0 +1,111 @@
+from contextlib import contextmanager
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+"""
+    Versões por model, guardadas no cache (Redis).
+    - Cada escrita em um model dos APPS_VERSIONADOS troca a versão dele
+    (post_save/post_delete, ver invalidar_versao).
+    - Caches derivados dos dados (contagens, respostas) incluem as
+    versões dos models de que dependem na chave, e deixam de ser usados
+    quando alguma delas muda.
+    - Escritas que não disparam sinais (update, bulk_create,
+    _raw_delete) chamam invalidar_versao diretamente.
+    - Transações que leem os caches depois de escrever (ver
+    atomic_versionado) trocam as versões de novo quando são revertidas.
+    - Uma versão ausente (Redis limpo, chave removida) é criada com um
+    valor aleatório e relida: a versão nunca volta a um valor usado
+    antes, então caches antigos não voltam a valer.
+"""
+
+APPS_VERSIONADOS = ['usuarios', 'turmas', 'projetos']
+
+
+def chave_versao(model):
+    return f'versao:{model._meta.label_lower}'
+
+
+def versao_model(model):
+    return versoes_models([model])[0]
+
+
+def versoes_models(models):
+    """
+        Returns:
+            [list]: [Versões dos models, lidas em uma única ida ao cache
+            quando todas existem]
+    """
+    chaves = [chave_versao(model) for model in models]
+    versoes = cache.get_many(chaves)
+    ausentes = [chave for chave in chaves if chave not in versoes]
+
+    if ausentes:
+        # cache.add: processos concorrentes ficam com a mesma versão.
+        for chave in ausentes:
+            cache.add(chave, uuid4().hex, None)
+
+        versoes.update(cache.get_many(ausentes))
+
+    # Sem o cache, uma versão nova a cada leitura: nada é reaproveitado.
+    return [versoes.get(chave) or uuid4().hex for chave in chaves]
+
+
+def trocar_versao(model):
+    cache.set(chave_versao(model), uuid4().hex, None)
+
+
+def invalidar_versao(sender, **kwargs):
+    """
+        Receiver de post_save/post_delete: troca a versão do model.
+        - Dentro de uma transação a versão é trocada de novo no commit,
+        para que uma leitura concorrente feita antes do commit não fique
+        guardada com a versão nova.
+        - Dentro de um atomic_versionado o model também é registrado,
+        para a troca no rollback.
+    """
+    if sender._meta.app_label not in APPS_VERSIONADOS:
+        return
+
+    trocar_versao(sender)
+
+    conexao = transaction.get_connection()
+
+    if conexao.in_atomic_block:
+        transaction.on_commit(lambda: trocar_versao(sender))
+
+    blocos = getattr(conexao, 'versoes_alteradas', None)
+    if blocos:
+        blocos[-1].add(sender)
+
+
+@contextmanager
+def atomic_versionado(using=None):
+    """
+        transaction.atomic que, ao ser revertido (exceção ou
+        set_rollback), troca de novo as versões dos models escritos no
+        bloco.
+        - Uma leitura feita depois de uma escrita na mesma transação
+        guarda no cache dados não confirmados com a versão nova; sem a
+        nova troca, eles continuariam válidos após o rollback.
+    """
+    conexao = transaction.get_connection(using)
+    blocos = conexao.__dict__.setdefault('versoes_alteradas', [])
+    alterados = set()
+    blocos.append(alterados)
+    revertido = True
+
+    try:
+        with transaction.atomic(using=using):
+            yield
+            revertido = conexao.needs_rollback
+    finally:
+        blocos.pop()
+
+        if revertido:
+            for model in alterados:
+                trocar_versao(model)
+        elif blocos:
+            # O bloco externo ainda pode ser revertido.
+            blocos[-1].update(alterados)
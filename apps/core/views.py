@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.http import (
+    HttpResponse, HttpResponseForbidden, HttpResponseNotFound
+)
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.core.lote import LoteSerializer, executar_lote
+from apps.core.metricas import exportar
+
+
+@require_GET
+def metricas(request):
+    """
+        Métricas da API, do banco, do cache e do celery no formato de
+        texto do Prometheus.
+        - Exige o cabeçalho Authorization: Bearer <METRICAS_TOKEN>.
+        - Sem METRICAS_TOKEN configurado a rota não existe (404), para
+        não expor as métricas por esquecimento.
+    """
+    if not settings.METRICAS_TOKEN:
+        return HttpResponseNotFound()
+
+    if not constant_time_compare(
+        request.headers.get('Authorization', ''),
+        f'Bearer {settings.METRICAS_TOKEN}'
+    ):
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        exportar(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
+class LoteView(APIView):
+
+    """
+        Executa uma lista de requisições da API em uma única ida e volta
+        (ver apps.core.lote).
+        - Corpo: {"requisicoes": [{"metodo", "rota", "corpo"}],
+        "atomico": false}
+    """
+
+    def post(self, request):
+        serializer = LoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        return Response(
+            executar_lote(
+                request,
+                serializer.validated_data['requisicoes'],
+                serializer.validated_data['atomico']
+            )
+        )
@@ -0,0 +1,78 @@
+from collections import defaultdict
+
+from django.db import transaction
+
+from apps.core.versoes import invalidar_versao
+from .models import ProjetoGrupo, Tarefa, GrupoTarefa
+
+"""
+    Distribuição de tarefas entre os grupos dos projetos.
+    - Cada grupo que selecionou o projeto recebe a sua própria tarefa,
+    ligada a ele por um GrupoTarefa.
+    - Projetos sem grupos recebem uma única tarefa, sem GrupoTarefa.
+    - A quantidade de consultas não depende da quantidade de projetos,
+    grupos ou tarefas: uma consulta em tb_projeto_grupo e um
+    bulk_create para cada tabela.
+"""
+
+CAMPOS_TAREFA = ['nome', 'descricao', 'data', 'hora']
+
+
+def grupos_por_projeto(projetos):
+    """
+        Returns:
+            [dict]: [Códigos dos grupos ativos de cada projeto]
+    """
+    grupos = defaultdict(list)
+
+    projetos_grupos = ProjetoGrupo.objects.filter(
+        projeto__in=projetos,
+        projeto__ativo=True
+    ).values_list('projeto_id', 'grupo_id')
+
+    for projeto, grupo in projetos_grupos:
+        grupos[projeto].append(grupo)
+
+    return grupos
+
+
+@transaction.atomic
+def distribuir_tarefas(projetos, tarefas):
+    """
+        Cria cada tarefa informada em todos os projetos, uma por grupo.
+
+        Args:
+            projetos ([Projeto]): [Projetos que recebem as tarefas]
+            tarefas ([dict]): [Campos nome, descricao, data e hora]
+
+        Returns:
+            [list]: [Tarefas criadas, na ordem projeto, tarefa, grupo]
+    """
+    grupos = grupos_por_projeto(projetos)
+
+    tarefas_criadas = []
+    grupos_tarefas = []
+
+    for projeto in projetos:
+        for dados in tarefas:
+            campos = {campo: dados[campo] for campo in CAMPOS_TAREFA}
+
+            for grupo in grupos[projeto.codigo] or [None]:
+                tarefa = Tarefa(
+                    projeto=projeto,
+                    situacao='pendente',
+                    **campos
+                )
+                tarefas_criadas.append(tarefa)
+
+                if grupo is not None:
+                    grupos_tarefas.append(
+                        GrupoTarefa(grupo_id=grupo, tarefa=tarefa)
+                    )
+
+    Tarefa.objects.bulk_create(tarefas_criadas)
+    GrupoTarefa.objects.bulk_create(grupos_tarefas)
+    invalidar_versao(Tarefa)
+    invalidar_versao(GrupoTarefa)
+
+    return tarefas_criadas
@@ -1,4 +1,6 @@
 from django_filters import rest_framework as filters
+
+from apps.core.busca import buscar
 from .models import Projeto, Grupo, Tarefa
 
 
@@ -27,6 +29,9 @@ class ProjetoFilter(filters.FilterSet):
     professor = filters.UUIDFilter(
         field_name='professor'
     )
+    busca = filters.CharFilter(
+        method='filtrar_busca'
+    )
 
     class Meta:
         model = Projeto
@@ -35,6 +40,9 @@ class ProjetoFilter(filters.FilterSet):
             'tipo', 'ativo', 'consolidado'
         ]
 
+    def filtrar_busca(self, queryset, name, value):
+        return buscar(queryset, ['nome', 'area'], value)
+
 
 class TarefaFilter(filters.FilterSet):
     disciplina = filters.CharFilter(
@@ -68,9 +76,15 @@ class TarefaFilter(filters.FilterSet):
         lookup_expr='icontains'
     )
     ativo = filters.BooleanFilter()
+    busca = filters.CharFilter(
+        method='filtrar_busca'
+    )
 
     class Meta:
         model = Tarefa
         fields = [
             'codigo'
         ]
+
+    def filtrar_busca(self, queryset, name, value):
+        return buscar(queryset, ['nome', 'descricao'], value)
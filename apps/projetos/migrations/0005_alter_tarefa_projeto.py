@@ -0,0 +1,19 @@
+# Generated by Django 4.0.4 on 2026-10-18 12:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projetos', '0004_rename_prazo_tarefa_hora_grupotarefa_ativo_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tarefa',
+            name='projeto',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, to='projetos.projeto'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.0.4 on 2026-10-18 12:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projetos', '0005_alter_tarefa_projeto'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tarefa',
+            index=models.Index(fields=['situacao', 'data', 'hora', 'ativo'], name='tarefa_situacao_prazo_idx'),
+        ),
+    ]
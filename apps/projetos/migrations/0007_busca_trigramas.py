@@ -0,0 +1,46 @@
+# Generated by Django 4.0.4 on 2026-10-18 12:00
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Índices GIN (pg_trgm) para os icontains de TarefaFilter/ProjetoFilter
+# e para a busca de apps.core.busca. O Django gera o icontains do
+# PostgreSQL como UPPER(campo::text) LIKE UPPER(...), por isso o índice
+# é sobre a mesma expressão. Em outros bancos não há o que criar.
+INDICES = [
+    ('tarefa_nome_trgm_idx', 'tb_tarefa', 'nome'),
+    ('tarefa_descricao_trgm_idx', 'tb_tarefa', 'descricao'),
+    ('projeto_nome_trgm_idx', 'tb_projeto', 'nome'),
+    ('projeto_area_trgm_idx', 'tb_projeto', 'area'),
+]
+
+
+def criar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for nome, tabela, coluna in INDICES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{nome}" ON "{tabela}" '
+            f'USING gin ((UPPER("{coluna}"::text)) gin_trgm_ops)'
+        )
+
+
+def remover_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for nome, _, _ in INDICES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{nome}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projetos', '0006_tarefa_situacao_prazo_idx'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(criar_indices, remover_indices),
+    ]
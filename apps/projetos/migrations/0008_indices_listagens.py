@@ -0,0 +1,37 @@
+# Generated by Django 4.0.4 on 2026-10-18 12:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projetos', '0007_busca_trigramas'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='grupo',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['aluno'], name='grupo_aluno_ativo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grupo',
+            index=models.Index(condition=models.Q(('ativo', True), ('disponivel', True)), fields=['disciplina'], name='grupo_disponivel_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grupotarefa',
+            index=models.Index(fields=['grupo', 'tarefa'], name='grupo_tarefa_grupo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projeto',
+            index=models.Index(fields=['professor', 'disciplina'], name='projeto_professor_disc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projeto',
+            index=models.Index(condition=models.Q(('ativo', True), ('disponivel', True)), fields=['disciplina'], name='projeto_disponivel_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarefa',
+            index=models.Index(fields=['projeto', 'data', 'hora', 'codigo'], name='tarefa_projeto_prazo_idx'),
+        ),
+    ]
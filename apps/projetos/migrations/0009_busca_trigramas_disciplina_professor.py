@@ -0,0 +1,44 @@
+# Generated by Django 4.0.4 on 2026-10-18 16:00
+
+from django.db import migrations
+
+# Índices GIN (pg_trgm) para os icontains de TarefaFilter em
+# projeto__disciplina__nome e projeto__professor__nome, sobre a mesma
+# expressão UPPER(campo::text) de 0007_busca_trigramas. A extensão
+# pg_trgm já é criada em 0007. Em outros bancos não há o que criar.
+INDICES = [
+    ('disciplina_nome_trgm_idx', 'tb_disciplina', 'nome'),
+    ('professor_nome_trgm_idx', 'tb_professor', 'nome'),
+]
+
+
+def criar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for nome, tabela, coluna in INDICES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{nome}" ON "{tabela}" '
+            f'USING gin ((UPPER("{coluna}"::text)) gin_trgm_ops)'
+        )
+
+
+def remover_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for nome, _, _ in INDICES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{nome}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projetos', '0008_indices_listagens'),
+        ('turmas', '0004_indices_listagens'),
+        ('usuarios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indices, remover_indices),
+    ]
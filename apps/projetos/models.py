@@ -1,10 +1,24 @@
 from uuid import uuid4
 from django.db import models
+from django.db.models import Count, Q
 
 from apps.usuarios.models import Aluno, Professor
 from apps.turmas.models import Disciplina
 
 
+class GrupoQuerySet(models.QuerySet):
+
+    def com_quantidade_membros(self):
+        """Anota a quantidade de membros de cada grupo.
+
+        Returns:
+            [QuerySet]: [Grupos com o atributo quantidade_membros]
+        """
+        return self.annotate(
+            quantidade_membros=Count('aluno')
+        )
+
+
 class Grupo(models.Model):
     codigo = models.UUIDField(
         default=uuid4,
@@ -33,13 +47,24 @@ class Grupo(models.Model):
         on_delete=models.DO_NOTHING
     )
 
+    objects = GrupoQuerySet.as_manager()
+
     @property
     def participantes(self):
         """Método que lista os participantes do grupo.
 
+        Usa o aluno já carregado (select_related) quando disponível,
+        evitando uma consulta por grupo nas listagens.
+
         Returns:
             [list]: [Código dos alunos que pertencem ao grupo]
         """
+        if self.aluno_id is None:
+            return []
+
+        if Grupo.aluno.is_cached(self):
+            return [self.aluno]
+
         membros = Aluno.objects.filter(
             grupo__codigo=self.codigo
         )
@@ -48,6 +73,18 @@ class Grupo(models.Model):
 
     class Meta:
         db_table = 'tb_grupo'
+        indexes = [
+            models.Index(
+                fields=['aluno'],
+                condition=Q(ativo=True),
+                name='grupo_aluno_ativo_idx'
+            ),
+            models.Index(
+                fields=['disciplina'],
+                condition=Q(ativo=True, disponivel=True),
+                name='grupo_disponivel_idx'
+            )
+        ]
 
     def __str__(self) -> str:
         return f'{self.codigo}'
@@ -94,6 +131,17 @@ class Projeto(models.Model):
 
     class Meta:
         db_table = 'tb_projeto'
+        indexes = [
+            models.Index(
+                fields=['professor', 'disciplina'],
+                name='projeto_professor_disc_idx'
+            ),
+            models.Index(
+                fields=['disciplina'],
+                condition=Q(ativo=True, disponivel=True),
+                name='projeto_disponivel_idx'
+            )
+        ]
 
     def __str__(self) -> str:
         return f'{self.codigo}'
@@ -147,7 +195,7 @@ class Tarefa(models.Model):
     situacao = models.CharField(
         max_length=10
     )
-    projeto = models.OneToOneField(
+    projeto = models.ForeignKey(
         Projeto,
         on_delete=models.DO_NOTHING
     )
@@ -173,6 +221,16 @@ class Tarefa(models.Model):
 
     class Meta:
         db_table = 'tb_tarefa'
+        indexes = [
+            models.Index(
+                fields=['situacao', 'data', 'hora', 'ativo'],
+                name='tarefa_situacao_prazo_idx'
+            ),
+            models.Index(
+                fields=['projeto', 'data', 'hora', 'codigo'],
+                name='tarefa_projeto_prazo_idx'
+            )
+        ]
 
     def __str__(self) -> str:
         return f'{self.codigo}'
@@ -201,6 +259,12 @@ class GrupoTarefa(models.Model):
 
     class Meta:
         db_table = 'tb_grupo_tarefa'
+        indexes = [
+            models.Index(
+                fields=['grupo', 'tarefa'],
+                name='grupo_tarefa_grupo_idx'
+            )
+        ]
 
     def __str__(self) -> str:
         return self.codigo
@@ -1,15 +1,29 @@
 
 from datetime import datetime
+from django.db.models import Prefetch
 from rest_framework import serializers
 from .models import (
     Projeto, Grupo, ProjetoGrupo,
-    Tarefa, GrupoTarefa
+    Tarefa
 )
+from apps.core.campos import CamposSerializerMixin
 from apps.usuarios.models import Aluno
+from apps.projetos.distribuicao import distribuir_tarefas
 from apps.turmas.models import TurmaAluno, Disciplina
 
 
-class ProjetoSerializer(serializers.ModelSerializer):
+def quantidade_membros(grupo):
+    """
+        Usa a quantidade anotada por Grupo.objects.com_quantidade_membros,
+        consultando os participantes apenas quando ela não existir.
+    """
+    try:
+        return grupo.quantidade_membros
+    except AttributeError:
+        return len(grupo.participantes)
+
+
+class ProjetoSerializer(CamposSerializerMixin, serializers.ModelSerializer):
 
     disciplina = serializers.PrimaryKeyRelatedField(
         pk_field=serializers.UUIDField(
@@ -23,41 +37,39 @@ class ProjetoSerializer(serializers.ModelSerializer):
         exclude = ['professor', 'ativo']
 
     def to_representation(self, instance):
+        return self.representar({
+            'codigo': lambda: instance.codigo,
+            'nome': lambda: instance.nome,
+            'tipo': lambda: instance.tipo,
+            'area': lambda: instance.area,
+            'disponivel': lambda: instance.disponivel,
+            'consolidado': lambda: instance.consolidado,
+            'ativo': lambda: instance.ativo,
+            'professor': lambda: {
+                'codigo': instance.professor.codigo,
+                'nome': instance.professor.nome
+            },
+            'disciplina': lambda: {
+                'codigo': instance.disciplina.codigo,
+                'nome': instance.disciplina.nome,
+                'nota_corte': instance.disciplina.nota_corte,
+                'quantidade_grupos': instance.disciplina.quantidade_grupos
+            },
+            'grupos': lambda: self.representar_grupos(instance)
+        })
 
+    def representar_grupos(self, instance):
         try:
-            grupos = [
+            return [
                 {
                     'codigo': grupo.codigo,
-                    'quantidade_membros': len(grupo.participantes)
+                    'quantidade_membros': quantidade_membros(grupo)
                 } for grupo in instance._prefetched_objects_cache.get(
                     'grupo', None
                 )
             ]
         except (TypeError, AttributeError):
-            grupos = None
-
-        disciplina = {
-            'codigo': instance.disciplina.codigo,
-            'nome': instance.disciplina.nome,
-            'nota_corte': instance.disciplina.nota_corte,
-            'quantidade_grupos': instance.disciplina.quantidade_grupos
-        }
-
-        return {
-            'codigo': instance.codigo,
-            'nome': instance.nome,
-            'tipo': instance.tipo,
-            'area': instance.area,
-            'disponivel': instance.disponivel,
-            'consolidado': instance.consolidado,
-            'ativo': instance.ativo,
-            'professor': {
-                'codigo': instance.professor.codigo,
-                'nome': instance.professor.nome
-            },
-            'disciplina': disciplina,
-            'grupos': grupos
-        }
+            return None
 
     def validate_disciplina(self, disciplina):
 
@@ -128,7 +140,7 @@ class ProjetoGrupoSerializer(serializers.ModelSerializer):
             grupos = [
                 {
                     'codigo': grupo.codigo,
-                    'quantidade_membros': len(grupo.participantes)
+                    'quantidade_membros': quantidade_membros(grupo)
                 } for grupo in instance._prefetched_objects_cache.get(
                     'grupo', None
                 )
@@ -249,7 +261,10 @@ class ProjetoGrupoSerializer(serializers.ModelSerializer):
         instance.save()
 
         return Projeto.objects.prefetch_related(
-            'grupo'
+            Prefetch(
+                'grupo',
+                queryset=Grupo.objects.com_quantidade_membros()
+            )
         ).select_related(
             'professor'
         ).get(
@@ -359,7 +374,7 @@ class GrupoSerializer(serializers.ModelSerializer):
         )
 
 
-class TarefaSerializer(serializers.ModelSerializer):
+class TarefaSerializer(CamposSerializerMixin, serializers.ModelSerializer):
 
     projeto = serializers.PrimaryKeyRelatedField(
         pk_field=serializers.UUIDField(
@@ -389,21 +404,29 @@ class TarefaSerializer(serializers.ModelSerializer):
         ]
 
     def to_representation(self, instance):
-        return {
-            'codigo': instance.codigo,
-            'nome': instance.nome,
-            'descricao': instance.descricao,
-            'situacao': instance.situacao,
-            'prazo': instance.prazo_formatado,
-            'status': instance.ativo,
-            'projeto': {
-                'codigo': instance.projeto.codigo,
-                'nome': instance.projeto.nome,
-                'professor': instance.projeto.professor.nome,
-                'disciplina': instance.projeto.disciplina.nome
-            }
+        return self.representar({
+            'codigo': lambda: instance.codigo,
+            'nome': lambda: instance.nome,
+            'descricao': lambda: instance.descricao,
+            'situacao': lambda: instance.situacao,
+            'prazo': lambda: instance.prazo_formatado,
+            'status': lambda: instance.ativo,
+            'projeto': lambda: self.representar_projeto(instance)
+        })
+
+    def representar_projeto(self, instance):
+        projeto = {
+            'codigo': instance.projeto.codigo,
+            'nome': instance.projeto.nome
         }
 
+        if self.incluir('projeto.professor'):
+            projeto['professor'] = instance.projeto.professor.nome
+        if self.incluir('projeto.disciplina'):
+            projeto['disciplina'] = instance.projeto.disciplina.nome
+
+        return projeto
+
     def validate_projeto(self, projeto):
         if hasattr(
             self.context['request'], 'professor'
@@ -443,49 +466,13 @@ class TarefaSerializer(serializers.ModelSerializer):
         return dados
 
     def create(self, validated_data):
-        projetos_grupos = ProjetoGrupo.objects.select_related(
-            'projeto', 'grupo'
-        ).filter(
-            projeto=validated_data['projeto'],
-            projeto__ativo=True
-        )
-        if not projetos_grupos:
-            return Tarefa.objects.create(
-                projeto=validated_data['projeto'],
-                nome=validated_data['nome'],
-                descricao=validated_data['descricao'],
-                data=validated_data['data'],
-                hora=validated_data['hora'],
-                situacao='pendente'
-            )
-
-        tarefas = []
-        grupos_tarefas = []
-        for projeto_grupo in projetos_grupos:
-            tarefas.append(
-                Tarefa(
-                    projeto=validated_data['projeto'],
-                    nome=validated_data['nome'],
-                    descricao=validated_data['descricao'],
-                    data=validated_data['data'],
-                    hora=validated_data['hora'],
-                    situacao='pendente'
-                )
-            )
-
-        tarefas_criadas = Tarefa.objects.bulk_create(tarefas)
-
-        for tarefa in tarefas_criadas:
-            grupos_tarefas.append(
-                GrupoTarefa(
-                    grupo=projeto_grupo.grupo,
-                    tarefa=tarefa
-                )
-            )
-
-        GrupoTarefa.objects.bulk_create(grupos_tarefas)
-
-        return tarefas_criadas[0]
+        """
+            Cria a tarefa para cada grupo que selecionou o projeto
+            (ver apps.projetos.distribuicao), retornando a primeira.
+        """
+        return distribuir_tarefas(
+            [validated_data['projeto']], [validated_data]
+        )[0]
 
     def update(self, instance, validated_data):
 
@@ -0,0 +1,86 @@
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.core.versoes import invalidar_versao
+from .models import Tarefa
+
+"""
+    Varredura periódica (celery beat) das tarefas com prazo vencido.
+    - As tarefas pendentes cujo prazo (data + horário de `hora`) já
+    passou passam para a situação atrasada.
+    - Cada lote é um único UPDATE ... WHERE codigo IN (SELECT ... LIMIT),
+    que usa o índice (situacao, data, hora, ativo) de tb_tarefa.
+"""
+
+VARREDURA_TRAVA = 'tarefas_atrasadas:trava'
+VARREDURA_ULTIMA = 'tarefas_atrasadas:ultima_execucao'
+
+
+def tarefas_vencidas(agora=None):
+    agora = timezone.localtime(agora)
+    hoje = agora.date()
+
+    return Tarefa.objects.filter(
+        Q(data__lt=hoje) | Q(data=hoje, hora__time__lt=agora.time()),
+        situacao='pendente',
+        ativo=True
+    )
+
+
+def marcar_tarefas_atrasadas(agora=None):
+    """
+        Atualiza as tarefas vencidas em lotes de TAREFAS_ATRASADAS_LOTE.
+
+        Returns:
+            [int]: [Quantidade de tarefas alteradas]
+    """
+    vencidas = tarefas_vencidas(agora)
+    atualizadas = 0
+
+    while True:
+        lote = vencidas.values('codigo')[:settings.TAREFAS_ATRASADAS_LOTE]
+
+        quantidade = Tarefa.objects.filter(
+            codigo__in=lote
+        ).update(situacao='atrasada')
+
+        atualizadas += quantidade
+
+        if quantidade < settings.TAREFAS_ATRASADAS_LOTE:
+            break
+
+    if atualizadas:
+        invalidar_versao(Tarefa)
+
+    return atualizadas
+
+
+@shared_task(name='marcar_tarefas_atrasadas')
+def celery_marcar_tarefas_atrasadas():
+    """
+        Executa a varredura, uma por vez.
+        - Se a execução anterior ainda não terminou, não faz nada.
+        - Guarda no cache a data e a quantidade de tarefas alteradas
+        da última execução e retorna a quantidade.
+    """
+    if not cache.add(VARREDURA_TRAVA, True, settings.TAREFAS_ATRASADAS_TRAVA):
+        return 0
+
+    try:
+        atualizadas = marcar_tarefas_atrasadas()
+    finally:
+        cache.delete(VARREDURA_TRAVA)
+
+    cache.set(
+        VARREDURA_ULTIMA,
+        {
+            'executado_em': timezone.now().isoformat(),
+            'atualizadas': atualizadas
+        },
+        None
+    )
+
+    return atualizadas
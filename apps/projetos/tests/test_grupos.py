@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from apps.usuarios.tests.factory.usuarios import AlunoFactory
 
@@ -129,3 +131,54 @@ class TestGrupoAluno(TestCore):
         ][0][
             'participantes'
         ][0]['lider']
+
+    def test_listar_grupos_quantidade_consultas(self):
+        """
+            - Motivação:
+                - Garantir que a listagem de grupos não consulte
+                o líder e os participantes de cada grupo separadamente.
+            - Regra de negócio:
+                - Líder e participantes são carregados junto com os
+                grupos.
+            - Resultado Esperado:
+                - status: 200
+                - mesma quantidade de consultas para 1 ou 5 grupos
+        """
+
+        url = '/grupos/'
+
+        GrupoFactory()
+
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as consultas_um_grupo:
+            response = self.client.get(url)
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+
+        GrupoFactory.create_batch(size=4)
+
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as consultas_cinco_grupos:
+            response = self.client.get(url)
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertEqual(
+            len(response.data['resultados']),
+            5
+        )
+        self.assertEqual(
+            len(response.data['resultados'][0]['participantes']),
+            2
+        )
+        self.assertEqual(
+            len(consultas_um_grupo),
+            len(consultas_cinco_grupos)
+        )
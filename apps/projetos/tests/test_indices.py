@@ -0,0 +1,97 @@
+from unittest import skipUnless
+
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.projetos.tests.factory.projetos import (
+    GrupoFactory, GrupoTarefaFactory, ProjetoFactory, TarefaFactory
+)
+from apps.projetos.views import GrupoViewSet, ProjetoViewSet, TarefaViewSet
+from apps.turmas.tests.factory.turmas import TurmaFactory
+from apps.turmas.views import DisciplinaViewSet, TurmaViewSet
+from apps.usuarios.tests.test_login import TestCore
+
+
+@skipUnless(
+    connection.vendor == 'postgresql',
+    'Os planos de execução verificados são do PostgreSQL.'
+)
+class TestIndicesListagens(TestCore):
+
+    """
+        Verifica, pelo EXPLAIN do PostgreSQL, que os querysets das
+        listagens usam os índices declarados nos models.
+        - Com poucos registros o planejador prefere a leitura
+        sequencial, então ela é desabilitada (enable_seqscan = off):
+        o teste verifica que existe um índice capaz de atender à
+        consulta, não a escolha do planejador em produção.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        cls.projeto = ProjetoFactory(professor=cls.professor)
+        cls.grupo = GrupoFactory(lider=cls.aluno)
+        cls.tarefa = TarefaFactory(projeto=cls.projeto)
+        GrupoTarefaFactory(grupo=cls.grupo, tarefa=cls.tarefa)
+        cls.turma = TurmaFactory(professor=cls.professor)
+        cls.turma.aluno.add(cls.aluno)
+
+    def setUp(self) -> None:
+        super().setUp()
+
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+
+    def get_queryset(self, viewset, kwargs=None, **papel):
+        request = Request(APIRequestFactory().get('/'))
+
+        for nome, usuario in papel.items():
+            setattr(request, nome, usuario)
+
+        view = viewset()
+        view.request = request
+        view.kwargs = kwargs or {}
+
+        return view.get_queryset()
+
+    def assertUsaIndice(self, queryset):
+        plano = queryset.explain()
+
+        self.assertIn('Index', plano, plano)
+        self.assertNotIn('Seq Scan', plano, plano)
+
+    def test_indices_projetos(self):
+        self.assertUsaIndice(
+            self.get_queryset(ProjetoViewSet, professor=self.professor)
+        )
+
+    def test_indices_grupos(self):
+        self.assertUsaIndice(
+            self.get_queryset(GrupoViewSet, aluno=self.aluno)
+        )
+
+    def test_indices_tarefas(self):
+        self.assertUsaIndice(
+            self.get_queryset(TarefaViewSet, professor=self.professor)
+        )
+        self.assertUsaIndice(
+            self.get_queryset(
+                TarefaViewSet,
+                kwargs={'pk': self.tarefa.codigo},
+                aluno=self.aluno
+            )
+        )
+
+    def test_indices_turmas(self):
+        self.assertUsaIndice(
+            self.get_queryset(TurmaViewSet, professor=self.professor)
+        )
+        self.assertUsaIndice(
+            self.get_queryset(TurmaViewSet, aluno=self.aluno)
+        )
+        self.assertUsaIndice(
+            self.get_queryset(DisciplinaViewSet, professor=self.professor)
+        )
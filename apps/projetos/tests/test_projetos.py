@@ -1,3 +1,8 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from apps.usuarios.tests.factory.usuarios import ProfessorFactory
 from apps.usuarios.tests.test_login import TestCore
@@ -5,6 +10,7 @@ from apps.projetos.tests.factory.projetos import (
     GrupoFactory, ProjetoFactory, ProjetoGrupoFactory
 )
 from apps.turmas.tests.factory.turmas import DisciplinaFactory
+from apps.core.pagination import CustomPagination
 from apps.projetos.models import Projeto, ProjetoGrupo
 
 from factory import Faker
@@ -272,6 +278,66 @@ class TestProjetoProfessor(TestCore):
             total_projetos
         )
 
+    @override_settings(CACHE_RESPOSTAS_TIMEOUT=0)
+    def test_listar_projetos_quantidade_consultas(self):
+        """
+            - Motivação:
+                - Garantir que a listagem de projetos não faça uma
+                consulta por grupo para contar os membros.
+            - Regra de negócio:
+                - A quantidade de membros dos grupos é calculada
+                uma única vez por página.
+            - Resultado Esperado:
+                - status: 200
+                - mesma quantidade de consultas para páginas de 1, 5
+                e 10 projetos
+        """
+
+        for _ in range(10):
+            projeto = Projeto.objects.create(
+                nome='Projeto',
+                descricao='Projeto com grupos',
+                tipo='Teste',
+                area='Testes',
+                professor=self.professor,
+                disciplina=self.disciplina
+            )
+
+            for grupo in GrupoFactory.create_batch(size=3):
+                ProjetoGrupoFactory(
+                    projeto=projeto,
+                    grupo=grupo
+                )
+
+        url = '/projetos/'
+        quantidades = []
+
+        for tamanho in [1, 5, 10]:
+            with mock.patch.object(CustomPagination, 'page_size', tamanho):
+                # Aquece os caches de token e de contagem.
+                self.client.get(url)
+
+                with CaptureQueriesContext(connection) as consultas:
+                    response = self.client.get(url)
+
+            self.assertEqual(
+                response.status_code,
+                status.HTTP_200_OK
+            )
+            self.assertEqual(
+                len(response.data['resultados']),
+                tamanho
+            )
+            self.assertEqual(
+                response.data['resultados'][0]['grupos'][0][
+                    'quantidade_membros'
+                ],
+                1
+            )
+            quantidades.append(len(consultas))
+
+        self.assertEqual(len(set(quantidades)), 1, quantidades)
+
     def test_editar_nome_projeto(self):
         """
             - Motivação:
@@ -966,3 +1032,44 @@ class TestProjetoAluno(TestCore):
             response.data['quantidade'],
             total_projetos
         )
+
+    def test_buscar_projetos(self):
+        """
+            - Motivação:
+                - Buscar projetos pelo nome ou pela área.
+            - Regra de negócio:
+                - Lista os projetos que contêm o termo informado
+                no query parameters "busca", dos mais relevantes
+                para os menos relevantes.
+            - Resultado Esperado:
+                - status: 200
+        """
+
+        dados = {
+            'descricao': 'Um projeto voltado para testes.',
+            'tipo': 'Teste',
+            'professor': self.professor,
+            'disciplina': self.disciplina
+        }
+
+        por_area = Projeto.objects.create(
+            nome='Aplicativo', area='Robotica educacional', **dados
+        )
+        por_nome = Projeto.objects.create(
+            nome='Robotica livre', area='Extensao', **dados
+        )
+        Projeto.objects.create(
+            nome='Horta', area='Biologia', **dados
+        )
+
+        url = '/projetos/?busca=robot'
+        response = self.client.get(url)
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertEqual(
+            [projeto['codigo'] for projeto in response.data['resultados']],
+            [por_nome.codigo, por_area.codigo]
+        )
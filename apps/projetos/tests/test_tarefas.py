@@ -1,7 +1,19 @@
-from datetime import datetime, timedelta
-
+import json
+from base64 import urlsafe_b64encode
+from datetime import date, datetime, timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
-from apps.projetos.models import Tarefa
+from apps.projetos.distribuicao import distribuir_tarefas
+from apps.projetos.tasks import (
+    VARREDURA_ULTIMA, celery_marcar_tarefas_atrasadas,
+    marcar_tarefas_atrasadas
+)
+from apps.projetos.models import GrupoTarefa, Projeto, Tarefa
 from apps.usuarios.tests.factory.usuarios import AlunoFactory, ProfessorFactory
 
 from apps.usuarios.tests.test_login import TestCore
@@ -84,6 +96,239 @@ class TestTarefaProfessor(TestCore):
             tarefa.codigo
         )
 
+    def test_listar_tarefas_quantidade_consultas(self):
+        """
+            - Motivação:
+                - Garantir que a listagem de tarefas não consulte o
+                professor e a disciplina de cada projeto separadamente.
+            - Regra de negócio:
+                - Projeto, professor e disciplina são carregados junto
+                com as tarefas.
+            - Resultado Esperado:
+                - status: 200
+                - mesma quantidade de consultas para 1 ou 5 tarefas
+        """
+
+        def criar_tarefa():
+            projeto = Projeto.objects.create(
+                nome='Projeto',
+                descricao='Projeto com tarefa',
+                tipo='Teste',
+                area='Testes',
+                professor=self.professor,
+                disciplina=self.disciplina
+            )
+
+            TarefaFactory(
+                projeto=projeto,
+                responsavel=AlunoFactory()
+            )
+
+        url = '/tarefas/'
+
+        criar_tarefa()
+
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as consultas_uma_tarefa:
+            response = self.client.get(url)
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+
+        for _ in range(4):
+            criar_tarefa()
+
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as consultas_cinco_tarefas:
+            response = self.client.get(url)
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertEqual(
+            len(response.data['resultados']),
+            5
+        )
+        self.assertEqual(
+            response.data['resultados'][0]['projeto']['disciplina'],
+            self.disciplina.nome
+        )
+        self.assertEqual(
+            len(consultas_uma_tarefa),
+            len(consultas_cinco_tarefas)
+        )
+
+    def test_listar_tarefas_cursor(self):
+        """
+            - Motivação:
+                - Percorrer as tarefas por cursor, sem contar o total.
+            - Regra de negócio:
+                - As tarefas são ordenadas por data, hora e código.
+            - Resultado Esperado:
+                - status: 200
+                - todas as tarefas exibidas uma única vez, em ordem
+        """
+
+        agora = datetime.now()
+
+        for dias in range(12):
+            projeto = Projeto.objects.create(
+                nome='Projeto',
+                descricao='Projeto com tarefa',
+                tipo='Teste',
+                area='Testes',
+                professor=self.professor,
+                disciplina=self.disciplina
+            )
+
+            TarefaFactory(
+                projeto=projeto,
+                responsavel=AlunoFactory(),
+                data=agora + timedelta(days=dias % 4),
+                hora=agora + timedelta(days=dias % 4, seconds=dias)
+            )
+
+        codigos = []
+        url = '/tarefas/?cursor='
+
+        while url:
+            response = self.client.get(url)
+
+            self.assertEqual(
+                response.status_code,
+                status.HTTP_200_OK
+            )
+            self.assertIsNone(response.data['quantidade'])
+
+            codigos += [
+                tarefa['codigo'] for tarefa in response.data['resultados']
+            ]
+            url = response.data['links']['proximo']
+
+        esperados = list(
+            Tarefa.objects.order_by(
+                'data', 'hora', 'codigo'
+            ).values_list('codigo', flat=True)
+        )
+
+        self.assertEqual(codigos, esperados)
+
+    def test_listar_tarefas_cursor_adulterado(self):
+        """
+            - Motivação:
+                - Um cursor com JSON válido mas valores adulterados não
+                pode causar erro interno.
+            - Resultado Esperado:
+                - status: 404 para valores fora do tipo dos campos
+        """
+
+        posicoes = [
+            ['data', '10:00:00', str(self.projeto.codigo)],
+            ['2022-01-01', '10:00:00', 'codigo'],
+            [['2022-01-01'], '10:00:00', str(self.projeto.codigo)],
+            [{'a': 1}, 1, None],
+        ]
+
+        for posicao in posicoes:
+            cursor = urlsafe_b64encode(
+                json.dumps({'p': posicao}).encode('utf-8')
+            ).decode('ascii')
+
+            response = self.client.get(f'/tarefas/?cursor={cursor}')
+
+            self.assertEqual(
+                response.status_code,
+                status.HTTP_404_NOT_FOUND
+            )
+
+    def test_listar_tarefas_quantidade_em_cache(self):
+        """
+            - Motivação:
+                - Evitar o COUNT(*) em todas as páginas da listagem.
+            - Regra de negócio:
+                - A quantidade fica em cache por usuário e filtros e
+                é invalidada quando uma tarefa é salva.
+            - Resultado Esperado:
+                - status: 200
+                - a segunda requisição não conta as tarefas
+                - a quantidade é atualizada após criar uma tarefa
+        """
+
+        TarefaFactory(
+            projeto=self.projeto,
+            responsavel=self.aluno
+        )
+
+        url = '/tarefas/'
+        response = self.client.get(url)
+
+        self.assertEqual(
+            response.data['quantidade'],
+            1
+        )
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(url)
+
+        self.assertEqual(
+            response.data['quantidade'],
+            1
+        )
+        self.assertFalse(
+            [
+                consulta for consulta in consultas
+                if 'COUNT(' in consulta['sql']
+            ]
+        )
+
+        TarefaFactory(
+            projeto=Projeto.objects.create(
+                nome='Outro projeto',
+                descricao='Projeto com tarefa',
+                tipo='Teste',
+                area='Testes',
+                professor=self.professor,
+                disciplina=self.disciplina
+            ),
+            responsavel=self.integrante_grupo
+        )
+
+        response = self.client.get(url)
+
+        self.assertEqual(
+            response.data['quantidade'],
+            2
+        )
+
+    def test_listar_tarefas_quantidade_projeto_alterado(self):
+        """
+            - Motivação:
+                - A quantidade em cache depende também dos models usados
+                nos filtros (projeto__professor).
+            - Resultado Esperado:
+                - a quantidade é atualizada após o projeto da tarefa
+                mudar de professor
+        """
+
+        TarefaFactory(
+            projeto=self.projeto,
+            responsavel=self.aluno
+        )
+
+        url = '/tarefas/'
+
+        self.assertEqual(self.client.get(url).data['quantidade'], 1)
+
+        self.projeto.professor = ProfessorFactory()
+        self.projeto.save()
+
+        self.assertEqual(self.client.get(url).data['quantidade'], 0)
+
     def test_filtrar_tarefa_nome(self):
         """
             - Motivação:
@@ -132,6 +377,58 @@ class TestTarefaProfessor(TestCore):
             numero_tarefas
         )
 
+    def test_buscar_tarefas(self):
+        """
+            - Motivação:
+                - Buscar tarefas pelo nome ou pela descrição.
+            - Regra de negócio:
+                - São exibidas as tarefas que contêm o termo informado
+                no query parameters "busca", das mais relevantes para
+                as menos relevantes.
+            - Resultado Esperado:
+                - status: 200
+                - paginação
+        """
+
+        dados = {
+            'projeto': self.projeto,
+            'data': datetime.now(),
+            'hora': datetime.now(),
+            'situacao': 'pendente'
+        }
+
+        por_descricao = Tarefa.objects.create(
+            nome='Apresentacao',
+            descricao='Apresentar o relatorio parcial',
+            **dados
+        )
+        por_nome = Tarefa.objects.create(
+            nome='Relatorio final',
+            descricao='Entregar o documento',
+            **dados
+        )
+        Tarefa.objects.create(
+            nome='Codigo',
+            descricao='Implementar a API',
+            **dados
+        )
+
+        url = '/tarefas/?busca=relat'
+        response = self.client.get(url)
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertEqual(
+            [tarefa['codigo'] for tarefa in response.data['resultados']],
+            [por_nome.codigo, por_descricao.codigo]
+        )
+        self.assertEqual(
+            response.data['quantidade'],
+            2
+        )
+
     def test_filtrar_tarefa_situacao(self):
         """
             - Motivação:
@@ -425,6 +722,121 @@ class TestTarefaProfessor(TestCore):
             tarefa.nome
         )
 
+    def test_criar_tarefa_varios_grupos(self):
+        """
+            - Motivação:
+                - Cria a tarefa para um projeto selecionado por
+                vários grupos.
+            - Regra de negócio:
+                - Cada grupo recebe a sua própria tarefa.
+            - Resultado Esperado:
+                - status: 201
+        """
+
+        grupos = [self.grupo] + GrupoFactory.create_batch(size=2)
+
+        for grupo in grupos:
+            ProjetoGrupoFactory(
+                projeto=self.projeto,
+                grupo=grupo
+            )
+
+        url = '/tarefas/'
+        data = {
+            'projeto': str(self.projeto.codigo),
+            'nome': 'Uma tarefa',
+            'descricao': 'Uma descricao',
+            'data': datetime.now().strftime(
+                "%d/%m/%Y"
+            ),
+            'hora': datetime.now().strftime(
+                "%H:%M:%S"
+            )
+        }
+
+        response = self.client.post(
+            url, data=data
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_201_CREATED
+        )
+
+        grupos_tarefas = GrupoTarefa.objects.filter(
+            tarefa__nome=data['nome']
+        )
+
+        self.assertEqual(
+            Tarefa.objects.filter(nome=data['nome']).count(),
+            3
+        )
+        self.assertEqual(
+            {grupo_tarefa.grupo_id for grupo_tarefa in grupos_tarefas},
+            {grupo.codigo for grupo in grupos}
+        )
+        self.assertEqual(
+            len({grupo_tarefa.tarefa_id for grupo_tarefa in grupos_tarefas}),
+            3
+        )
+
+    def test_distribuir_tarefas_consultas_constantes(self):
+        """
+            - Motivação:
+                - Distribuir várias tarefas para vários projetos.
+            - Regra de negócio:
+                - A quantidade de consultas não depende da quantidade
+                de projetos, grupos ou tarefas.
+            - Resultado Esperado:
+                - Uma tarefa por projeto, tarefa e grupo.
+        """
+
+        projetos = [self.projeto] + [
+            Projeto.objects.create(
+                nome=f'Projeto {indice}',
+                descricao='Um projeto voltado para testes.',
+                tipo='Teste',
+                area='Testes Unitários',
+                professor=self.professor,
+                disciplina=self.disciplina
+            ) for indice in range(3)
+        ]
+
+        for projeto in projetos[:3]:
+            for grupo in GrupoFactory.create_batch(size=2):
+                ProjetoGrupoFactory(projeto=projeto, grupo=grupo)
+
+        tarefas = [
+            {
+                'nome': f'Tarefa {indice}',
+                'descricao': 'Uma descricao',
+                'data': datetime.now(),
+                'hora': datetime.now()
+            } for indice in range(2)
+        ]
+
+        with CaptureQueriesContext(connection) as consultas_um_projeto:
+            distribuir_tarefas(projetos[:1], tarefas[:1])
+
+        with CaptureQueriesContext(connection) as consultas:
+            criadas = distribuir_tarefas(projetos, tarefas)
+
+        self.assertEqual(
+            len(consultas_um_projeto),
+            len(consultas)
+        )
+        # 3 projetos com 2 grupos e 1 projeto sem grupos, 2 tarefas.
+        self.assertEqual(
+            len(criadas),
+            (3 * 2 + 1) * 2
+        )
+        self.assertEqual(
+            GrupoTarefa.objects.filter(
+                tarefa__in=criadas
+            ).count(),
+            3 * 2 * 2
+        )
+
     def test_editar_tarefa(self):
         """
             - Motivação:
@@ -606,3 +1018,102 @@ class TestTarefaAluno(TestCore):
             response.status_code,
             status.HTTP_200_OK
         )
+
+
+@override_settings(TAREFAS_ATRASADAS_LOTE=2)
+class TestTarefasAtrasadas(TestCore):
+
+    """
+        Varredura que marca as tarefas pendentes com prazo vencido
+        como atrasadas.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        cls.projeto = ProjetoFactory(
+            professor=cls.professor
+        )
+        cls.agora = timezone.make_aware(datetime(2022, 6, 15, 12, 0))
+
+    def criar_tarefa(self, data, hora, situacao='pendente', ativo=True):
+        return Tarefa.objects.create(
+            projeto=self.projeto,
+            nome='Uma tarefa',
+            descricao='Uma descricao',
+            data=data,
+            hora=timezone.make_aware(datetime(1900, 1, 1, *hora)),
+            situacao=situacao,
+            ativo=ativo
+        )
+
+    def test_marcar_tarefas_atrasadas(self):
+        """
+            - Motivação:
+                - Marcar as tarefas cujo prazo já passou.
+            - Regra de negócio:
+                - Apenas tarefas pendentes e ativas, com data anterior
+                ou com a data de hoje e horário já passado.
+            - Resultado Esperado:
+                - Tarefas vencidas com situação atrasada.
+        """
+
+        ontem = self.agora.date() - timedelta(days=1)
+        hoje = self.agora.date()
+        amanha = self.agora.date() + timedelta(days=1)
+
+        vencidas = [
+            self.criar_tarefa(ontem, (23, 0)),
+            self.criar_tarefa(ontem, (8, 0)),
+            self.criar_tarefa(hoje, (11, 59)),
+        ]
+        no_prazo = [
+            self.criar_tarefa(hoje, (12, 30)),
+            self.criar_tarefa(amanha, (8, 0)),
+            self.criar_tarefa(ontem, (8, 0), situacao='concluida'),
+            self.criar_tarefa(ontem, (8, 0), ativo=False),
+        ]
+
+        self.assertEqual(
+            marcar_tarefas_atrasadas(self.agora),
+            3
+        )
+        self.assertEqual(
+            set(
+                Tarefa.objects.filter(
+                    situacao='atrasada'
+                ).values_list('codigo', flat=True)
+            ),
+            {tarefa.codigo for tarefa in vencidas}
+        )
+        for tarefa in no_prazo:
+            situacao = tarefa.situacao
+            tarefa.refresh_from_db()
+            self.assertEqual(tarefa.situacao, situacao)
+
+        self.assertEqual(
+            marcar_tarefas_atrasadas(self.agora),
+            0
+        )
+
+    def test_celery_marcar_tarefas_atrasadas(self):
+        """
+            - Motivação:
+                - Executar a varredura pelo celery beat.
+            - Regra de negócio:
+                - A quantidade de tarefas alteradas fica registrada.
+            - Resultado Esperado:
+                - Quantidade retornada e guardada no cache.
+        """
+
+        self.criar_tarefa(date.today() - timedelta(days=2), (8, 0))
+
+        self.assertEqual(
+            celery_marcar_tarefas_atrasadas(),
+            1
+        )
+        self.assertEqual(
+            cache.get(VARREDURA_ULTIMA)['atualizadas'],
+            1
+        )
@@ -1,4 +1,4 @@
-from django.db.models import Q
+from django.db.models import Q, Prefetch
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.decorators import action
 from rest_framework import status
@@ -6,6 +6,8 @@ from rest_framework.response import Response
 from .models import (
     GrupoTarefa, Projeto, ProjetoGrupo, Grupo, Tarefa
 )
+from apps.turmas.models import Disciplina
+from apps.usuarios.models import Aluno, Professor
 from .serializers import (
     ProjetoGrupoSerializer, ProjetoSerializer,
     GrupoSerializer, TarefaSerializer
@@ -13,13 +15,17 @@ from .serializers import (
 from .filters import GrupoFilter, ProjetoFilter, TarefaFilter
 
 from rest_framework.permissions import IsAuthenticated
+from apps.core.cache_respostas import cache_resposta
+from apps.core.campos import CamposViewSetMixin
+from apps.core.etag import ETagMixin
+from apps.core.versoes import invalidar_versao
 from apps.core.permissions import (
     ConcretePermissionProfessor,
     ConcretePermissionAluno
 )
 
 
-class ProjetoViewSet(ModelViewSet):
+class ProjetoViewSet(ETagMixin, CamposViewSetMixin, ModelViewSet):
 
     serializer_class = ProjetoSerializer
     permission_classes = [
@@ -27,27 +33,66 @@ class ProjetoViewSet(ModelViewSet):
         | ConcretePermissionAluno
     ]
     filterset_class = ProjetoFilter
+    estrategia_contagem = 'cache'
+    dependencias_cache = [
+        Projeto, ProjetoGrupo, Grupo, Disciplina, Professor
+    ]
+    campos_fixos = ['codigo']
+    relacoes_campos = {
+        'nome': {'only': ['nome']},
+        'tipo': {'only': ['tipo']},
+        'area': {'only': ['area']},
+        'disponivel': {'only': ['disponivel']},
+        'consolidado': {'only': ['consolidado']},
+        'ativo': {'only': ['ativo']},
+        'professor': {
+            'select_related': ['professor'],
+            'only': ['professor__codigo', 'professor__nome']
+        },
+        'disciplina': {
+            'select_related': ['disciplina'],
+            'only': [
+                'disciplina__codigo', 'disciplina__nome',
+                'disciplina__nota_corte', 'disciplina__quantidade_grupos'
+            ]
+        },
+        'grupos': {
+            'prefetch_related': [
+                Prefetch(
+                    'grupo',
+                    queryset=Grupo.objects.com_quantidade_membros()
+                )
+            ]
+        },
+    }
 
     class Meta:
         model = Projeto
 
     def get_permissions(self):
-        try:
-            if self.request.user.aluno and self.action in ['list', 'retrieve']:
+        if hasattr(self.request, 'aluno'):
+            if self.action in ['list', 'retrieve']:
                 return [ConcretePermissionAluno()]
-        except (TypeError, AttributeError):
-            return super().get_permissions()
+            return [ConcretePermissionProfessor()]
+
+        return super().get_permissions()
+
+    @cache_resposta
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     def get_queryset(self):
         if hasattr(self.request, 'professor'):
-            return Projeto.objects.prefetch_related(
-                'grupo'
-            ).select_related('professor').filter(
-                professor=self.request.professor,
-                disciplina__professor=self.request.professor
+            return self.otimizar_queryset(
+                Projeto.objects.filter(
+                    professor=self.request.professor,
+                    disciplina__professor=self.request.professor
+                )
             )
         else:
-            return Projeto.objects.all()
+            return self.otimizar_queryset(
+                Projeto.objects.all(), excluir=['grupos']
+            )
 
     def destroy(self, request, *args, **kwargs):
 
@@ -56,6 +101,7 @@ class ProjetoViewSet(ModelViewSet):
         GrupoTarefa.objects.filter(
             tarefa__projeto=instance
         ).update(ativo=False)
+        invalidar_versao(GrupoTarefa)
 
         ProjetoGrupo.objects.filter(
             projeto=instance
@@ -91,7 +137,7 @@ class ProjetoViewSet(ModelViewSet):
         )
 
 
-class GrupoViewSet(ModelViewSet):
+class GrupoViewSet(ETagMixin, ModelViewSet):
 
     permission_classes = [
         IsAuthenticated,
@@ -99,29 +145,32 @@ class GrupoViewSet(ModelViewSet):
     ]
     serializer_class = GrupoSerializer
     filterset_class = GrupoFilter
+    dependencias_cache = [Grupo, Aluno]
 
     def get_permissions(self):
-        try:
-            if self.request.user.professor:
-                if self.action in ['list', 'retrieve', 'ativar']:
-                    return [ConcretePermissionProfessor()]
-        except (TypeError, AttributeError):
-            return super().get_permissions()
+        if hasattr(self.request, 'professor'):
+            if self.action in ['list', 'retrieve', 'ativar']:
+                return [ConcretePermissionProfessor()]
+            return [ConcretePermissionAluno()]
+
+        return super().get_permissions()
 
     def get_queryset(self):
+        queryset = Grupo.objects.select_related(
+            'lider', 'aluno'
+        )
+
         if hasattr(self.request, 'aluno'):
-            grupos = Grupo.objects.filter(
+            grupos = queryset.filter(
                 Q(aluno=self.request.aluno)
                 | Q(lider=self.request.aluno),
                 ativo=True
             )
 
-            if grupos:
+            if grupos.exists():
                 return grupos
-            else:
-                return Grupo.objects.all()
 
-        return Grupo.objects.all()
+        return queryset
 
     class Meta:
         model = Grupo
@@ -136,7 +185,7 @@ class GrupoViewSet(ModelViewSet):
         pass
 
 
-class TarefaViewSet(ModelViewSet):
+class TarefaViewSet(ETagMixin, CamposViewSetMixin, ModelViewSet):
 
     permission_classes = [
         IsAuthenticated,
@@ -145,18 +194,61 @@ class TarefaViewSet(ModelViewSet):
     serializer_class = TarefaSerializer
     filterset_class = TarefaFilter
 
+    estrategia_contagem = 'cache'
+    cursor_ordering = ['data', 'hora', 'codigo']
+    dependencias_cache = [
+        Tarefa, GrupoTarefa, Grupo, Projeto, Disciplina, Professor
+    ]
+    campos_fixos = cursor_ordering
+    relacoes_campos = {
+        'nome': {'only': ['nome']},
+        'descricao': {'only': ['descricao']},
+        'situacao': {'only': ['situacao']},
+        'status': {'only': ['ativo']},
+        'projeto': {
+            'select_related': ['projeto'],
+            'only': ['projeto__nome']
+        },
+        'projeto.professor': {
+            'select_related': ['projeto__professor'],
+            'only': ['projeto__professor__nome']
+        },
+        'projeto.disciplina': {
+            'select_related': ['projeto__disciplina'],
+            'only': ['projeto__disciplina__nome']
+        },
+    }
+    campos_listagem = [
+        'codigo', 'nome', 'descricao', 'situacao', 'data', 'hora',
+        'ativo', 'projeto__nome', 'projeto__professor__nome',
+        'projeto__disciplina__nome'
+    ]
+
     class Meta:
         model = Tarefa
 
     def get_permissions(self):
-        try:
-            if self.request.user.aluno:
-                if self.action in [
-                    'list', 'retrieve', 'visualizar_tarefas_grupo'
-                ]:
-                    return [ConcretePermissionAluno()]
-        except (TypeError, AttributeError):
-            return super().get_permissions()
+        if hasattr(self.request, 'aluno'):
+            if self.action in [
+                'list', 'retrieve', 'visualizar_tarefas_grupo'
+            ]:
+                return [ConcretePermissionAluno()]
+            return [ConcretePermissionProfessor()]
+
+        return super().get_permissions()
+
+    def get_tarefas(self):
+        """
+            Tarefas com o projeto, o professor e a disciplina carregados
+            em uma única consulta, apenas com as colunas exibidas pelo
+            TarefaSerializer (ou pedidas em `?campos=`).
+        """
+        tarefas = self.otimizar_queryset(Tarefa.objects.all())
+
+        if self.campos_solicitados() is None:
+            tarefas = tarefas.only(*self.campos_listagem)
+
+        return tarefas
 
     def get_queryset(self):
 
@@ -165,13 +257,13 @@ class TarefaViewSet(ModelViewSet):
                 tarefa=self.kwargs['pk']
             )
 
-            if grupo_tarefa:
-                return Tarefa.objects.filter(
+            if grupo_tarefa.exists():
+                return self.get_tarefas().filter(
                     Q(grupotarefa__grupo__lider=self.request.aluno)
                     | Q(grupotarefa__grupo__aluno=self.request.aluno),
                 )
 
-        return Tarefa.objects.select_related('projeto').filter(
+        return self.get_tarefas().filter(
             projeto__professor=self.request.professor
         )
 
@@ -196,6 +288,7 @@ class TarefaViewSet(ModelViewSet):
         ],
         serializer_class=TarefaSerializer
     )
+    @cache_resposta
     def visualizar_tarefas_grupo(self, request, pk=None):
         queryset = self.filter_queryset(self.get_queryset())
 
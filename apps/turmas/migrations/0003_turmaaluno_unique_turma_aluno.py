@@ -0,0 +1,44 @@
+# Generated by Django 4.0.4 on 2026-10-18 12:00
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def remover_duplicados(apps, schema_editor):
+    """
+        Mantém apenas o primeiro vínculo de cada (turma, aluno) antes
+        de criar a restrição de unicidade.
+    """
+    TurmaAluno = apps.get_model('turmas', 'TurmaAluno')
+
+    duplicados = TurmaAluno.objects.values(
+        'turma', 'aluno'
+    ).annotate(
+        quantidade=Count('codigo')
+    ).filter(quantidade__gt=1)
+
+    for duplicado in duplicados:
+        codigos = list(
+            TurmaAluno.objects.filter(
+                turma=duplicado['turma'],
+                aluno=duplicado['aluno']
+            ).values_list('codigo', flat=True)
+        )
+        TurmaAluno.objects.filter(codigo__in=codigos[1:]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('turmas', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remover_duplicados, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='turmaaluno',
+            constraint=models.UniqueConstraint(fields=('turma', 'aluno'), name='unique_turma_aluno'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.0.4 on 2026-10-18 12:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('turmas', '0003_turmaaluno_unique_turma_aluno'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='disciplina',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['professor'], name='disciplina_professor_ativo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='turmaaluno',
+            index=models.Index(fields=['aluno', 'turma'], name='turma_aluno_aluno_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from uuid import uuid4
 from django.db import models
+from django.db.models import Q
 
 from apps.usuarios.models import Professor, Aluno
 
@@ -31,6 +32,13 @@ class Disciplina(models.Model):
 
     class Meta:
         db_table = 'tb_disciplina'
+        indexes = [
+            models.Index(
+                fields=['professor'],
+                condition=Q(ativo=True),
+                name='disciplina_professor_ativo_idx'
+            )
+        ]
 
     def __str__(self) -> str:
         return self.codigo
@@ -90,6 +98,18 @@ class TurmaAluno(models.Model):
 
     class Meta:
         db_table = 'tb_turmaaluno'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['turma', 'aluno'],
+                name='unique_turma_aluno'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['aluno', 'turma'],
+                name='turma_aluno_aluno_idx'
+            )
+        ]
 
     def __str__(self) -> str:
         return f'{self.codigo}'
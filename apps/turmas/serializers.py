@@ -1,5 +1,8 @@
+from django.db import router, transaction
 from rest_framework import serializers
+from apps.core.campos import CamposSerializerMixin
 from apps.core.validators import ValidaPeriodo
+from apps.core.versoes import invalidar_versao
 
 from apps.turmas.models import Turma, TurmaAluno, Disciplina
 from apps.usuarios.models import Aluno
@@ -40,7 +43,7 @@ class DisciplinaSerializer(serializers.ModelSerializer):
         )
 
 
-class TurmaSerializer(serializers.ModelSerializer):
+class TurmaSerializer(CamposSerializerMixin, serializers.ModelSerializer):
 
     alunos = serializers.ListField(
         child=serializers.PrimaryKeyRelatedField(
@@ -68,19 +71,19 @@ class TurmaSerializer(serializers.ModelSerializer):
         fields = ['codigo', 'nome', 'periodo', 'alunos', 'disciplina']
 
     def to_representation(self, instance):
-        return {
-            'codigo': instance.codigo,
-            'nome': instance.nome,
-            'disciplina': {
+        return self.representar({
+            'codigo': lambda: instance.codigo,
+            'nome': lambda: instance.nome,
+            'disciplina': lambda: {
                 'codigo': instance.disciplina.codigo,
                 'nome': instance.disciplina.nome
             },
-            'periodo': instance.periodo,
-            'professor': {
+            'periodo': lambda: instance.periodo,
+            'professor': lambda: {
                 'codigo': instance.professor.codigo,
                 'nome': instance.professor.nome
             }
-        }
+        })
 
     def create(self, validated_data):
         return Turma.objects.create(
@@ -102,13 +105,16 @@ class TurmaSerializer(serializers.ModelSerializer):
                     )
                 )
 
-            TurmaAluno.objects.bulk_create(turma_alunos)
+            TurmaAluno.objects.bulk_create(
+                turma_alunos, ignore_conflicts=True
+            )
+            invalidar_versao(TurmaAluno)
             validated_data.pop('alunos')
 
         return super().update(instance, validated_data)
 
 
-class AlunosTurmaSerializer(serializers.Serializer):
+class AlunosTurmaSerializer(CamposSerializerMixin, serializers.Serializer):
 
     alunos = serializers.ListField(
         child=serializers.PrimaryKeyRelatedField(
@@ -121,19 +127,25 @@ class AlunosTurmaSerializer(serializers.Serializer):
     )
 
     def to_representation(self, instance):
+        return self.representar({
+            'codigo': lambda: instance.codigo,
+            'nome': lambda: instance.nome,
+            'periodo': lambda: instance.periodo,
+            'professor': lambda: {
+                'codigo': instance.professor.codigo,
+                'nome': instance.professor.nome,
+                'email': instance.professor.email
+            } if instance.professor else None,
+            'alunos': lambda: self.representar_alunos(instance)
+        })
 
-        professor = {
-            'codigo': instance.professor.codigo,
-            'nome': instance.professor.nome,
-            'email': instance.professor.email
-        } if instance.professor else None
-
+    def representar_alunos(self, instance):
         try:
             alunos_obj = instance._prefetched_objects_cache[
                 'aluno'
             ]
 
-            alunos = [
+            return [
                 {
                     "codigo": aluno.codigo,
                     "matricula": aluno.matricula,
@@ -141,15 +153,21 @@ class AlunosTurmaSerializer(serializers.Serializer):
                 } for aluno in alunos_obj
             ]
         except (AttributeError, KeyError):
-            alunos = None
+            return None
 
-        return {
-            'codigo': instance.codigo,
-            'nome': instance.nome,
-            'periodo': instance.periodo,
-            'professor': professor,
-            'alunos': alunos
-        }
+    def turma_atualizada(self, instance):
+        """
+            Recarrega a turma com apenas o professor e os alunos que
+            serão exibidos.
+        """
+        queryset = Turma.objects.all()
+
+        if self.incluir('professor'):
+            queryset = queryset.select_related('professor')
+        if self.incluir('alunos'):
+            queryset = queryset.prefetch_related('aluno')
+
+        return queryset.get(codigo=instance.codigo)
 
     def update(self, instance, validated_data):
 
@@ -165,15 +183,88 @@ class AlunosTurmaSerializer(serializers.Serializer):
             aluno = Aluno.objects.get(
                 codigo=self.context['request'].aluno.codigo
             )
-            TurmaAluno.objects.create(
+            TurmaAluno.objects.get_or_create(
                 turma=instance,
                 aluno=aluno
             )
 
-        return Turma.objects.select_related(
-            'professor'
-        ).prefetch_related(
-            'aluno'
-        ).get(
-            codigo=instance.codigo
+        return self.turma_atualizada(instance)
+
+
+class SincronizarAlunosTurmaSerializer(AlunosTurmaSerializer):
+
+    """
+        Recebe a lista completa de alunos da turma.
+        - Os vínculos que não estão na lista são removidos e os que
+        faltam são criados, com uma consulta para os vínculos atuais,
+        um bulk_create e um DELETE ... IN.
+        - A linha da turma é travada (SELECT ... FOR UPDATE) antes de
+        ler os vínculos atuais: sincronizações simultâneas da mesma
+        turma são executadas uma após a outra.
+    """
+
+    alunos = serializers.ListField(
+        child=serializers.UUIDField(
+            format='hex_verbose'
+        ),
+        allow_empty=True
+    )
+
+    def validate_alunos(self, value):
+        alunos = set(value)
+
+        existentes = set(
+            Aluno.objects.filter(
+                codigo__in=alunos
+            ).values_list('codigo', flat=True)
         )
+
+        if alunos - existentes:
+            raise serializers.ValidationError(
+                'Aluno(s) não encontrado(s): {}.'.format(
+                    ', '.join(
+                        str(codigo) for codigo in alunos - existentes
+                    )
+                )
+            )
+
+        return alunos
+
+    def update(self, instance, validated_data):
+        alunos = validated_data['alunos']
+
+        with transaction.atomic():
+            Turma.objects.select_for_update().filter(
+                pk=instance.pk
+            ).values_list('pk').get()
+
+            atuais = set(
+                TurmaAluno.objects.filter(
+                    turma=instance
+                ).values_list('aluno_id', flat=True)
+            )
+
+            novos = alunos - atuais
+            removidos = atuais - alunos
+
+            if novos:
+                TurmaAluno.objects.bulk_create(
+                    [
+                        TurmaAluno(turma=instance, aluno_id=aluno)
+                        for aluno in novos
+                    ],
+                    ignore_conflicts=True
+                )
+
+            if removidos:
+                # Nenhum model referencia tb_turmaaluno: o DELETE é
+                # feito direto, sem o SELECT prévio do Collector.
+                TurmaAluno.objects.filter(
+                    turma=instance,
+                    aluno__in=removidos
+                )._raw_delete(router.db_for_write(TurmaAluno))
+
+            if novos or removidos:
+                invalidar_versao(TurmaAluno)
+
+        return self.turma_atualizada(instance)
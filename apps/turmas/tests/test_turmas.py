@@ -2,6 +2,8 @@ from uuid import uuid4
 from datetime import datetime
 from random import choice
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from apps.usuarios.tests.test_login import TestCore
 from apps.turmas.tests.factory.turmas import (
@@ -377,6 +379,143 @@ class TestTurmasProfessor(TestCore):
             status.HTTP_200_OK
         )
 
+    def test_turma_sincronizar_alunos(self):
+        """
+            - Motivação:
+                - Informar a lista completa de alunos da turma.
+            - Regra de negócio:
+                - Os alunos fora da lista são removidos e os
+                que faltam são inseridos.
+            - Resultado Esperado:
+                - status: 200
+        """
+
+        mantido, removido = AlunoFactory.create_batch(size=2)
+        novos = AlunoFactory.create_batch(size=3)
+
+        TurmaAlunoFactory(aluno=mantido, turma=self.turma)
+        TurmaAlunoFactory(aluno=removido, turma=self.turma)
+
+        alunos = [mantido] + novos
+
+        url = f'/turmas/{self.turma.codigo}/sincronizar-alunos/'
+        response = self.client.put(
+            url,
+            data={
+                'alunos': [str(aluno.codigo) for aluno in alunos]
+            },
+            format='json'
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertEqual(
+            set(
+                TurmaAluno.objects.filter(
+                    turma=self.turma
+                ).values_list('aluno_id', flat=True)
+            ),
+            {aluno.codigo for aluno in alunos}
+        )
+        self.assertEqual(
+            len(response.data['alunos']),
+            4
+        )
+
+        response = self.client.put(
+            url,
+            data={'alunos': []},
+            format='json'
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertFalse(
+            TurmaAluno.objects.filter(turma=self.turma)
+        )
+
+    def test_turma_sincronizar_alunos_consultas_constantes(self):
+        """
+            - Motivação:
+                - Sincronizar turmas grandes sem uma consulta
+                por aluno.
+            - Regra de negócio:
+                - A quantidade de consultas não depende da
+                quantidade de alunos inseridos ou removidos.
+            - Resultado Esperado:
+                - status: 200
+        """
+
+        url = f'/turmas/{self.turma.codigo}/sincronizar-alunos/'
+        poucos = AlunoFactory.create_batch(size=2)
+        muitos = AlunoFactory.create_batch(size=20)
+
+        TurmaAlunoFactory(aluno=AlunoFactory(), turma=self.turma)
+
+        self.client.get(f'/turmas/{self.turma.codigo}/')
+
+        with CaptureQueriesContext(connection) as consultas_poucos:
+            response = self.client.put(
+                url,
+                data={
+                    'alunos': [str(aluno.codigo) for aluno in poucos]
+                },
+                format='json'
+            )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+
+        with CaptureQueriesContext(connection) as consultas_muitos:
+            response = self.client.put(
+                url,
+                data={
+                    'alunos': [str(aluno.codigo) for aluno in muitos]
+                },
+                format='json'
+            )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertEqual(
+            len(response.data['alunos']),
+            20
+        )
+        self.assertEqual(
+            len(consultas_poucos),
+            len(consultas_muitos)
+        )
+
+    def test_turma_sincronizar_aluno_inexistente(self):
+        """
+            - Motivação:
+                - Sincronizar a turma com um aluno não cadastrado.
+            - Regra de negócio:
+                - Todos os alunos informados devem existir.
+            - Resultado Esperado:
+                - status: 400
+        """
+
+        url = f'/turmas/{self.turma.codigo}/sincronizar-alunos/'
+        response = self.client.put(
+            url,
+            data={'alunos': [str(uuid4())]},
+            format='json'
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+
     def test_criar_turma_sem_disciplina(self):
         """
             - Motivação:
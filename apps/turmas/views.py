@@ -4,27 +4,33 @@ from rest_framework.viewsets import ModelViewSet
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 
+from apps.core.cache_respostas import cache_resposta
+from apps.core.campos import CamposViewSetMixin
+from apps.core.etag import ETagMixin
 from apps.core.permissions import (
     ConcretePermissionAluno, ConcretePermissionProfessor
 )
-from apps.turmas.models import Turma, Disciplina
+from apps.turmas.models import Turma, TurmaAluno, Disciplina
+from apps.usuarios.models import Professor
 from apps.turmas.serializers import (
-    DisciplinaSerializer, TurmaSerializer, AlunosTurmaSerializer
+    DisciplinaSerializer, TurmaSerializer, AlunosTurmaSerializer,
+    SincronizarAlunosTurmaSerializer
 )
 
 
-class DisciplinaViewSet(ModelViewSet):
+class DisciplinaViewSet(ETagMixin, ModelViewSet):
 
     serializer_class = DisciplinaSerializer
     permission_classes = [
         IsAuthenticated, ConcretePermissionProfessor
     ]
+    dependencias_cache = [Disciplina, Professor]
 
     def get_queryset(self):
         return Disciplina.objects.filter(
             professor=self.request.professor,
             ativo=True
-        )
+        ).select_related('professor')
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -37,17 +43,36 @@ class DisciplinaViewSet(ModelViewSet):
         )
 
 
-class TurmaViewSet(ModelViewSet):
+class TurmaViewSet(ETagMixin, CamposViewSetMixin, ModelViewSet):
 
     serializer_class = TurmaSerializer
     permission_classes = [
         ConcretePermissionProfessor
         | ConcretePermissionAluno
     ]
+    dependencias_cache = [Turma, TurmaAluno, Disciplina, Professor]
+    campos_fixos = ['codigo']
+    relacoes_campos = {
+        'nome': {'only': ['nome']},
+        'periodo': {'only': ['periodo']},
+        'disciplina': {
+            'select_related': ['disciplina'],
+            'only': ['disciplina__codigo', 'disciplina__nome']
+        },
+        'professor': {
+            'select_related': ['professor'],
+            'only': ['professor__codigo', 'professor__nome']
+        },
+        'alunos': {'prefetch_related': ['aluno']},
+    }
 
     class Meta:
         model = Turma
 
+    @cache_resposta
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def get_queryset(self):
         """
             Retorna as turmas de acordo com o usuário.
@@ -58,29 +83,23 @@ class TurmaViewSet(ModelViewSet):
         """
         if hasattr(self.request, 'aluno'):
             try:
-                turmas = Turma.objects.prefetch_related(
-                    'aluno'
-                ).filter(
-                    aluno=self.request.aluno
-                ).select_related('professor')
+                turmas = self.otimizar_queryset(
+                    Turma.objects.filter(
+                        aluno=self.request.aluno
+                    )
+                )
 
                 if turmas:
                     return turmas
                 else:
-                    return Turma.objects.all().select_related(
-                        'professor'
-                    ).prefetch_related(
-                        'aluno'
-                    )
+                    return self.otimizar_queryset(Turma.objects.all())
             except AttributeError:
                 pass
 
-        return Turma.objects.filter(
-            professor=self.request.professor
-        ).select_related(
-            'professor'
-        ).prefetch_related(
-            'aluno'
+        return self.otimizar_queryset(
+            Turma.objects.filter(
+                professor=self.request.professor
+            )
         )
 
     def get_permissions(self):
@@ -151,3 +170,29 @@ class TurmaViewSet(ModelViewSet):
         return Response(
             serializer.data
         )
+
+    @action(
+        methods=['put'],
+        detail=True,
+        url_path='sincronizar-alunos',
+        url_name='sincronizar-alunos',
+        serializer_class=SincronizarAlunosTurmaSerializer,
+        permission_classes=[
+            IsAuthenticated
+        ]
+    )
+    def sincronizar_alunos(self, request, pk):
+        """
+            Substitui os alunos da turma pela lista informada.
+            - Apenas professores sincronizam
+            os alunos de uma turma.
+            - Uma lista vazia remove todos os alunos.
+        """
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+
+        return Response(
+            serializer.data
+        )
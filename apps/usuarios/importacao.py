@@ -0,0 +1,334 @@
+import csv
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_email
+from django.db import connections, router, transaction
+from django.db.models import Q
+from rest_framework.serializers import ValidationError
+
+from apps.core.validators import ValidaMatricula
+from .models import User, Aluno
+from .tasks import celery_importar_alunos, enfileirar_email_cadastro
+
+"""
+    Importação em massa de alunos a partir de um CSV com as colunas
+    nome, email, matricula e senha.
+    - A requisição valida apenas o cabeçalho e enfileira a importação no
+    celery. O andamento e o resultado ficam no cache por
+    IMPORTACAO_RETENCAO segundos (ver consultar_importacao).
+    - As linhas são validadas em blocos de IMPORTACAO_BLOCO linhas, com
+    uma única consulta por bloco para e-mails/matrículas já cadastrados.
+    - Os hashes das senhas de todas as linhas válidas são gerados antes
+    da primeira inserção, em um pool de IMPORTACAO_THREADS threads
+    mantido pelo processo do worker (o PBKDF2 do hashlib libera o GIL).
+    - Usuários e alunos são inseridos com bulk_create em uma única
+    transação: uma falha não deixa a importação pela metade.
+"""
+
+COLUNAS = ['nome', 'email', 'matricula', 'senha']
+
+PENDENTE = 'pendente'
+PROCESSANDO = 'processando'
+CONCLUIDA = 'concluida'
+FALHA = 'falha'
+
+# Pool de threads dos hashes por processo (pid). Threads não sobrevivem
+# ao fork dos workers do celery, então cada processo cria o seu.
+pools = {}
+pools_trava = threading.Lock()
+
+
+def pool_hashes():
+    pid = os.getpid()
+
+    with pools_trava:
+        if pid not in pools:
+            pools.clear()
+            pools[pid] = ThreadPoolExecutor(
+                settings.IMPORTACAO_THREADS,
+                thread_name_prefix='importacao'
+            )
+
+        return pools[pid]
+
+
+def gerar_hashes(senhas):
+    return list(pool_hashes().map(make_password, senhas))
+
+
+def chave_importacao(importacao):
+    return f'importacao:{importacao}'
+
+
+def atualizar_importacao(importacao, **dados):
+    chave = chave_importacao(importacao)
+    situacao = cache.get(chave) or {}
+    situacao.update(dados)
+
+    cache.set(chave, situacao, settings.IMPORTACAO_RETENCAO)
+
+
+def validar_linha(linha):
+    erros = []
+
+    for coluna in COLUNAS:
+        if not linha.get(coluna):
+            erros.append(f'O campo {coluna} é obrigatório.')
+
+    if linha.get('email'):
+        try:
+            validate_email(linha['email'])
+        except DjangoValidationError:
+            erros.append('Informe um endereço de email válido.')
+
+    if linha.get('matricula'):
+        try:
+            ValidaMatricula(linha['matricula'])
+        except ValidationError as erro:
+            erros += [str(detalhe) for detalhe in erro.detail]
+
+    return erros
+
+
+def inserir_tabela_filha(model, objetos):
+    """
+        Insere em lote a tabela filha de um model com herança
+        multi-tabela (tb_aluno, tb_professor), cujos usuários já foram
+        inseridos.
+        - O bulk_create do Django não aceita models com herança
+        multi-tabela, então a tabela filha é inserida com o mesmo
+        QuerySet._insert usado internamente pelo bulk_create.
+    """
+    campos = model._meta.local_concrete_fields
+    banco = router.db_for_write(model)
+    tamanho = connections[banco].ops.bulk_batch_size(campos, objetos) or 1
+
+    for inicio in range(0, len(objetos), tamanho):
+        model.objects._insert(
+            objetos[inicio:inicio + tamanho],
+            fields=campos,
+            using=banco
+        )
+
+
+def inserir_alunos(linhas, senhas):
+    """
+        Insere os usuários (tabela do AUTH_USER_MODEL), com as senhas já
+        convertidas em hash, e os alunos (tb_aluno) em lote.
+    """
+    usuarios = User.objects.bulk_create([
+        User(email=linha['email'], password=senha)
+        for linha, senha in zip(linhas, senhas)
+    ])
+
+    if any(usuario.pk is None for usuario in usuarios):
+        ids = dict(
+            User.objects.filter(
+                email__in=[usuario.email for usuario in usuarios]
+            ).values_list('email', 'id')
+        )
+        for usuario in usuarios:
+            usuario.pk = ids[usuario.email]
+
+    alunos = [
+        Aluno(
+            djangocustomuser_ptr_id=usuario.pk,
+            nome=linha['nome'],
+            matricula=linha['matricula']
+        ) for linha, usuario in zip(linhas, usuarios)
+    ]
+
+    inserir_tabela_filha(Aluno, alunos)
+
+    return alunos
+
+
+def validar_bloco(bloco, emails_vistos, matriculas_vistas):
+    erros = []
+    validas = []
+
+    emails = [linha['email'] for _, linha in bloco]
+    matriculas = [linha['matricula'] for _, linha in bloco]
+
+    cadastrados = User.objects.filter(
+        Q(email__in=emails) | Q(aluno__matricula__in=matriculas)
+    ).values_list('email', 'aluno__matricula')
+
+    for email, matricula in cadastrados:
+        emails_vistos.add(email)
+        matriculas_vistas.add(matricula)
+
+    for numero, linha in bloco:
+        erros_linha = validar_linha(linha)
+
+        if linha.get('email') in emails_vistos:
+            erros_linha.append(
+                'Já existe um usuário cadastrado com o e-mail informado.'
+            )
+        if linha.get('matricula') in matriculas_vistas:
+            erros_linha.append(
+                'A matrícula informada não pode ser utilizada.'
+            )
+
+        if erros_linha:
+            erros.append({'linha': numero, 'erros': erros_linha})
+            continue
+
+        emails_vistos.add(linha['email'])
+        matriculas_vistas.add(linha['matricula'])
+        validas.append(linha)
+
+    return validas, erros
+
+
+def ler_csv(texto):
+    leitor = csv.DictReader(io.StringIO(texto, newline=''))
+
+    if not leitor.fieldnames or set(COLUNAS) - set(leitor.fieldnames):
+        raise ValidationError(
+            {
+                'arquivo': [
+                    'O arquivo deve conter as colunas: {}.'.format(
+                        ', '.join(COLUNAS)
+                    )
+                ]
+            }
+        )
+
+    return leitor
+
+
+def iniciar_importacao(arquivo, usuario):
+    """
+        Valida o cabeçalho do arquivo CSV enviado e enfileira a
+        importação.
+
+        Returns:
+            [str]: [Identificador da importação]
+    """
+    try:
+        texto = arquivo.read().decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise ValidationError(
+            {'arquivo': ['O arquivo deve estar codificado em UTF-8.']}
+        )
+
+    ler_csv(texto)
+
+    importacao = uuid4().hex
+    atualizar_importacao(
+        importacao,
+        usuario=str(usuario.pk),
+        situacao=PENDENTE,
+        importados=0,
+        erros=[]
+    )
+
+    celery_importar_alunos.delay(importacao, texto)
+
+    return importacao
+
+
+def consultar_importacao(importacao, usuario):
+    """
+        Returns:
+            [dict]: [Situação e resultado da importação ou None, se ela
+            não existe, expirou ou foi iniciada por outro usuário]
+    """
+    situacao = cache.get(chave_importacao(importacao))
+
+    if not situacao or situacao.pop('usuario') != str(usuario.pk):
+        return None
+
+    return situacao
+
+
+def executar_importacao(importacao, texto):
+    """
+        Executa a importação enfileirada, registrando a situação no
+        cache.
+    """
+    atualizar_importacao(importacao, situacao=PROCESSANDO)
+
+    try:
+        resultado = importar_alunos(texto)
+    except Exception:
+        atualizar_importacao(importacao, situacao=FALHA)
+        raise
+
+    atualizar_importacao(importacao, situacao=CONCLUIDA, **resultado)
+
+    return resultado
+
+
+def importar_alunos(texto):
+    """
+        Importa os alunos do conteúdo do arquivo CSV.
+
+        Returns:
+            [dict]: [Quantidade de alunos importados e erros por linha]
+    """
+    leitor = ler_csv(texto)
+
+    validas = []
+    erros = []
+    emails_vistos = set()
+    matriculas_vistas = set()
+    bloco = []
+
+    # A linha 1 é o cabeçalho.
+    for numero, linha in enumerate(leitor, start=2):
+        bloco.append(
+            (
+                numero,
+                {
+                    coluna: (linha.get(coluna) or '').strip()
+                    for coluna in COLUNAS
+                }
+            )
+        )
+
+        if len(bloco) == settings.IMPORTACAO_BLOCO:
+            validas_bloco, erros_bloco = validar_bloco(
+                bloco, emails_vistos, matriculas_vistas
+            )
+            validas += validas_bloco
+            erros += erros_bloco
+            bloco = []
+
+    if bloco:
+        validas_bloco, erros_bloco = validar_bloco(
+            bloco, emails_vistos, matriculas_vistas
+        )
+        validas += validas_bloco
+        erros += erros_bloco
+
+    senhas = gerar_hashes([linha['senha'] for linha in validas])
+    tamanho = settings.IMPORTACAO_BLOCO
+
+    with transaction.atomic():
+        for inicio in range(0, len(validas), tamanho):
+            inserir_alunos(
+                validas[inicio:inicio + tamanho],
+                senhas[inicio:inicio + tamanho]
+            )
+
+    for linha in validas:
+        enfileirar_email_cadastro(
+            'Seja Bem-Vindo!',
+            'Você acabou de se cadastrar no Sistema de Gestão de Projetos.', # noqa
+            linha['email']
+        )
+
+    return {
+        'importados': len(validas),
+        'erros': erros
+    }
@@ -235,3 +235,7 @@ class RecuperaSenhaSerializer(serializers.Serializer):
             )
 
         return data
+
+
+class ImportacaoAlunosSerializer(serializers.Serializer):
+    arquivo = serializers.FileField()
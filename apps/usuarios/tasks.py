@@ -1,11 +1,169 @@
+import time
+from uuid import uuid4
+
 from celery import shared_task
-from apps.core.mail import enviar_email_cadastro
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.mail import enviar_emails_em_lote
+
+"""
+    Fila de e-mails de boas-vindas guardada no cache (Redis).
+    - Cada cadastro recebe uma posição (incr em FILA_FIM) e grava o e-mail
+    na chave da posição.
+    - O envio é feito em lotes de EMAIL_CADASTRO_LOTE mensagens por
+    conexão: quando a fila completa um lote, ou a cada
+    EMAIL_CADASTRO_JANELA segundos pelo celery beat.
+    - Uma posição reservada e não gravada (processo interrompido, chave
+    removida do Redis) é descartada após EMAIL_CADASTRO_ESPERA segundos,
+    para não bloquear os e-mails seguintes.
+    - Uma execução envia no máximo EMAIL_CADASTRO_LOTES_EXECUCAO lotes e
+    enfileira uma nova execução para o restante, sem ocupar um worker
+    (e a trava) com uma fila longa.
+    - A trava guarda um token da execução e só é removida pela execução
+    que a criou: se ela expirar e for obtida por outra execução, a
+    primeira não a remove ao terminar.
+"""
+
+FILA = 'emails_cadastro'
+FILA_INICIO = f'{FILA}:inicio'
+FILA_FIM = f'{FILA}:fim'
+FILA_TRAVA = f'{FILA}:trava'
+
+# Remove a trava apenas se ela ainda guarda o token informado.
+LIBERAR_TRAVA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def enfileirar_email_cadastro(assunto, mensagem, email):
+    cache.add(FILA_FIM, 0, None)
+    posicao = cache.incr(FILA_FIM)
+
+    cache.set(f'{FILA}:{posicao}', [assunto, mensagem, email], None)
 
+    if posicao % settings.EMAIL_CADASTRO_LOTE == 0:
+        celery_enviar_emails_cadastro.delay()
 
-@shared_task(name='notificar_cadastro_email')
-def celery_email_cadastro(assunto, mensagem, email, anexos=[]):
-    return enviar_email_cadastro(
-        assunto,
-        mensagem,
-        email
+    return posicao
+
+
+def posicao_abandonada(chave):
+    """
+        Registra quando a posição foi encontrada vazia pela primeira vez
+        e indica se ela já está vazia há EMAIL_CADASTRO_ESPERA segundos.
+    """
+    cache.add(f'{chave}:ausente', time.time(), None)
+    desde = cache.get(f'{chave}:ausente')
+
+    return (
+        desde is not None
+        and time.time() - desde >= settings.EMAIL_CADASTRO_ESPERA
     )
+
+
+def liberar_trava(token):
+    """
+        Remove a trava da fila se ela ainda pertence à execução do token.
+        - No Redis (django-redis) a comparação e a remoção são atômicas.
+    """
+    cliente = getattr(cache, 'client', None)
+
+    if hasattr(cliente, 'get_client'):
+        cliente.get_client(write=True).eval(
+            LIBERAR_TRAVA,
+            1,
+            cliente.make_key(FILA_TRAVA),
+            cliente.encode(token)
+        )
+    elif cache.get(FILA_TRAVA) == token:
+        cache.delete(FILA_TRAVA)
+
+
+@shared_task(name='enviar_lote_emails_cadastro')
+def celery_enviar_emails_cadastro():
+    """
+        Envia os e-mails pendentes da fila, um lote por conexão.
+        - Só envia posições contíguas já gravadas; uma posição reservada
+        mas ainda não gravada fica para a próxima execução, até ser
+        considerada abandonada (ver posicao_abandonada).
+        - Envia no máximo EMAIL_CADASTRO_LOTES_EXECUCAO lotes; se a
+        fila não terminou, enfileira uma nova execução.
+        - Retorna a quantidade de mensagens enviadas.
+    """
+    token = uuid4().hex
+
+    if not cache.add(FILA_TRAVA, token, settings.EMAIL_CADASTRO_TRAVA):
+        return 0
+
+    enviados = 0
+    lotes = 0
+    reenfileirar = False
+
+    try:
+        inicio = cache.get(FILA_INICIO, 0)
+        fim = cache.get(FILA_FIM, 0)
+
+        while inicio < fim:
+            if lotes == settings.EMAIL_CADASTRO_LOTES_EXECUCAO:
+                reenfileirar = True
+                break
+
+            chaves = [
+                f'{FILA}:{posicao}' for posicao in range(
+                    inicio + 1,
+                    min(inicio + settings.EMAIL_CADASTRO_LOTE, fim) + 1
+                )
+            ]
+            pendentes = cache.get_many(chaves)
+
+            lote = []
+            consumidas = 0
+            for chave in chaves:
+                if chave in pendentes:
+                    lote.append(pendentes[chave])
+                elif not posicao_abandonada(chave):
+                    break
+                consumidas += 1
+
+            if not consumidas:
+                break
+
+            if lote:
+                enviados += enviar_emails_em_lote(lote)
+
+            cache.delete_many(
+                [
+                    variante
+                    for chave in chaves[:consumidas]
+                    for variante in [chave, f'{chave}:ausente']
+                ]
+            )
+            inicio += consumidas
+            lotes += 1
+            cache.set(FILA_INICIO, inicio, None)
+
+            if consumidas < len(chaves):
+                break
+    finally:
+        liberar_trava(token)
+
+    if reenfileirar:
+        celery_enviar_emails_cadastro.delay()
+
+    return enviados
+
+
+@shared_task(name='importar_alunos')
+def celery_importar_alunos(importacao, texto):
+    """
+        Importa os alunos de um arquivo CSV (ver apps.usuarios.importacao).
+        - Retorna a quantidade de alunos importados.
+    """
+    # O módulo da importação depende da fila de e-mails deste módulo.
+    from .importacao import executar_importacao
+
+    return executar_importacao(importacao, texto)['importados']
@@ -1,11 +1,17 @@
+from unittest import mock
 from uuid import uuid4
+from django.contrib.auth.hashers import make_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from rest_framework import status
 
 from apps.usuarios.tests.test_login import TestCore
 from apps.usuarios.tests.factory.usuarios import (
-    AlunoFactory, gerar_matricula
+    AlunoFactory, ProfessorFactory, gerar_matricula
 )
-from apps.usuarios.models import Aluno
+from apps.usuarios import importacao
+from apps.usuarios.models import Aluno, User
+from sistema_gestao_projetos.celery import app
 
 
 class TestAluno(TestCore):
@@ -444,3 +450,256 @@ class TestAluno(TestCore):
         assert all(
             key_response in self.pagination_keys for key_response in response.data.keys() # noqa
         )
+
+    def test_listar_alunos_cursor(self):
+        """
+            - Motivação:
+                - Percorrer a lista de alunos por cursor.
+            - Regra de negócio:
+                - Com o parâmetro cursor, a paginação é feita a partir
+                do último aluno exibido, ordenando por nome e código.
+                - O link anterior volta para a página já visitada.
+            - Resultado Esperado:
+                - status: 200
+                - todos os alunos exibidos uma única vez, em ordem
+        """
+
+        AlunoFactory.create_batch(size=14)
+
+        codigos = []
+        url = '/alunos/?cursor='
+
+        while url:
+            response = self.client.get(url)
+
+            self.assertEqual(
+                response.status_code,
+                status.HTTP_200_OK
+            )
+            self.assertEqual(
+                list(response.data.keys()),
+                self.pagination_keys
+            )
+
+            codigos += [
+                aluno['codigo'] for aluno in response.data['resultados']
+            ]
+            url = response.data['links']['proximo']
+            anterior = response.data['links']['anterior']
+
+        esperados = list(
+            Aluno.objects.order_by(
+                'nome', 'codigo'
+            ).values_list('codigo', flat=True)
+        )
+
+        self.assertEqual(codigos, esperados)
+
+        response = self.client.get(anterior)
+
+        self.assertEqual(
+            [aluno['codigo'] for aluno in response.data['resultados']],
+            esperados[:10]
+        )
+
+    def test_listar_alunos_cursor_invalido(self):
+
+        response = self.client.get('/alunos/?cursor=invalido')
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_404_NOT_FOUND
+        )
+
+    def autenticar_professor(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.token_usuario(self.professor)
+        )
+
+    def enviar_csv(self, conteudo):
+        """
+            Envia o CSV executando a importação do celery imediatamente.
+        """
+        task_always_eager = app.conf.task_always_eager
+        app.conf.task_always_eager = True
+
+        try:
+            return self.client.post(
+                '/alunos/importar/',
+                data={
+                    'arquivo': SimpleUploadedFile(
+                        'alunos.csv',
+                        conteudo.encode('utf-8'),
+                        content_type='text/csv'
+                    )
+                },
+                format='multipart'
+            )
+        finally:
+            app.conf.task_always_eager = task_always_eager
+
+    def csv_alunos(self, quantidade, extras=[]):
+        linhas = ['nome,email,matricula,senha']
+        linhas += [
+            f'Aluno {numero},importado{numero}@teste.com,'
+            f'{202200000100 + numero},senha{numero}'
+            for numero in range(quantidade)
+        ]
+
+        return '\n'.join(linhas + extras)
+
+    @override_settings(IMPORTACAO_BLOCO=5)
+    def test_importar_alunos(self):
+        """
+            - Motivação:
+                - Cadastrar vários alunos de uma vez a partir de um CSV.
+            - Regra de negócio:
+                - Apenas professores importam alunos.
+                - A importação roda no celery e a sua situação é
+                consultada pelo identificador devolvido.
+                - Linhas com e-mail ou matrícula já cadastrados, repetidos
+                no arquivo ou inválidos são informadas com os seus erros.
+            - Resultado Esperado:
+                - status: 202 e, na consulta, 200
+                - alunos válidos cadastrados e aptos a fazer login
+        """
+
+        self.autenticar_professor()
+
+        response = self.enviar_csv(
+            self.csv_alunos(
+                5,
+                [
+                    f'Repetido,{self.aluno.email},202200000200,senha',
+                    'Matricula repetida,outro@teste.com,202200000100,senha',
+                    'Matricula invalida,invalida@teste.com,12ab,senha',
+                    ',sem_nome@teste.com,202200000300,senha',
+                ]
+            )
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_202_ACCEPTED
+        )
+
+        response = self.client.get(
+            f'/alunos/importar/{response.data["importacao"]}/'
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertEqual(response.data['situacao'], importacao.CONCLUIDA)
+        self.assertEqual(response.data['importados'], 5)
+        self.assertEqual(
+            [erro['linha'] for erro in response.data['erros']],
+            [7, 8, 9, 10]
+        )
+        self.assertEqual(
+            Aluno.objects.filter(
+                email__startswith='importado'
+            ).count(),
+            5
+        )
+
+        self.client.credentials()
+        response = self.client.post(
+            '/login/',
+            data={
+                'username': 'importado3@teste.com',
+                'password': 'senha3'
+            }
+        )
+
+        assert response.data.get('token')
+
+    @override_settings(IMPORTACAO_BLOCO=5)
+    def test_importar_alunos_falha(self):
+        """
+            - Motivação:
+                - Uma falha na inserção não pode deixar a importação
+                pela metade.
+            - Resultado Esperado:
+                - todas as senhas convertidas antes da primeira inserção
+                - nenhum aluno cadastrado e a importação com falha
+        """
+
+        self.autenticar_professor()
+
+        gerar_hashes = importacao.gerar_hashes
+        eventos = []
+
+        def registrar_hashes(senhas):
+            eventos.append(('hashes', len(senhas)))
+            return gerar_hashes(senhas)
+
+        def falhar_segundo_bloco(model, objetos):
+            eventos.append(('insercao', len(objetos)))
+            if len(eventos) == 3:
+                raise RuntimeError('Falha no segundo bloco')
+
+        with mock.patch.object(
+            importacao, 'gerar_hashes', side_effect=registrar_hashes
+        ), mock.patch.object(
+            importacao,
+            'inserir_tabela_filha',
+            side_effect=falhar_segundo_bloco
+        ):
+            response = self.enviar_csv(self.csv_alunos(7))
+
+        self.assertEqual(
+            eventos,
+            [('hashes', 7), ('insercao', 5), ('insercao', 2)]
+        )
+        self.assertFalse(
+            User.objects.filter(email__startswith='importado').exists()
+        )
+
+        response = self.client.get(
+            f'/alunos/importar/{response.data["importacao"]}/'
+        )
+
+        self.assertEqual(response.data['situacao'], importacao.FALHA)
+
+    def test_importacao_outro_professor(self):
+
+        self.autenticar_professor()
+
+        response = self.enviar_csv(self.csv_alunos(1))
+        url = f'/alunos/importar/{response.data["importacao"]}/'
+
+        outro_professor = ProfessorFactory(password=make_password('123'))
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.token_usuario(outro_professor)
+        )
+
+        self.assertEqual(
+            self.client.get(url).status_code,
+            status.HTTP_404_NOT_FOUND
+        )
+        self.assertEqual(
+            self.client.get(f'/alunos/importar/{uuid4().hex}/').status_code,
+            status.HTTP_404_NOT_FOUND
+        )
+
+    def test_importar_alunos_aluno(self):
+
+        response = self.enviar_csv('nome,email,matricula,senha')
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_403_FORBIDDEN
+        )
+
+    def test_importar_alunos_sem_colunas(self):
+
+        self.autenticar_professor()
+
+        response = self.enviar_csv('nome,email\nAluno,aluno@csv.com')
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
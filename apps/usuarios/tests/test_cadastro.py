@@ -0,0 +1,167 @@
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework import status
+
+from apps.usuarios import tasks
+from apps.usuarios.tasks import (
+    FILA_FIM, FILA_TRAVA, celery_enviar_emails_cadastro,
+    enfileirar_email_cadastro
+)
+from sistema_gestao_projetos.celery import app
+from .test_login import TestCore
+
+
+@override_settings(EMAIL_CADASTRO_LOTE=3)
+class TestCadastro(TestCore):
+
+    """
+        Cadastro de usuários e envio em lote dos e-mails de boas-vindas.
+        - O celery executa as tasks imediatamente (task_always_eager).
+        - Os e-mails ficam em mail.outbox (backend locmem dos testes).
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+
+        task_always_eager = app.conf.task_always_eager
+        app.conf.task_always_eager = True
+
+        self.addCleanup(
+            setattr, app.conf, 'task_always_eager', task_always_eager
+        )
+
+    def cadastrar_professor(self, numero):
+        return self.client.post(
+            '/cadastre-se/?usuario=professor',
+            data={
+                'nome': f'Professor {numero}',
+                'email': f'professor{numero}@cadastro.com',
+                'senha': 'teste'
+            }
+        )
+
+    def test_emails_cadastro_enviados_em_lote(self):
+        """
+            - Motivação:
+                - Evitar uma conexão SMTP por cadastro.
+            - Regra de negócio:
+                - Os e-mails de boas-vindas são enviados quando a fila
+                completa um lote ou quando a janela do celery beat
+                expira.
+            - Resultado Esperado:
+                - status: 201
+                - nenhum e-mail antes de completar o lote
+                - o lote inteiro enviado de uma vez
+                - o restante enviado pela task periódica
+        """
+
+        for numero in range(2):
+            response = self.cadastrar_professor(numero)
+
+            self.assertEqual(
+                response.status_code,
+                status.HTTP_201_CREATED
+            )
+
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.cadastrar_professor(2)
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(
+            sorted(mensagem.to[0] for mensagem in mail.outbox),
+            [f'professor{numero}@cadastro.com' for numero in range(3)]
+        )
+
+        self.cadastrar_professor(3)
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(celery_enviar_emails_cadastro(), 1)
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertEqual(celery_enviar_emails_cadastro(), 0)
+
+    def test_emails_cadastro_posicao_abandonada(self):
+        """
+            - Motivação:
+                - Uma posição reservada e nunca gravada não pode
+                bloquear os e-mails seguintes.
+            - Resultado Esperado:
+                - o e-mail seguinte espera EMAIL_CADASTRO_ESPERA
+                - depois, a posição vazia é descartada e o e-mail enviado
+        """
+
+        cache.add(FILA_FIM, 0, None)
+        cache.incr(FILA_FIM)
+
+        enfileirar_email_cadastro(
+            'Seja Bem-Vindo!', 'Mensagem', 'aluno@cadastro.com'
+        )
+
+        self.assertEqual(celery_enviar_emails_cadastro(), 0)
+
+        with override_settings(EMAIL_CADASTRO_ESPERA=0):
+            self.assertEqual(celery_enviar_emails_cadastro(), 1)
+
+        self.assertEqual(mail.outbox[0].to, ['aluno@cadastro.com'])
+        self.assertEqual(celery_enviar_emails_cadastro(), 0)
+
+    @override_settings(EMAIL_CADASTRO_LOTES_EXECUCAO=2)
+    def test_emails_cadastro_execucao_limitada(self):
+        """
+            - Motivação:
+                - Uma fila longa não pode ocupar um worker (e a trava)
+                por uma única execução.
+            - Resultado Esperado:
+                - cada execução envia no máximo 2 lotes
+                - o restante fica para uma nova execução enfileirada
+        """
+
+        with mock.patch.object(
+            celery_enviar_emails_cadastro, 'delay'
+        ) as reenfileirar:
+            for numero in range(7):
+                enfileirar_email_cadastro(
+                    'Seja Bem-Vindo!',
+                    'Mensagem',
+                    f'aluno{numero}@cadastro.com'
+                )
+
+            reenfileirar.reset_mock()
+
+            self.assertEqual(celery_enviar_emails_cadastro(), 6)
+            reenfileirar.assert_called_once_with()
+
+            reenfileirar.reset_mock()
+
+            self.assertEqual(celery_enviar_emails_cadastro(), 1)
+            reenfileirar.assert_not_called()
+
+        self.assertEqual(len(mail.outbox), 7)
+
+    def test_emails_cadastro_trava_de_outra_execucao(self):
+        """
+            - Motivação:
+                - Uma execução cuja trava expirou não pode remover a
+                trava obtida por outra execução.
+            - Resultado Esperado:
+                - a trava da outra execução continua no cache
+        """
+
+        enfileirar_email_cadastro(
+            'Seja Bem-Vindo!', 'Mensagem', 'aluno@cadastro.com'
+        )
+
+        def trava_expirada(lote):
+            cache.set(FILA_TRAVA, 'outra-execucao')
+            return len(lote)
+
+        with mock.patch.object(
+            tasks, 'enviar_emails_em_lote', side_effect=trava_expirada
+        ):
+            self.assertEqual(celery_enviar_emails_cadastro(), 1)
+
+        self.assertEqual(cache.get(FILA_TRAVA), 'outra-execucao')
+        self.assertEqual(celery_enviar_emails_cadastro(), 0)
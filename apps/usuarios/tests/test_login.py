@@ -1,4 +1,8 @@
 from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
 
@@ -6,6 +10,14 @@ from apps.usuarios.models import Professor, Aluno
 from sistema_gestao_projetos.celery import Celery
 
 
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+        }
+    },
+    MEDICAO_AMOSTRAGEM=0
+)
 class TestCore(APITestCase):
 
     """
@@ -13,10 +25,15 @@ class TestCore(APITestCase):
         - O usuário aluno já está autenticado.
         - Para autenticar o professor na rota, deve-se
         acessar a rota de login com as credenciais do professor
-        e armazenar o seu token de acesso.
+        e armazenar o seu token de acesso (ver token_usuario e
+        cliente_autenticado).
+        - O cache usa memória local e é limpo antes de cada teste.
+        - A medição por requisição (MedicaoMiddleware) fica desligada.
     """
 
     def setUp(self) -> None:
+        cache.clear()
+
         self.client.credentials(
             HTTP_AUTHORIZATION=self.token
         )
@@ -49,19 +66,35 @@ class TestCore(APITestCase):
         )
 
         cls.client = APIClient()
-        response = cls.client.post(
+        cls.token = cls.token_usuario(cls.aluno)
+        cls.client.credentials(
+            HTTP_AUTHORIZATION=cls.token
+        )
+
+    @classmethod
+    def token_usuario(cls, usuario):
+        """
+            Cabeçalho Authorization com o token do usuário (senha 123).
+        """
+        response = APIClient().post(
             '/login/',
             data={
-                'username': cls.aluno.email,
+                'username': usuario.email,
                 'password': '123'
             }
         )
 
-        cls.token = f'Token {response.data.get("token")}'
-        cls.client.credentials(
-            HTTP_AUTHORIZATION=cls.token
+        return f'Token {response.data.get("token")}'
+
+    @classmethod
+    def cliente_autenticado(cls, usuario):
+        cliente = APIClient()
+        cliente.credentials(
+            HTTP_AUTHORIZATION=cls.token_usuario(usuario)
         )
 
+        return cliente
+
 
 class TestAutenticacaoUsuario(TestCore):
     """
@@ -272,3 +305,87 @@ class TestAutenticacaoUsuario(TestCore):
             response.status_code,
             status.HTTP_400_BAD_REQUEST
         )
+
+    def test_perfil_resolvido_na_autenticacao(self):
+        """
+            - Motivação:
+                - Evitar consultas repetidas ao perfil do usuário
+                nas permissões de cada requisição.
+            - Regra de negócio:
+                - O token, o usuário e o perfil (aluno/professor) são
+                carregados em uma única consulta na autenticação.
+            - Resultado Esperado:
+                - status: 200
+                - nenhuma consulta separada a tb_aluno ou tb_professor
+        """
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/projetos/')
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+
+        consultas_token = [
+            consulta['sql'] for consulta in consultas
+            if 'authtoken_token' in consulta['sql']
+        ]
+
+        self.assertEqual(len(consultas_token), 1)
+        self.assertIn('tb_aluno', consultas_token[0])
+        self.assertIn('tb_professor', consultas_token[0])
+        self.assertFalse(
+            [
+                consulta for consulta in consultas
+                if 'FROM "tb_aluno"' in consulta['sql']
+                or 'FROM "tb_professor"' in consulta['sql']
+            ]
+        )
+
+    def test_token_em_cache(self):
+        """
+            - Motivação:
+                - Evitar a consulta ao token em todas as requisições.
+            - Regra de negócio:
+                - O token autenticado fica em cache.
+                - Ao trocar a senha, o cache do token do usuário
+                é invalidado.
+            - Resultado Esperado:
+                - status: 200
+                - o token só é consultado após a troca de senha
+        """
+
+        def consultas_token(consultas):
+            return [
+                consulta for consulta in consultas
+                if 'authtoken_token' in consulta['sql']
+            ]
+
+        self.client.get('/projetos/')
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/projetos/')
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertFalse(consultas_token(consultas))
+
+        self.client.patch(
+            '/recuperar-acesso/senha/',
+            data={
+                'email': self.aluno.email,
+                'nova_senha': '1234'
+            }
+        )
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/projetos/')
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
+        )
+        self.assertEqual(len(consultas_token(consultas)), 1)
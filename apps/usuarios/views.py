@@ -1,15 +1,21 @@
 from django.contrib.auth.hashers import make_password
 from rest_framework.viewsets import ModelViewSet
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.mixins import UpdateModelMixin, CreateModelMixin
 from rest_framework.response import Response
 from rest_framework import status
 
+from apps.core.permissions import ConcretePermissionProfessor
 from .models import User, Professor, Aluno
-from .serializers import RecuperaSenhaSerializer
+from .importacao import consultar_importacao, iniciar_importacao
+from .serializers import RecuperaSenhaSerializer, ImportacaoAlunosSerializer
 from .serializers import ProfessorSerializer, AlunoSerializer
 
-from .tasks import celery_email_cadastro
+from .tasks import enfileirar_email_cadastro
 
 
 class RecuperaSenhaViewSet(GenericViewSet, UpdateModelMixin):
@@ -46,6 +52,8 @@ class ProfessorViewSet(ModelViewSet):
 
 class AlunoViewSet(ModelViewSet):
     serializer_class = AlunoSerializer
+    estrategia_contagem = 'estimada'
+    cursor_ordering = ['nome', 'codigo']
     queryset = Aluno.objects.prefetch_related(
         'aluno'
     ).all()
@@ -53,6 +61,61 @@ class AlunoViewSet(ModelViewSet):
     class Meta:
         model: Aluno
 
+    @action(
+        methods=['post'],
+        detail=False,
+        url_path='importar',
+        url_name='importar',
+        serializer_class=ImportacaoAlunosSerializer,
+        parser_classes=[MultiPartParser],
+        permission_classes=[
+            IsAuthenticated, ConcretePermissionProfessor
+        ]
+    )
+    def importar(self, request):
+        """
+            Enfileira a importação de alunos a partir de um arquivo CSV.
+            - Apenas professores importam alunos.
+            - O arquivo deve ter as colunas nome, email, matricula e senha.
+            - A importação roda no celery; o resultado é consultado em
+            /alunos/importar/<importacao>/.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        importacao = iniciar_importacao(
+            serializer.validated_data['arquivo'],
+            request.user
+        )
+
+        return Response(
+            {'importacao': importacao},
+            status=status.HTTP_202_ACCEPTED
+        )
+
+    @action(
+        methods=['get'],
+        detail=False,
+        url_path=r'importar/(?P<importacao>[0-9a-f]{32})',
+        url_name='importacao',
+        permission_classes=[
+            IsAuthenticated, ConcretePermissionProfessor
+        ]
+    )
+    def importacao(self, request, importacao):
+        """
+            Situação de uma importação iniciada pelo professor:
+            pendente, processando, concluida ou falha. Quando concluída,
+            informa a quantidade de alunos importados e as linhas
+            inválidas com os seus erros.
+        """
+        situacao = consultar_importacao(importacao, request.user)
+
+        if situacao is None:
+            raise NotFound()
+
+        return Response(situacao)
+
 
 class CadastroViewSet(GenericViewSet, CreateModelMixin):
 
@@ -79,7 +142,7 @@ class CadastroViewSet(GenericViewSet, CreateModelMixin):
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
 
-        celery_email_cadastro.delay(
+        enfileirar_email_cadastro(
             'Seja Bem-Vindo!',
             'Você acabou de se cadastrar no Sistema de Gestão de Projetos.',
             request.data['email']
@@ -1,10 +1,14 @@
 from .celery import app
-from celery.schedules import crontab
+from django.conf import settings
 
 
-# app.conf.beat_schedule = {
-#     'invalida_licecas': {
-#         'task': 'jogos.tasks.invalida_licecas',
-#         'schedule': crontab(minute=0, hour=0)
-#     }
-# }
+app.conf.beat_schedule = {
+    'enviar_lote_emails_cadastro': {
+        'task': 'enviar_lote_emails_cadastro',
+        'schedule': settings.EMAIL_CADASTRO_JANELA
+    },
+    'marcar_tarefas_atrasadas': {
+        'task': 'marcar_tarefas_atrasadas',
+        'schedule': settings.TAREFAS_ATRASADAS_JANELA
+    }
+}
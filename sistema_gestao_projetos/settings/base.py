@@ -55,12 +55,16 @@ INSTALLED_APPS = [
     'rest_framework.authtoken',
     'corsheaders',
     'django_filters',
+    'apps.core',
     'apps.usuarios',
     'apps.turmas',
     'apps.projetos',
 ]
 
 MIDDLEWARE = [
+    'apps.core.middleware.MetricasMiddleware',
+    'apps.core.middleware.MedicaoMiddleware',
+    'apps.core.middleware.ConsultasLentasMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -133,10 +137,20 @@ REST_FRAMEWORK = {
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'apps.core.authentication.CacheTokenAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.CustomPagination',
-    'PAGE_SIZE': 10
+    'PAGE_SIZE': 10,
+    # application/json usa o orjson (ver apps.core.renderers).
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.core.renderers.JSONRapidoRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'apps.core.renderers.JSONRapidoParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 CACHES = {
@@ -177,13 +191,90 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_BACKEND = config(
+    'EMAIL_BACKEND',
+    default='django.core.mail.backends.smtp.EmailBackend'
+)
+EMAIL_FILE_PATH = config(
+    'EMAIL_FILE_PATH',
+    default=os.path.join(BASE_DIR, 'emails')
+)
 EMAIL_HOST = config('EMAIL_HOST')
 EMAIL_PORT = config('EMAIL_PORT', cast=int)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 EMAIL_USE_TLS = config('EMAIL_USE_TLS', cast=bool)
 
+# Envio em lote dos e-mails de cadastro (apps.usuarios.tasks)
+EMAIL_CADASTRO_LOTE = config('EMAIL_CADASTRO_LOTE', default=100, cast=int)
+EMAIL_CADASTRO_JANELA = config('EMAIL_CADASTRO_JANELA', default=10, cast=int)
+EMAIL_CADASTRO_TRAVA = 300
+EMAIL_CADASTRO_LOTES_EXECUCAO = 10
+EMAIL_CADASTRO_ESPERA = 60
+
+# Importação em massa de alunos (apps.usuarios.importacao)
+IMPORTACAO_BLOCO = 1000
+IMPORTACAO_THREADS = config('IMPORTACAO_THREADS', default=4, cast=int)
+IMPORTACAO_RETENCAO = 60 * 60 * 24
+
+# Varredura das tarefas atrasadas (apps.projetos.tasks)
+TAREFAS_ATRASADAS_LOTE = config(
+    'TAREFAS_ATRASADAS_LOTE', default=5000, cast=int
+)
+TAREFAS_ATRASADAS_JANELA = 60
+TAREFAS_ATRASADAS_TRAVA = 300
+
+# Medição por requisição (apps.core.middleware.MedicaoMiddleware)
+# Fração das requisições medidas, de 0 (nenhuma) a 1 (todas).
+MEDICAO_AMOSTRAGEM = config('MEDICAO_AMOSTRAGEM', default=0.1, cast=float)
+
+# Métricas do Prometheus (apps.core.metricas)
+# METRICAS_TOKEN é exigido em Authorization: Bearer; vazio desliga
+# a rota /metricas/ (404).
+METRICAS_INTERVALO = config('METRICAS_INTERVALO', default=10, cast=int)
+METRICAS_RETENCAO = 24 * 60 * 60
+METRICAS_TOKEN = config('METRICAS_TOKEN', default='')
+
+# Cache das respostas de leitura (apps.core.cache_respostas)
+# CACHE_RESPOSTAS_TIMEOUT = 0 desliga o cache.
+CACHE_RESPOSTAS_TIMEOUT = config(
+    'CACHE_RESPOSTAS_TIMEOUT', default=60 * 10, cast=int
+)
+
+# Requisições em lote (apps.core.lote)
+LOTE_MAXIMO = config('LOTE_MAXIMO', default=20, cast=int)
+
+# Log de consultas lentas (apps.core.consultas_lentas)
+# CONSULTAS_LENTAS_LIMITE_MS = 0 desliga o log.
+CONSULTAS_LENTAS_LIMITE_MS = config(
+    'CONSULTAS_LENTAS_LIMITE_MS', default=0, cast=float
+)
+CONSULTAS_LENTAS_POR_MINUTO = config(
+    'CONSULTAS_LENTAS_POR_MINUTO', default=6, cast=int
+)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'apps.core.medicao': {
+            'handlers': ['console'],
+            'level': config('MEDICAO_LOG_NIVEL', default='INFO'),
+            'propagate': False,
+        },
+        'apps.core.consultas_lentas': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
 
 DEBUG = True
 CELERY_BROKER_URL = config('REDIS_URL')
@@ -22,4 +22,5 @@ urlpatterns = [
     path('', include('apps.usuarios.urls')),
     path('', include('apps.turmas.urls')),
     path('', include('apps.projetos.urls')),
+    path('', include('apps.core.urls')),
 ]